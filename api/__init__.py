@@ -14,14 +14,23 @@ def create_app(config_name = 'default'):
   app = Flask(__name__)
   app.config.from_object(config[config_name])
 
-  from api.database.models import User, Contact
+  from api.database.models import User, Contact, ContactTombstone
+  from api import metrics, cache
+  metrics.init_app(app)
+  cache.init_app(app)
 
   db.init_app(app)
   migrate = Migrate(app, db)
 
   CORS(app, resources={r"/*": {"origins": "*"}})
 
+  from api import profiling, compression
+  profiling.init_app(app)
+  compression.init_app(app)
+
   api = Api(app)
+  from api import serialization
+  api.representation(serialization.JSON_MIMETYPE)(serialization.output_json)
 
   @app.after_request 
   def after_request(response):
@@ -34,12 +43,21 @@ def create_app(config_name = 'default'):
     return response 
   
   from api.resources.users import UsersResource, UserResource
-  from api.resources.contacts import ContactsResource, ContactResource
+  from api.resources.contacts import ContactsResource, ContactResource, ContactSearchResource
+  from api.resources.bulk import ContactsBulkResource
+  from api.resources.changes import ContactChangesResource
+  from api.resources.imports import ContactImportResource
+  from api.resources.exports import ContactExportResource
   from api.resources.login import LoginResource
 
   api.add_resource(UserResource, '/users/<user_id>')
   api.add_resource(UsersResource, '/users')
   api.add_resource(ContactsResource, '/users/<user_id>/contacts')
+  api.add_resource(ContactSearchResource, '/users/<user_id>/contacts/search')
+  api.add_resource(ContactsBulkResource, '/users/<user_id>/contacts/bulk')
+  api.add_resource(ContactChangesResource, '/users/<user_id>/contacts/changes')
+  api.add_resource(ContactImportResource, '/users/<user_id>/contacts/import')
+  api.add_resource(ContactExportResource, '/users/<user_id>/contacts/export')
   api.add_resource(ContactResource, '/users/<user_id>/contacts/<contact_id>')
   api.add_resource(LoginResource, '/login')
 
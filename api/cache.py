@@ -0,0 +1,258 @@
+'''
+the app's caches, a fresh set per app (see init_app) so tests never see
+each other's entries. CACHE_BACKEND 'local' keeps them in each process,
+'shared' keeps them in one sqlite file per host (see api/shared_cache.py)
+
+LRUCache is a bounded, thread safe mapping whose entries expire ttl seconds
+after they were written. lookups are counted in the cache_requests_total
+metric by cache and result (hit or miss)
+
+VersionTable hands out version numbers for versioned keys: writers bump a
+key's version after they commit and readers put the version they read before
+querying into their cache key, so a write makes every older entry unreachable
+without having to find and delete it
+
+writers go through invalidate and bump_version. with CACHE_NOTIFY on
+postgres those are also published with NOTIFY and every worker listening
+(on any host) applies them to its own caches
+'''
+import os
+import json
+import time
+import uuid
+import select
+import logging
+import itertools
+import threading
+from collections import OrderedDict
+from flask import current_app
+from sqlalchemy import text
+
+from api import db, metrics
+
+MISSING = object()
+
+metrics.declare('cache_requests_total', 'counter', 'Cache lookups, by cache and result.')
+
+class LRUCache:
+  '''
+  least recently used entries are evicted past max_entries, 0 disables the cache
+  '''
+  def __init__(self, name, max_entries, ttl):
+    self.name = name
+    self.max_entries = max_entries
+    self.ttl = ttl
+    self.hits = 0
+    self.misses = 0
+    self._lock = threading.Lock()
+    self._entries = OrderedDict()
+
+  def __len__(self):
+    return len(self._entries)
+
+  def get(self, key):
+    '''
+    the cached value or MISSING
+    '''
+    now = time.monotonic()
+    with self._lock:
+      entry = self._entries.get(key)
+      if entry is not None and entry[0] > now:
+        self._entries.move_to_end(key)
+        value = entry[1]
+        self.hits += 1
+      else:
+        if entry is not None:
+          del self._entries[key]
+        value = MISSING
+        self.misses += 1
+
+    metrics.inc('cache_requests_total', {'cache': self.name, 'result': 'miss' if value is MISSING else 'hit'})
+    return value
+
+  def set(self, key, value):
+    if self.max_entries <= 0:
+      return
+
+    with self._lock:
+      self._entries[key] = (time.monotonic() + self.ttl, value)
+      self._entries.move_to_end(key)
+      while len(self._entries) > self.max_entries:
+        self._entries.popitem(last=False)
+
+  def delete(self, key):
+    with self._lock:
+      self._entries.pop(key, None)
+
+  def clear(self):
+    with self._lock:
+      self._entries.clear()
+
+# shared by every VersionTable in the process so a number is never handed out twice
+_versions = itertools.count(1)
+
+class VersionTable:
+  '''
+  the current version of up to max_entries keys. a key seen for the first 
+  time, or again after eviction, gets a fresh number, never one an old cache 
+  entry could have been stored under
+  '''
+  def __init__(self, max_entries):
+    self.max_entries = max_entries
+    self._lock = threading.Lock()
+    self._entries = OrderedDict()
+
+  def get(self, key):
+    with self._lock:
+      version = self._entries.get(key)
+      if version is None:
+        version = self._assign(key)
+      else:
+        self._entries.move_to_end(key)
+      return version
+
+  def bump(self, key):
+    with self._lock:
+      return self._assign(key)
+
+  def clear(self):
+    with self._lock:
+      self._entries.clear()
+
+  def _assign(self, key):
+    version = self._entries[key] = next(_versions)
+    self._entries.move_to_end(key)
+    while len(self._entries) > self.max_entries:
+      self._entries.popitem(last=False)
+    return version
+
+NOTIFY_CHANNEL = 'address_book_cache'
+LISTEN_RECONNECT_SECONDS = 5
+
+logger = logging.getLogger(__name__)
+
+# tells this process's own notifications apart from everyone else's. pids 
+# repeat across hosts (a container's workers all start from the same few), so 
+# a random token, drawn again in every forked child
+_sender = uuid.uuid4().hex
+
+def _new_sender():
+  global _sender
+  _sender = uuid.uuid4().hex
+
+os.register_at_fork(after_in_child=_new_sender)
+
+class _Listener:
+  '''
+  one daemon thread per worker process holding a LISTEN connection, it applies
+  other processes' invalidations to this app's caches. notifications sent while
+  it was disconnected are lost, so it clears every cache when it reconnects
+  '''
+  def __init__(self, app):
+    self.app = app
+    self.pid = None
+    self._lock = threading.Lock()
+
+  def ensure_started(self):
+    if self.pid == os.getpid():
+      return
+    with self._lock:
+      if self.pid != os.getpid():
+        self.pid = os.getpid()
+        thread = threading.Thread(target=self._run, name='cache-listener', daemon=True)
+        thread.start()
+
+  def _run(self):
+    with self.app.app_context():
+      engine = db.get_engine(self.app)
+    connected_before = False
+    while True:
+      try:
+        connection = engine.raw_connection()
+        connection.detach()
+        connection.connection.set_isolation_level(0)
+        cursor = connection.cursor()
+        cursor.execute(f'LISTEN {NOTIFY_CHANNEL}')
+        if connected_before:
+          _clear_all(self.app)
+        connected_before = True
+        self._listen(connection.connection)
+      except Exception:
+        logger.exception('cache listener lost its connection')
+        time.sleep(LISTEN_RECONNECT_SECONDS)
+
+  def _listen(self, connection):
+    while True:
+      if select.select([connection], [], [], LISTEN_RECONNECT_SECONDS) == ([], [], []):
+        continue
+      connection.poll()
+      while connection.notifies:
+        _receive(self.app, connection.notifies.pop(0).payload)
+
+def _receive(app, payload):
+  message = json.loads(payload)
+  if message['sender'] != _sender:
+    _apply(app, message['op'], message['name'], message['key'])
+
+def _apply(app, op, name, key):
+  if op == 'bump':
+    app.extensions['cache_versions'][name].bump(key)
+  else:
+    app.extensions['cache'][name].delete(key)
+
+def _clear_all(app):
+  for cache in app.extensions['cache'].values():
+    cache.clear()
+  for versions in app.extensions['cache_versions'].values():
+    versions.clear()
+
+def _publish(op, name, key):
+  if not current_app.config.get('CACHE_NOTIFY'):
+    return
+
+  payload = json.dumps({'sender': _sender, 'op': op, 'name': name, 'key': key})
+  with db.engine.begin() as connection:
+    connection.execute(text('SELECT pg_notify(:channel, :payload)'), channel=NOTIFY_CHANNEL, payload=payload)
+
+def invalidate(name, key):
+  '''
+  drops key from cache name, call after the write that made it stale committed
+  '''
+  _apply(current_app, 'delete', name, key)
+  _publish('delete', name, key)
+
+def bump_version(name, key):
+  '''
+  moves key to a new version, call after the write that made it stale committed
+  '''
+  _apply(current_app, 'bump', name, key)
+  _publish('bump', name, key)
+
+def init_app(app):
+  contact_list_size = app.config.get('CONTACT_LIST_CACHE_SIZE', 0)
+  sizes = {
+    'users': (app.config.get('USER_CACHE_SIZE', 0), app.config.get('USER_CACHE_TTL', 30)),
+    'contact_lists': (contact_list_size, app.config.get('CONTACT_LIST_CACHE_TTL', 10)),
+  }
+
+  if app.config.get('CACHE_BACKEND', 'local') == 'shared':
+    from api.shared_cache import SharedStore, SharedCache, SharedVersionTable, store_path, private_directory
+    directory = private_directory(app.config.get('CACHE_DIR') or os.path.join(app.instance_path, 'cache'))
+    store = SharedStore(store_path(directory, app.config['SQLALCHEMY_DATABASE_URI']))
+    app.extensions['cache'] = {name: SharedCache(store, name, size, ttl) for name, (size, ttl) in sizes.items()}
+    app.extensions['cache_versions'] = {'contact_lists': SharedVersionTable(store, 'contact_lists', max(contact_list_size, 1))}
+  else:
+    app.extensions['cache'] = {name: LRUCache(name, size, ttl) for name, (size, ttl) in sizes.items()}
+    app.extensions['cache_versions'] = {'contact_lists': VersionTable(max(contact_list_size, 1))}
+
+  if app.config.get('CACHE_NOTIFY') and app.config['SQLALCHEMY_DATABASE_URI'].startswith('postgresql'):
+    listener = _Listener(app)
+    app.before_request(listener.ensure_started)
+  else:
+    app.config['CACHE_NOTIFY'] = False
+
+def get_cache(name):
+  return current_app.extensions['cache'][name]
+
+def get_versions(name):
+  return current_app.extensions['cache_versions'][name]
@@ -0,0 +1,143 @@
+'''
+gzip response compression negotiated with Accept-Encoding, plus brotli when
+the brotli package is installed and the client prefers it
+
+only text, json and messagepack bodies are compressed. a body shorter than
+COMPRESSION_MIN_SIZE goes out as it is, the headers would outweigh the
+saving. a streamed body (the ndjson list, exports) is compressed as it is
+generated, COMPRESSION_STREAM_FLUSH_SIZE bytes of input at a time, so the
+client keeps receiving rows without the ratio suffering a flush per row
+
+the compressed bytes differ from the identity response, so the ETag of a
+compressible response is made weak whenever a coding is negotiated, even
+when the body is too short to compress, so that a 304 always carries the
+same validator as its 200. the views compare If-None-Match weakly,
+conditional requests keep working across encodings
+'''
+import zlib
+from flask import request
+
+try:
+  import brotli
+except ImportError:
+  brotli = None
+
+COMPRESSIBLE_MIMETYPES = {
+  'application/json',
+  'application/x-ndjson',
+  'application/msgpack',
+  'application/javascript',
+  'application/xml',
+}
+
+class _Gzip:
+  def __init__(self, level):
+    self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+  def compress(self, data):
+    return self._compressor.compress(data)
+
+  def flush(self):
+    return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+  def finish(self):
+    return self._compressor.flush()
+
+class _Brotli:
+  def __init__(self, quality):
+    self._compressor = brotli.Compressor(quality=quality)
+
+  def compress(self, data):
+    return self._compressor.process(data)
+
+  def flush(self):
+    return self._compressor.flush()
+
+  def finish(self):
+    return self._compressor.finish()
+
+def _compressible(mimetype):
+  return mimetype.startswith('text/') or mimetype.endswith('+json') or mimetype in COMPRESSIBLE_MIMETYPES
+
+def _encoding():
+  '''
+  the content coding to answer with, None for identity. Accept-Encoding
+  qualities are honoured, brotli wins ties
+  '''
+  offered = ['br', 'gzip'] if brotli is not None else ['gzip']
+  return request.accept_encodings.best_match(offered)
+
+def _compressor(config, encoding):
+  if encoding == 'br':
+    return _Brotli(config.get('COMPRESSION_BROTLI_QUALITY', 5))
+  return _Gzip(config.get('COMPRESSION_LEVEL', 6))
+
+def _compress_stream(chunks, compressor, flush_size):
+  '''
+  buffers chunks up to flush_size before compressing them, per row chunks
+  cost a call each and brotli's fastest qualities barely compress them
+  '''
+  buffer, pending = [], 0
+  try:
+    for chunk in chunks:
+      if isinstance(chunk, str):
+        chunk = chunk.encode('utf-8')
+      buffer.append(chunk)
+      pending += len(chunk)
+      if pending >= flush_size:
+        data = compressor.compress(b''.join(buffer)) + compressor.flush()
+        buffer, pending = [], 0
+        if data:
+          yield data
+    yield compressor.compress(b''.join(buffer)) + compressor.finish()
+  finally:
+    # the wrapped generator may hold a connection or an app context
+    close = getattr(chunks, 'close', None)
+    if close is not None:
+      close()
+
+def _weaken_etag(response):
+  etag, weak = response.get_etag()
+  if etag is not None and not weak:
+    response.set_etag(etag, weak=True)
+
+def init_app(app):
+  if not app.config.get('COMPRESSION_ENABLED'):
+    return
+
+  @app.after_request
+  def compress_response(response):
+    if response.status_code == 304:
+      # carries the validator the 200 would have. every view answering 304 
+      # sends json or messagepack, whose ETag is weak whenever a coding is 
+      # negotiated, see below
+      if _encoding() is not None:
+        _weaken_etag(response)
+      return response
+
+    if (not _compressible(response.mimetype or '') or response.direct_passthrough
+        or 'Content-Encoding' in response.headers):
+      return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = _encoding()
+    if encoding is None or response.status_code < 200 or response.status_code == 204:
+      return response
+
+    # weak whether or not this body clears the size threshold, so a 304 
+    # (which has no body to measure) can always send the same validator
+    _weaken_etag(response)
+
+    if response.is_streamed:
+      flush_size = app.config.get('COMPRESSION_STREAM_FLUSH_SIZE', 16 * 1024)
+      response.response = _compress_stream(response.response, _compressor(app.config, encoding), flush_size)
+      response.headers.pop('Content-Length', None)
+    else:
+      data = response.get_data()
+      if len(data) < app.config.get('COMPRESSION_MIN_SIZE', 1024):
+        return response
+      compressor = _compressor(app.config, encoding)
+      response.set_data(compressor.compress(data) + compressor.finish())
+
+    response.headers['Content-Encoding'] = encoding
+    return response
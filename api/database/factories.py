@@ -0,0 +1,169 @@
+'''
+deterministic fake users and contacts, the same seed always gives the same rows
+
+contacts per user follow a pareto distribution (most address books are small,
+a few are huge) and cities, states and groups repeat with skewed weights the
+way real address books do, so indexes and plans see realistic selectivity
+'''
+import bisect
+import random
+import datetime
+
+from sqlalchemy import func
+
+from api import db
+from api.database.loader import load_chunks
+from api.database.models import User, Contact
+
+SEED_CHUNK_SIZE = 10000
+
+# pareto shape, the mean of paretovariate(alpha) is alpha / (alpha - 1)
+CONTACTS_ALPHA = 1.5
+# no single address book grows past mean_contacts * this
+MAX_CONTACTS_FACTOR = 50
+
+EPOCH = datetime.datetime(2020, 1, 1)
+HISTORY_SECONDS = 365 * 24 * 60 * 60
+
+FIRST_NAMES = ('james', 'mary', 'john', 'patricia', 'robert', 'jennifer', 'michael', 'linda',
+               'william', 'elizabeth', 'david', 'barbara', 'richard', 'susan', 'joseph', 'jessica',
+               'thomas', 'sarah', 'charles', 'karen', 'daniel', 'nancy', 'matthew', 'lisa',
+               'anthony', 'betty', 'mark', 'margaret', 'donald', 'sandra', 'steven', 'ashley')
+LAST_NAMES = ('smith', 'johnson', 'williams', 'brown', 'jones', 'garcia', 'miller', 'davis',
+              'rodriguez', 'martinez', 'hernandez', 'lopez', 'gonzalez', 'wilson', 'anderson',
+              'thomas', 'taylor', 'moore', 'jackson', 'martin', 'lee', 'perez', 'thompson',
+              'white', 'harris', 'sanchez', 'clark', 'ramirez', 'lewis', 'robinson', 'walker')
+STREETS = ('main st', 'oak ave', 'pine st', 'maple ave', 'cedar ln', 'elm st', 'washington blvd',
+           'lake dr', 'hill rd', 'park ave', 'colfax ave', 'broadway')
+# (city, state, zipcode prefix) from most to least common
+CITIES = (
+  ('Denver', 'Colorado', '802'),
+  ('New York', 'New York', '100'),
+  ('Los Angeles', 'California', '900'),
+  ('Chicago', 'Illinois', '606'),
+  ('Houston', 'Texas', '770'),
+  ('Boulder', 'Colorado', '803'),
+  ('Phoenix', 'Arizona', '850'),
+  ('Seattle', 'Washington', '981'),
+  ('Austin', 'Texas', '787'),
+  ('Portland', 'Oregon', '972'),
+  ('Atlanta', 'Georgia', '303'),
+  ('Boston', 'Massachusetts', '021'),
+  ('Miami', 'Florida', '331'),
+  ('Fort Collins', 'Colorado', '805'),
+  ('Santa Fe', 'New Mexico', '875'),
+  ('Boise', 'Idaho', '837'),
+)
+GROUPS = ('friend', 'family', 'coworker', 'old-coworkers', 'neighbor', 'school')
+
+def _cum_weights(count, exponent=1.0):
+  '''
+  zipf style weights, the nth value is 1 / n ** exponent as likely as the first
+  '''
+  total = 0.0
+  weights = []
+  for rank in range(1, count + 1):
+    total += 1 / rank ** exponent
+    weights.append(total)
+  return weights
+
+CITY_WEIGHTS = _cum_weights(len(CITIES))
+GROUP_WEIGHTS = _cum_weights(len(GROUPS), 1.5)
+
+def _pick(rng, values):
+  # rng.choice and rng.randrange are several times slower than one random() 
+  # call and these run for every generated row
+  return values[int(rng.random() * len(values))]
+
+def _below(rng, stop):
+  return int(rng.random() * stop)
+
+def _weighted(rng, values, cum_weights):
+  return values[bisect.bisect(cum_weights, rng.random() * cum_weights[-1])]
+
+def _timestamps(rng):
+  created_at = EPOCH + datetime.timedelta(seconds=_below(rng, HISTORY_SECONDS))
+  updated_at = created_at + datetime.timedelta(seconds=_below(rng, HISTORY_SECONDS // 4))
+  return created_at, updated_at
+
+def user_details(rng, number):
+  '''
+  attributes for one user, number keeps the email unique
+  '''
+  first_name = _pick(rng, FIRST_NAMES)
+  last_name = _pick(rng, LAST_NAMES)
+  return {
+    'email': f'{first_name}.{last_name}.{number}@example.com',
+    'first_name': first_name,
+    'last_name': last_name,
+  }
+
+def contact_details(rng):
+  '''
+  the contact payload fields for one contact
+  '''
+  city, state, zipcode = _weighted(rng, CITIES, CITY_WEIGHTS)
+  return {
+    'first_name': _pick(rng, FIRST_NAMES),
+    'last_name': _pick(rng, LAST_NAMES),
+    'group': _weighted(rng, GROUPS, GROUP_WEIGHTS),
+    'phone_number': f'{200 + _below(rng, 800)}-555-{_below(rng, 10000):04}' if rng.random() < 0.8 else None,
+    'street_address': f'{1 + _below(rng, 9999)} {_pick(rng, STREETS)}',
+    'street_address_2': f'apt {1 + _below(rng, 499)}' if rng.random() < 0.15 else None,
+    'city': city,
+    'state': state,
+    'zipcode': f'{zipcode}{_below(rng, 100):02}',
+  }
+
+def contacts_per_user(rng, mean_contacts):
+  '''
+  a pareto distributed address book size averaging about mean_contacts
+  '''
+  pareto_mean = CONTACTS_ALPHA / (CONTACTS_ALPHA - 1)
+  count = int(mean_contacts * (rng.paretovariate(CONTACTS_ALPHA) - 1) / (pareto_mean - 1))
+  return min(count, mean_contacts * MAX_CONTACTS_FACTOR)
+
+def user_rows(count, seed, first_id=1):
+  '''
+  yields users table rows with explicit ids first_id .. first_id + count - 1
+  '''
+  rng = random.Random(f'{seed}-users')
+  for user_id in range(first_id, first_id + count):
+    created_at, updated_at = _timestamps(rng)
+    yield dict(user_details(rng, user_id), id=user_id, created_at=created_at, updated_at=updated_at, change_seq=0)
+
+def contact_rows(user_ids, mean_contacts, seed):
+  '''
+  yields contacts table rows (without ids) for every user in user_ids
+  '''
+  rng = random.Random(f'{seed}-contacts')
+  for user_id in user_ids:
+    for _ in range(contacts_per_user(rng, mean_contacts)):
+      row = contact_details(rng)
+      row['user_id'] = user_id
+      row['created_at'], row['updated_at'] = _timestamps(rng)
+      row['change_seq'] = 0
+      yield row
+
+def seed_database(users, mean_contacts, seed, chunk_size=SEED_CHUNK_SIZE):
+  '''
+  bulk loads users and their contacts after any existing users, with COPY on
+  postgres, returns (users written, contacts written)
+  '''
+  first_id = (db.session.query(func.max(User.id)).scalar() or 0) + 1
+  user_table = User.__table__
+  user_columns = [column.name for column in user_table.columns]
+  written_users = load_chunks(user_table, user_columns, user_rows(users, seed, first_id), chunk_size)
+
+  # the ids above were explicit, move the sequence past them
+  if db.session.connection().dialect.name == 'postgresql':
+    db.session.execute("SELECT setval(pg_get_serial_sequence('users', 'id'), (SELECT max(id) FROM users))")
+    db.session.commit()
+
+  contact_table = Contact.__table__
+  contact_columns = [column.name for column in contact_table.columns if column.name != 'id']
+  user_ids = range(first_id, first_id + users)
+  written_contacts = load_chunks(contact_table, contact_columns,
+                                 contact_rows(user_ids, mean_contacts, seed), chunk_size)
+
+  return written_users, written_contacts
@@ -0,0 +1,65 @@
+import io 
+import csv 
+
+from api import db 
+
+def copy_rows(table, columns, rows):
+  '''
+  writes rows (dicts keyed by column name) into table on the session's connection 
+  uses COPY ... FROM STDIN on psycopg2 and an executemany INSERT elsewhere 
+  the caller owns the transaction and commits
+  '''
+  if len(rows) == 0:
+    return 0
+
+  connection = db.session.connection()
+
+  if connection.dialect.driver != 'psycopg2':
+    connection.execute(table.insert(), [{column: row[column] for column in columns} for row in rows])
+    return len(rows)
+
+  buffer = io.StringIO()
+  writer = csv.writer(buffer)
+  for row in rows:
+    # None is written as an unquoted empty field, which COPY reads as NULL
+    writer.writerow([row[column] for column in columns])
+  buffer.seek(0)
+
+  quote = connection.dialect.identifier_preparer.quote
+  statement = 'COPY {} ({}) FROM STDIN WITH (FORMAT csv)'.format(
+    quote(table.name), ', '.join(quote(column) for column in columns))
+
+  cursor = connection.connection.cursor()
+  try: 
+    cursor.copy_expert(statement, buffer)
+  finally: 
+    cursor.close()
+
+  return len(rows)
+
+def load_chunks(table, columns, rows, chunk_size, prepare=None):
+  '''
+  copies an iterable of rows chunk_size at a time, committing after each chunk 
+  so memory and transaction size stay bounded, returns the number of rows written 
+  prepare, when given, is called with each non empty chunk in the transaction 
+  that copies it, before the copy
+  '''
+  written = 0
+  chunk = []
+
+  def copy(chunk):
+    if chunk and prepare is not None:
+      prepare(chunk)
+    return copy_rows(table, columns, chunk)
+
+  for row in rows:
+    chunk.append(row)
+    if len(chunk) == chunk_size:
+      written += copy(chunk)
+      db.session.commit()
+      chunk = []
+
+  written += copy(chunk)
+  db.session.commit()
+
+  return written
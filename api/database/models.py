@@ -1,9 +1,30 @@
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey
-from sqlalchemy.orm import relationship 
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime, ForeignKey, Index, select, literal, and_
+from sqlalchemy.orm import relationship, make_transient_to_detached 
 # from sqlalchemy.ext.declarative import declarative_base
 from api import db 
+from api.cache import get_cache, invalidate, bump_version, MISSING 
 import datetime 
 
+def _contacts_changed(user_id):
+  '''
+  call after committing a write to user_id's contacts, retires their cached lists
+  '''
+  bump_version('contact_lists', user_id)
+
+def _next_change_seq(user_id):
+  '''
+  moves user_id's change_seq on and returns it, call first in a transaction 
+  that writes to their contacts and stamp every row it writes (or tombstones) 
+  with it. the UPDATE holds the user's row lock until commit, so their writers 
+  commit in change_seq order and a reader that sees a number has seen every 
+  smaller one. delta sync and the list ETag are built on this. updated_at is 
+  pinned, the user record itself has not changed
+  '''
+  users = User.__table__
+  query = users.update().where(users.c.id == user_id) \
+               .values(change_seq=users.c.change_seq + 1, updated_at=users.c.updated_at)
+  return db.session.execute(query.returning(users.c.change_seq)).scalar()
+
 class User(db.Model): 
   '''
   User Model
@@ -18,7 +39,11 @@ class User(db.Model):
   updated_at = Column(DateTime, 
                       default=datetime.datetime.utcnow, 
                       onupdate=datetime.datetime.utcnow)
-  contacts = relationship('Contact', back_populates='user', cascade='all,delete')
+  # the last change_seq handed to one of the user's contacts, see _next_change_seq
+  change_seq = Column(BigInteger, nullable=False, default=0, server_default='0')
+  # contacts are removed by ON DELETE CASCADE, passive_deletes keeps the ORM 
+  # from loading them just to delete them one by one
+  contacts = relationship('Contact', back_populates='user', cascade='all,delete', passive_deletes=True)
 
   def __init__(self, email, first_name, last_name):
     if email is not None: 
@@ -43,25 +68,53 @@ class User(db.Model):
   def __repr__(self):
     return '<User %r>' % self.email
 
+  @classmethod
+  def get_cached(cls, user_id): 
+    '''
+    the user bound to the current session, built from the users cache without 
+    a query when possible, None when there is no such user. misses are not 
+    cached so a user created in another worker is found right away
+    '''
+    cache = get_cache('users')
+    state = cache.get(user_id)
+    if state is MISSING: 
+      user = db.session.query(cls).filter_by(id=user_id).one_or_none()
+      if user is not None: 
+        # change_seq moves with every contact write, it is loaded when read
+        cache.set(user_id, {attribute.key: getattr(user, attribute.key) for attribute in cls.__mapper__.column_attrs 
+                            if attribute.key != 'change_seq'})
+      return user 
+
+    user = cls.__mapper__.class_manager.new_instance()
+    for key, value in state.items(): 
+      setattr(user, key, value)
+    make_transient_to_detached(user)
+    return db.session.merge(user, load=False)
+
   def insert(self): 
     '''
     inserts new record into db with unique email
     '''
     db.session.add(self)
     db.session.commit()
+    invalidate('users', self.id)
 
   def update(self): 
     '''
     updates record that exists in db
     '''
     db.session.commit()
+    invalidate('users', self.id)
 
   def delete(self): 
     '''
     deletes record from db
     '''
+    user_id = self.id
     db.session.delete(self)
     db.session.commit()
+    invalidate('users', user_id)
+    _contacts_changed(user_id)
 
 class Contact(db.Model): 
   '''
@@ -69,9 +122,23 @@ class Contact(db.Model):
   '''
 
   __tablename__ = 'contacts'
+  __table_args__ = (
+    # keyset pagination order for the contact list endpoint
+    Index('ix_contacts_user_id_last_name_first_name_id', 
+          'user_id', 'last_name', 'first_name', 'id'),
+    # group and state filters, followed by the list order 
+    Index('ix_contacts_user_id_group_last_name_first_name_id', 
+          'user_id', 'group', 'last_name', 'first_name', 'id'),
+    Index('ix_contacts_user_id_state_last_name_first_name_id', 
+          'user_id', 'state', 'last_name', 'first_name', 'id'),
+    # delta sync, contacts changed after a change_seq
+    Index('ix_contacts_user_id_change_seq', 'user_id', 'change_seq'),
+    # the search endpoint's (user_id, lower(<field>) text_pattern_ops) prefix 
+    # indexes are postgres expression indexes and live in the migrations only
+  )
 
   id = Column(Integer, primary_key=True)
-  user_id = Column(Integer, ForeignKey('users.id'))
+  user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), index=True)
   first_name = Column(String(80), nullable=False)
   last_name = Column(String(80), nullable=False)
   group = Column(String(80), default='friend')
@@ -85,6 +152,7 @@ class Contact(db.Model):
   updated_at = Column(DateTime, 
                       default=datetime.datetime.utcnow, 
                       onupdate=datetime.datetime.utcnow)
+  change_seq = Column(BigInteger, nullable=False, default=0, server_default='0')
   user = relationship('User', back_populates='contacts')
 
   def __init__(self, user, details):
@@ -103,21 +171,159 @@ class Contact(db.Model):
     '''
     inserts new record into db
     '''
+    self.change_seq = _next_change_seq(self.user.id)
     db.session.add(self)
     db.session.commit()
+    _contacts_changed(self.user_id)
+  
+  @classmethod
+  def insert_many(cls, user_id, rows, chunk_size=1000): 
+    '''
+    inserts rows (dicts with the same column keys) for one user in a single 
+    transaction, one multi-row INSERT ... RETURNING id per chunk 
+    returns the new ids in row order
+    '''
+    now = datetime.datetime.utcnow()
+    change_seq = _next_change_seq(user_id)
+    table = cls.__table__
+    ids = []
+
+    for start in range(0, len(rows), chunk_size):
+      values = [dict(row, user_id=user_id, created_at=now, updated_at=now, change_seq=change_seq) 
+                for row in rows[start:start + chunk_size]]
+      result = db.session.execute(table.insert().values(values).returning(table.c.id))
+      ids.extend(contact_id for contact_id, in result)
+
+    db.session.commit()
+    _contacts_changed(user_id)
+    return ids
+
+  @classmethod
+  def find_for_user(cls, user_id, contact_id): 
+    '''
+    user_id's contact in one query, users LEFT JOIN contacts on both ids 
+    returns None when the user does not exist, and a row whose id is None 
+    when the contact does not (or belongs to another user)
+    '''
+    users, contacts = User.__table__, cls.__table__
+    join = users.outerjoin(contacts, and_(contacts.c.user_id == users.c.id, contacts.c.id == contact_id))
+    query = select([users.c.id.label('owner_id')] + list(contacts.c)).select_from(join).where(users.c.id == user_id)
+
+    return db.session.execute(query).first()
+
+  @classmethod
+  def update_for_user(cls, user_id, contact_id, values): 
+    '''
+    one UPDATE ... RETURNING on user_id's contact, returns the updated row 
+    or None when user_id has no such contact
+    '''
+    change_seq = _next_change_seq(user_id)
+    table = cls.__table__
+    query = table.update().where(and_(table.c.id == contact_id, table.c.user_id == user_id))
+    row = db.session.execute(query.values(dict(values, change_seq=change_seq)).returning(*table.c)).first()
+    if row is None: 
+      db.session.rollback()
+      return None
+
+    db.session.commit()
+    _contacts_changed(user_id)
+    return row
+
+  @classmethod
+  def delete_for_user(cls, user_id, contact_id): 
+    '''
+    one DELETE ... RETURNING on user_id's contact, tombstoned in the same 
+    transaction, returns False when user_id has no such contact
+    '''
+    change_seq = _next_change_seq(user_id)
+    table = cls.__table__
+    query = table.delete().where(and_(table.c.id == contact_id, table.c.user_id == user_id))
+    row = db.session.execute(query.returning(table.c.id)).first()
+    if row is None: 
+      db.session.rollback()
+      return False
+
+    db.session.execute(ContactTombstone.__table__.insert().values(
+      user_id=user_id, contact_id=row.id, deleted_at=datetime.datetime.utcnow(), change_seq=change_seq))
+    db.session.commit()
+    _contacts_changed(user_id)
+    return True
+
+  @classmethod
+  def update_many(cls, user_id, criteria, values): 
+    '''
+    one set based UPDATE ... WHERE criteria on user_id's contacts, 
+    returns the number of rows updated
+    '''
+    change_seq = _next_change_seq(user_id)
+    criteria = [cls.user_id == user_id] + list(criteria)
+    count = db.session.query(cls).filter(*criteria).update(dict(values, change_seq=change_seq), 
+                                                           synchronize_session=False)
+    db.session.commit()
+    _contacts_changed(user_id)
+    return count
+
+  @classmethod
+  def delete_many(cls, user_id, criteria): 
+    '''
+    one set based DELETE ... WHERE criteria on user_id's contacts, tombstoned 
+    with an INSERT ... SELECT in the same transaction, returns the number of rows deleted
+    '''
+    change_seq = _next_change_seq(user_id)
+    criteria = [cls.user_id == user_id] + list(criteria)
+    tombstones = select([cls.user_id, cls.id, literal(datetime.datetime.utcnow()), literal(change_seq)]) \
+                   .where(and_(*criteria))
+    db.session.execute(ContactTombstone.__table__.insert().from_select(
+      ['user_id', 'contact_id', 'deleted_at', 'change_seq'], tombstones))
+
+    count = db.session.query(cls).filter(*criteria).delete(synchronize_session=False)
+    db.session.commit()
+    _contacts_changed(user_id)
+    return count
   
   def update(self): 
     '''
     updates record that exists in db
     '''
+    self.change_seq = _next_change_seq(self.user_id)
     db.session.commit()
+    _contacts_changed(self.user_id)
 
   def delete(self): 
     '''
-    deletes record from db
+    deletes record from db, leaving a tombstone for delta sync
     '''
+    user_id = self.user_id
+    tombstone = ContactTombstone(user_id, self.id)
+    tombstone.change_seq = _next_change_seq(user_id)
+    db.session.add(tombstone)
     db.session.delete(self)
     db.session.commit()
+    _contacts_changed(user_id)
 
   def __repr(self): 
     return '<Contact %r>' % self.first_name + '-' + self.last_name
+
+class ContactTombstone(db.Model): 
+  '''
+  ContactTombstone Model 
+  records a deleted contact so delta sync clients can drop it
+  '''
+
+  __tablename__ = 'contact_tombstones'
+  __table_args__ = (
+    Index('ix_contact_tombstones_user_id_change_seq', 'user_id', 'change_seq'),
+  )
+
+  id = Column(Integer, primary_key=True)
+  user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+  contact_id = Column(Integer, nullable=False)
+  deleted_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
+  change_seq = Column(BigInteger, nullable=False, default=0, server_default='0')
+
+  def __init__(self, user_id, contact_id):
+    self.user_id = user_id 
+    self.contact_id = contact_id
+
+  def __repr__(self): 
+    return '<ContactTombstone %r>' % self.contact_id
@@ -0,0 +1,47 @@
+from . import csvfile, vcard 
+
+# ?format= value -> module with parse_contacts(lines, required_fields) 
+# and encode_contacts(batches, fields)
+FORMATS = {
+  'csv': csvfile,
+  'vcf': vcard,
+}
+
+MIMETYPES = {
+  'text/csv': 'csv',
+  'text/vcard': 'vcf',
+  'text/x-vcard': 'vcf',
+}
+
+EXPORT_MIMETYPES = {
+  'csv': 'text/csv',
+  'vcf': 'text/vcard',
+}
+
+EXTENSIONS = {
+  '.csv': 'csv',
+  '.vcf': 'vcf',
+  '.vcard': 'vcf',
+}
+
+def detect_format(file_format=None, mimetype=None, filename=None):
+  '''
+  explicit format first, then the mimetype, then the file extension 
+  returns None when none of them name a known format
+  '''
+  if file_format:
+    return file_format.lower() if file_format.lower() in FORMATS else None
+  if mimetype in MIMETYPES:
+    return MIMETYPES[mimetype]
+  if filename: 
+    for extension, name in EXTENSIONS.items():
+      if filename.lower().endswith(extension):
+        return name
+
+  return None
+
+def parse_contacts(lines, file_format, required_fields):
+  return FORMATS[file_format].parse_contacts(lines, required_fields)
+
+def encode_contacts(batches, file_format, fields):
+  return FORMATS[file_format].encode_contacts(batches, fields)
@@ -0,0 +1,83 @@
+import io 
+import csv 
+
+# normalized header -> contact field, normalizing lowercases and turns '-', '_' and spaces into one space
+HEADER_ALIASES = {
+  'first name': 'first_name',
+  'given name': 'first_name',
+  'firstname': 'first_name',
+  'last name': 'last_name',
+  'family name': 'last_name',
+  'surname': 'last_name',
+  'lastname': 'last_name',
+  'group': 'group',
+  'category': 'group',
+  'categories': 'group',
+  'phone': 'phone_number',
+  'phone number': 'phone_number',
+  'mobile': 'phone_number',
+  'mobile phone': 'phone_number',
+  'street address': 'street_address',
+  'address': 'street_address',
+  'street': 'street_address',
+  'address 1': 'street_address',
+  'address line 1': 'street_address',
+  'street address 2': 'street_address_2',
+  'address 2': 'street_address_2',
+  'address line 2': 'street_address_2',
+  'city': 'city',
+  'state': 'state',
+  'region': 'state',
+  'province': 'state',
+  'zipcode': 'zipcode',
+  'zip': 'zipcode',
+  'zip code': 'zipcode',
+  'postal code': 'zipcode',
+  'postcode': 'zipcode',
+}
+
+def _normalize_header(header):
+  return ' '.join((header or '').lower().replace('-', ' ').replace('_', ' ').split())
+
+def parse_contacts(lines, required_fields):
+  '''
+  yields one contact dict per csv record, keyed by contact field 
+  blank optional columns are left out, blank required ones are kept so 
+  validation reports them
+  '''
+  reader = csv.reader(lines)
+  header = next(reader, None)
+  if header is None:
+    return
+
+  columns = [(i, HEADER_ALIASES.get(_normalize_header(name))) for i, name in enumerate(header)]
+  columns = [(i, field) for i, field in columns if field is not None]
+
+  for record in reader:
+    if not any(value.strip() for value in record):
+      continue
+
+    contact = {}
+    for i, field in columns:
+      value = record[i] if i < len(record) else ''
+      if value.strip() or field in required_fields: 
+        contact.setdefault(field, value)
+
+    yield contact
+
+def encode_contacts(batches, fields):
+  '''
+  yields the header, then one csv text chunk per batch of rows 
+  the header uses field names, which parse_contacts maps back on import
+  '''
+  buffer = io.StringIO()
+  writer = csv.writer(buffer)
+
+  writer.writerow(fields)
+  yield buffer.getvalue()
+
+  for rows in batches:
+    buffer.seek(0)
+    buffer.truncate()
+    writer.writerows([getattr(row, field) for field in fields] for row in rows)
+    yield buffer.getvalue()
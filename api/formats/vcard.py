@@ -0,0 +1,151 @@
+'''
+just enough of vCard 3.0/4.0 to read and write address book contacts
+'''
+
+def _unescape(value):
+  chars = []
+  escaped = False
+  for char in value:
+    if escaped:
+      chars.append('\n' if char in 'nN' else char)
+      escaped = False
+    elif char == '\\':
+      escaped = True
+    else: 
+      chars.append(char)
+
+  return ''.join(chars)
+
+def _split(value, separator):
+  '''
+  splits on separators that are not backslash escaped
+  '''
+  parts = ['']
+  escaped = False
+  for char in value:
+    if escaped:
+      parts[-1] += '\\' + char
+      escaped = False
+    elif char == '\\':
+      escaped = True
+    elif char == separator:
+      parts.append('')
+    else: 
+      parts[-1] += char
+
+  return [_unescape(part) for part in parts]
+
+def _unfolded(lines):
+  '''
+  joins folded continuation lines (starting with a space or tab) onto the line before
+  '''
+  current = None
+  for line in lines:
+    line = line.rstrip('\r\n')
+    if line[:1] in (' ', '\t') and current is not None:
+      current += line[1:]
+      continue
+    if current is not None:
+      yield current
+    current = line
+
+  if current is not None:
+    yield current
+
+def _card_to_contact(properties):
+  contact = {}
+
+  if 'N' in properties:
+    name = _split(properties['N'], ';') + ['', '']
+    contact['last_name'], contact['first_name'] = name[0], name[1]
+  elif 'FN' in properties:
+    full_name = _unescape(properties['FN']).rsplit(' ', 1)
+    contact['first_name'] = full_name[0]
+    contact['last_name'] = full_name[1] if len(full_name) > 1 else ''
+
+  if 'ADR' in properties:
+    # post office box; extended address; street; locality; region; postal code; country
+    address = _split(properties['ADR'], ';') + [''] * 7
+    street = address[2].split('\n', 1)
+    contact['street_address'] = street[0]
+    street_address_2 = street[1] if len(street) > 1 else address[1]
+    if street_address_2.strip():
+      contact['street_address_2'] = street_address_2
+    contact['city'] = address[3]
+    contact['state'] = address[4]
+    contact['zipcode'] = address[5]
+
+  if properties.get('TEL', '').strip():
+    contact['phone_number'] = _unescape(properties['TEL'])
+
+  if properties.get('CATEGORIES', '').strip():
+    contact['group'] = _split(properties['CATEGORIES'], ',')[0]
+
+  return contact
+
+def parse_contacts(lines, required_fields):
+  '''
+  yields one contact dict per BEGIN:VCARD ... END:VCARD block, required 
+  fields the card does not carry are left out so validation reports them
+  '''
+  properties = None
+
+  for line in _unfolded(lines):
+    if ':' not in line:
+      continue
+
+    name, value = line.split(':', 1)
+    # drop parameters (TEL;TYPE=cell) and group prefixes (item1.ADR)
+    name = name.split(';', 1)[0].rsplit('.', 1)[-1].upper()
+
+    if name == 'BEGIN' and value.strip().upper() == 'VCARD':
+      properties = {}
+    elif name == 'END' and value.strip().upper() == 'VCARD':
+      if properties is not None:
+        yield _card_to_contact(properties)
+      properties = None
+    elif properties is not None:
+      # the first TEL, ADR, ... wins
+      properties.setdefault(name, value)
+
+def _escape(value):
+  value = value or ''
+  return (value.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+               .replace('\r\n', '\\n').replace('\n', '\\n'))
+
+def _fold(line, width=75):
+  '''
+  continuation lines start with a single space, see _unfolded
+  '''
+  lines = [line[:width]]
+  for start in range(width, len(line), width - 1):
+    lines.append(' ' + line[start:start + width - 1])
+
+  return '\r\n'.join(lines) + '\r\n'
+
+def _encode_card(contact):
+  street = _escape(contact.street_address)
+  if contact.street_address_2:
+    street += '\\n' + _escape(contact.street_address_2)
+
+  lines = [
+    'BEGIN:VCARD',
+    'VERSION:3.0',
+    f'N:{_escape(contact.last_name)};{_escape(contact.first_name)};;;',
+    f'FN:{_escape(contact.first_name)} {_escape(contact.last_name)}',
+  ]
+  if contact.phone_number:
+    lines.append(f'TEL:{_escape(contact.phone_number)}')
+  lines.append(f'ADR:;;{street};{_escape(contact.city)};{_escape(contact.state)};{_escape(contact.zipcode)};')
+  if contact.group:
+    lines.append(f'CATEGORIES:{_escape(contact.group)}')
+  lines.append('END:VCARD')
+
+  return ''.join(_fold(line) for line in lines)
+
+def encode_contacts(batches, fields):
+  '''
+  yields one text chunk of cards per batch of rows
+  '''
+  for rows in batches:
+    yield ''.join(_encode_card(row) for row in rows)
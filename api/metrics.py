@@ -0,0 +1,248 @@
+'''
+dependency free, prometheus style metrics aggregated across gunicorn workers 
+
+each process counts in memory and snapshots its counters to 
+METRICS_DIR/<pid>-<start>.json at most every METRICS_FLUSH_INTERVAL seconds. 
+/metrics flushes the serving process and sums every snapshot in the directory, 
+so totals survive worker restarts. clear METRICS_DIR when deploying
+'''
+import os 
+import json 
+import time 
+import atexit 
+import bisect 
+import shutil 
+import hashlib 
+import tempfile 
+import threading 
+from flask import g, request, current_app, Response 
+from sqlalchemy.pool import QueuePool 
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+EXPOSITION_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# name -> (type, help, histogram buckets)
+METRICS = {}
+
+def declare(name, metric_type, help_text, buckets=None):
+  METRICS[name] = (metric_type, help_text, buckets)
+
+declare('http_requests_total', 'counter', 'Requests handled, by resource, method and status.')
+declare('http_request_duration_seconds', 'histogram', 'Request latency, by resource and method.', LATENCY_BUCKETS)
+declare('db_pool_checkout_wait_seconds', 'histogram', 'Time spent waiting for a pooled connection.', POOL_WAIT_BUCKETS)
+
+class _Registry: 
+  '''
+  one process' counters and histograms, labels are tuples of (name, value) pairs
+  '''
+  def __init__(self):
+    self.pid = os.getpid()
+    self.name = f'{self.pid}-{int(time.time() * 1000)}'
+    self.lock = threading.Lock()
+    self.counters = {}
+    # (name, labels) -> [per bucket counts..., sum, count]
+    self.histograms = {}
+    self.last_flush = 0.0
+
+  def inc(self, name, labels, amount):
+    with self.lock: 
+      self.counters[(name, labels)] = self.counters.get((name, labels), 0) + amount
+
+  def observe(self, name, labels, value):
+    buckets = METRICS[name][2]
+    with self.lock: 
+      histogram = self.histograms.get((name, labels))
+      if histogram is None: 
+        histogram = self.histograms[(name, labels)] = [0] * len(buckets) + [0.0, 0]
+      index = bisect.bisect_left(buckets, value)
+      if index < len(buckets):
+        histogram[index] += 1
+      histogram[-2] += value
+      histogram[-1] += 1
+
+  def snapshot(self):
+    with self.lock: 
+      return {
+        'counters': [[name, list(labels), value] for (name, labels), value in self.counters.items()],
+        'histograms': [[name, list(labels), values] for (name, labels), values in self.histograms.items()],
+      }
+
+_registry = None
+_registry_lock = threading.Lock()
+
+def _get_registry():
+  '''
+  a fresh registry per process, gunicorn forks workers after the app is imported
+  '''
+  global _registry
+  if _registry is None or _registry.pid != os.getpid():
+    with _registry_lock: 
+      if _registry is None or _registry.pid != os.getpid():
+        _registry = _Registry()
+
+  return _registry
+
+def _labels(labels):
+  return tuple(sorted((labels or {}).items()))
+
+def inc(name, labels=None, amount=1):
+  _get_registry().inc(name, _labels(labels), amount)
+
+def observe(name, value, labels=None):
+  _get_registry().observe(name, _labels(labels), value)
+
+def flush(directory):
+  '''
+  atomically replaces this process' snapshot file, the temporary file is per 
+  thread so threaded workers flushing at once do not rename each other's
+  '''
+  registry = _get_registry()
+  path = os.path.join(directory, f'{registry.name}.json')
+  temporary = f'{path}.{threading.get_ident()}.tmp'
+  with open(temporary, 'w') as snapshot_file: 
+    json.dump(registry.snapshot(), snapshot_file)
+  os.replace(temporary, path)
+  registry.last_flush = time.monotonic()
+
+def collect(directory):
+  '''
+  sums every process' snapshot: ({(name, labels): value}, {(name, labels): [...]})
+  '''
+  counters = {}
+  histograms = {}
+
+  for filename in sorted(os.listdir(directory)):
+    if not filename.endswith('.json'):
+      continue
+    try: 
+      with open(os.path.join(directory, filename)) as snapshot_file: 
+        snapshot = json.load(snapshot_file)
+    except (OSError, ValueError):
+      continue
+
+    for name, labels, value in snapshot['counters']:
+      key = (name, tuple(tuple(label) for label in labels))
+      counters[key] = counters.get(key, 0) + value
+    for name, labels, values in snapshot['histograms']:
+      key = (name, tuple(tuple(label) for label in labels))
+      if key not in histograms: 
+        histograms[key] = [0] * len(values)
+      histograms[key] = [total + value for total, value in zip(histograms[key], values)]
+
+  return counters, histograms
+
+def _escape(value):
+  return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(labels):
+  if not labels: 
+    return ''
+  return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+def _format_value(value):
+  return repr(float(value)) if isinstance(value, float) else str(value)
+
+def render(counters, histograms):
+  '''
+  prometheus text exposition format
+  '''
+  lines = []
+
+  for name, (metric_type, help_text, buckets) in METRICS.items():
+    lines.append(f'# HELP {name} {help_text}')
+    lines.append(f'# TYPE {name} {metric_type}')
+
+    if metric_type != 'histogram':
+      for (series, labels), value in sorted(counters.items()):
+        if series == name: 
+          lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+      continue
+
+    for (series, labels), values in sorted(histograms.items()):
+      if series != name: 
+        continue
+      cumulative = 0
+      for bound, count in zip(buckets, values):
+        cumulative += count
+        lines.append(f"{name}_bucket{_format_labels(labels + (('le', bound),))} {cumulative}")
+      lines.append(f"{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {values[-1]}")
+      lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(values[-2])}')
+      lines.append(f'{name}_count{_format_labels(labels)} {values[-1]}')
+
+  return '\n'.join(lines) + '\n'
+
+class TimedQueuePool(QueuePool):
+  '''
+  QueuePool that records how long each checkout waits for a connection
+  '''
+  def _do_get(self):
+    start = time.perf_counter()
+    try: 
+      return super()._do_get()
+    finally: 
+      observe('db_pool_checkout_wait_seconds', time.perf_counter() - start)
+
+def _resource_name():
+  '''
+  the flask-restful Resource class name, or the view function name for plain routes
+  '''
+  view = current_app.view_functions.get(request.endpoint)
+  if view is None: 
+    return 'unmatched'
+
+  return getattr(view, 'view_class', view).__name__
+
+def default_dir(database_uri):
+  '''
+  one directory per database, so apps pointed at different databases on the 
+  same host (a dev server, a test run) never add up each other's snapshots
+  '''
+  digest = hashlib.sha1(database_uri.encode('utf-8')).hexdigest()[:12]
+  return os.path.join(tempfile.gettempdir(), f'address-book-metrics-{digest}')
+
+def init_app(app):
+  '''
+  times every request by resource and method and serves the totals at /metrics 
+  must run before db.init_app so the engine is built with TimedQueuePool
+  '''
+  if not app.config.get('METRICS_ENABLED'):
+    return
+
+  if app.config.get('METRICS_TEMPORARY_DIR'): 
+    # private to this app and removed at exit, for tests 
+    directory = tempfile.mkdtemp(prefix='address-book-metrics-')
+    atexit.register(shutil.rmtree, directory, True)
+  else: 
+    directory = app.config.get('METRICS_DIR') or default_dir(app.config['SQLALCHEMY_DATABASE_URI'])
+  interval = app.config.get('METRICS_FLUSH_INTERVAL', 1.0)
+  os.makedirs(directory, exist_ok=True)
+
+  if app.config['SQLALCHEMY_DATABASE_URI'].startswith('postgresql'):
+    options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    options.setdefault('poolclass', TimedQueuePool)
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+
+  @app.before_request
+  def start_request_timer():
+    g.metrics_start = time.perf_counter()
+
+  @app.after_request
+  def record_request(response):
+    start = g.pop('metrics_start', None)
+    if start is None or request.endpoint == 'metrics':
+      return response
+
+    labels = {'resource': _resource_name(), 'method': request.method}
+    observe('http_request_duration_seconds', time.perf_counter() - start, labels)
+    inc('http_requests_total', dict(labels, status=str(response.status_code)))
+
+    if time.monotonic() - _get_registry().last_flush >= interval:
+      flush(directory)
+
+    return response
+
+  @app.route('/metrics')
+  def metrics():
+    flush(directory)
+    return Response(render(*collect(directory)), content_type=EXPOSITION_CONTENT_TYPE)
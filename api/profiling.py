@@ -0,0 +1,65 @@
+import json 
+import logging 
+from collections import Counter 
+from flask import g, request 
+from flask_sqlalchemy import get_debug_queries 
+
+logger = logging.getLogger(__name__)
+
+STATEMENT_LOG_LENGTH = 200
+
+def _profile(queries, slowest=3, repeat_threshold=3):
+  '''
+  summarizes recorded queries: count, total db time, the slowest statements 
+  and statements issued repeat_threshold or more times (likely N+1 loops)
+  '''
+  total = sum(query.duration for query in queries) * 1000
+  ranked = sorted(queries, key=lambda query: query.duration, reverse=True)[:slowest]
+  counts = Counter(query.statement for query in queries)
+
+  return {
+    'queries': len(queries),
+    'db_ms': round(total, 2),
+    'slowest': [
+      {'ms': round(query.duration * 1000, 2), 'statement': query.statement[:STATEMENT_LOG_LENGTH]}
+      for query in ranked
+    ],
+    'repeated': [
+      {'count': count, 'statement': statement[:STATEMENT_LOG_LENGTH]}
+      for statement, count in counts.most_common() if count >= repeat_threshold
+    ],
+  }
+
+def _add_server_timing(response, metric):
+  existing = response.headers.get('Server-Timing')
+  response.headers['Server-Timing'] = f'{existing}, {metric}' if existing else metric
+
+def init_app(app):
+  '''
+  emits a Server-Timing header and a json log line with each request's sql 
+  profile, reads the queries flask-sqlalchemy records with SQLALCHEMY_RECORD_QUERIES 
+  queries run while a streamed body is being sent happen after this and are not counted
+  '''
+  if not app.config.get('SQL_PROFILER_ENABLED') or not app.config.get('SQLALCHEMY_RECORD_QUERIES'):
+    return
+
+  @app.before_request
+  def start_sql_profile():
+    # the app context, and so the recorded queries, can outlive one request (e.g. in tests)
+    g.sql_profile_start = len(get_debug_queries())
+
+  @app.after_request
+  def finish_sql_profile(response):
+    queries = get_debug_queries()[g.get('sql_profile_start', 0):]
+    profile = _profile(queries, 
+                       app.config.get('SQL_PROFILER_SLOWEST', 3), 
+                       app.config.get('SQL_PROFILER_REPEAT_THRESHOLD', 3))
+
+    _add_server_timing(response, f"db;dur={profile['db_ms']};desc=\"{profile['queries']} queries\"")
+
+    profile.update(method=request.method, path=request.path, endpoint=request.endpoint, 
+                   status=response.status_code)
+    level = logging.WARNING if profile['repeated'] else logging.INFO
+    logger.log(level, json.dumps(profile))
+
+    return response
@@ -0,0 +1,105 @@
+from flask_restful import Resource 
+from werkzeug.datastructures import MultiDict 
+
+from api.database.models import Contact 
+from api.serialization import request_json 
+from . import _error_response
+from .contacts import (_validate_user, _validate_contact_changes, _parse_filters, 
+                       FILTERABLE_FIELDS, MAX_BULK_CONTACTS)
+
+def _parse_selection(data):
+  '''
+  {'ids': [1, 2]} and/or {'filter': {'group': 'old-coworkers'}}, when both 
+  are given a contact has to match both. returns (criteria, errors)
+  '''
+  criteria = []
+  errors = []
+
+  if 'ids' not in data and 'filter' not in data: 
+    errors.append("required 'ids' or 'filter' parameter is missing")
+
+  if 'ids' in data: 
+    ids = data['ids']
+    if (not isinstance(ids, list) or len(ids) == 0 or 
+        not all(isinstance(i, int) and not isinstance(i, bool) for i in ids)):
+      errors.append("'ids' parameter must be a non empty list of integers")
+    elif len(ids) > MAX_BULK_CONTACTS: 
+      errors.append(f"'ids' parameter can hold at most {MAX_BULK_CONTACTS} ids")
+    else: 
+      criteria.append(Contact.id.in_(ids))
+
+  if 'filter' in data: 
+    selection = data['filter']
+    if not isinstance(selection, dict) or len(selection) == 0:
+      errors.append("'filter' parameter must be a non empty json object")
+    else: 
+      args = MultiDict()
+      for field, values in selection.items():
+        values = values if isinstance(values, list) else [values]
+        if field not in FILTERABLE_FIELDS: 
+          errors.append(f"'filter' parameter '{field}' is not a filterable field")
+        elif len(values) == 0 or not all(isinstance(value, str) for value in values):
+          errors.append(f"'filter' parameter '{field}' must be a string or a list of strings")
+        else: 
+          for value in values: 
+            args.add(field, value)
+      criteria.extend(_parse_filters(args))
+
+  return criteria, errors
+
+def _request_data():
+  '''
+  the json body, a missing one counts as an empty object. returns (data, errors)
+  '''
+  data = request_json(default={})
+  if not isinstance(data, dict): 
+    return {}, ["bulk request must be a json object"]
+  return data, []
+
+class ContactsBulkResource(Resource):
+  '''
+  requires a valid user_id argument 
+  update [PATCH] or delete [DELETE] every contact matching 'ids' and/or 'filter' 
+  in one statement /users/<user_id>/contacts/bulk
+  '''
+  def patch(self, **kwargs):
+    user_id = int(kwargs['user_id'].strip())
+    user = _validate_user(user_id)
+
+    data, errors = _request_data()
+    if errors: 
+      return _error_response(errors, 400)
+
+    criteria, errors = _parse_selection(data)
+
+    changes = data.get('changes')
+    if not isinstance(changes, dict): 
+      errors.append("required 'changes' parameter is missing")
+    else: 
+      values, change_errors = _validate_contact_changes(changes)
+      errors.extend(change_errors)
+      if not change_errors and not values: 
+        errors.append("'changes' parameter has no contact fields")
+
+    if errors: 
+      return _error_response(errors, 400)
+
+    updated = Contact.update_many(user.id, criteria, values)
+
+    return {'success': True, 'updated': updated}, 200
+
+  def delete(self, **kwargs):
+    user_id = int(kwargs['user_id'].strip())
+    user = _validate_user(user_id)
+
+    data, errors = _request_data()
+    if errors: 
+      return _error_response(errors, 400)
+
+    criteria, errors = _parse_selection(data)
+    if errors: 
+      return _error_response(errors, 400)
+
+    deleted = Contact.delete_many(user.id, criteria)
+
+    return {'success': True, 'deleted': deleted}, 200
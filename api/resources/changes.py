@@ -0,0 +1,66 @@
+from flask import request 
+from flask_restful import Resource 
+
+from api import db 
+from api.database.models import User, Contact, ContactTombstone 
+from . import _error_response
+from .contacts import _validate_user, _contact_payload
+from .pagination import _pack, _unpack
+
+def _encode_since(change_seq):
+  return _pack([change_seq])
+
+def _decode_since(token):
+  values = _unpack(token)
+  if not isinstance(values, list) or len(values) != 1:
+    return None
+
+  change_seq = values[0]
+  if not isinstance(change_seq, int) or isinstance(change_seq, bool) or change_seq < 0:
+    return None
+  return change_seq
+
+class ContactChangesResource(Resource):
+  '''
+  requires a valid user_id argument 
+  delta sync [GET] /users/<user_id>/contacts/changes?since=<cursor> 
+  returns contacts created or updated and ids of contacts deleted after the 
+  cursor, plus the cursor for the next call. without since every contact 
+  is returned (a full sync)
+  '''
+  def get(self, **kwargs):
+    user_id = int(kwargs['user_id'].strip())
+    user = _validate_user(user_id)
+
+    since = None
+    if 'since' in request.args: 
+      since = _decode_since(request.args['since'])
+      if since is None: 
+        return _error_response(["'since' parameter is not a valid cursor"], 400)
+
+    # every change up to the user's change_seq has committed, see 
+    # _next_change_seq, so reading up to it (and no further) misses nothing 
+    # even while other writes are in flight 
+    latest = db.session.query(User.change_seq).filter_by(id=user.id).scalar()
+
+    # both walk the (user_id, change_seq) indexes
+    contacts = db.session.query(Contact).filter(Contact.user_id == user.id, Contact.change_seq <= latest)
+    tombstones = db.session.query(ContactTombstone.contact_id) \
+                           .filter(ContactTombstone.user_id == user.id, ContactTombstone.change_seq <= latest)
+    if since is not None: 
+      contacts = contacts.filter(Contact.change_seq > since)
+      tombstones = tombstones.filter(ContactTombstone.change_seq > since)
+
+    contact_list = [_contact_payload(contact) for contact in contacts.order_by(Contact.change_seq, Contact.id)]
+
+    # a full sync has nothing on the client to delete
+    deleted = []
+    if since is not None: 
+      deleted = [contact_id for contact_id, in tombstones.order_by(ContactTombstone.change_seq, ContactTombstone.id)]
+
+    return {
+      'contacts': contact_list,
+      'deleted': deleted,
+      'cursor': _encode_since(latest),
+      'success': True
+    }, 200
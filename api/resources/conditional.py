@@ -0,0 +1,40 @@
+import hashlib 
+import datetime 
+from flask import request, Response 
+from werkzeug.http import http_date 
+
+def _etag(*parts):
+  '''
+  strong validator over the given version parts (ids, updated_at, counts, ...)
+  '''
+  return hashlib.sha1('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+
+def _validator_headers(etag, last_modified=None):
+  headers = {'ETag': f'"{etag}"'}
+  if last_modified is not None: 
+    headers['Last-Modified'] = http_date(last_modified.replace(tzinfo=datetime.timezone.utc))
+
+  return headers
+
+def _has_validators():
+  return bool(request.if_none_match) or request.if_modified_since is not None
+
+def _not_modified(etag, last_modified=None):
+  '''
+  If-None-Match wins over If-Modified-Since, which is only used when the 
+  resource has a last_modified (naive utc, like the updated_at columns)
+  '''
+  if request.if_none_match: 
+    return request.if_none_match.contains_weak(etag)
+
+  since = request.if_modified_since
+  if since is None or last_modified is None: 
+    return False
+  if since.tzinfo is not None: 
+    since = since.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+
+  # http dates only carry whole seconds
+  return last_modified.replace(microsecond=0) <= since
+
+def _not_modified_response(headers):
+  return Response(status=304, headers=headers)
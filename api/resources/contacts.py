@@ -1,21 +1,137 @@
-import json 
-from flask import request 
+from types import SimpleNamespace
+from flask import request, Response, stream_with_context, current_app
 from flask_restful import Resource, abort
+from sqlalchemy import func, and_, or_
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm.exc import NoResultFound
 
 from api import db 
+from api.cache import get_cache, get_versions, MISSING 
 from api.database.models import User, Contact 
-from . import _validate_field, _error_response
+from api.serialization import dumps, packb, request_json, JSON_MIMETYPE, MSGPACK_MIMETYPE 
+from api.validation import column_fields, optional, compile_validator, compile_batch_validator 
+from . import _error_response
+from .conditional import _etag, _validator_headers, _has_validators, _not_modified, _not_modified_response
+from .pagination import _parse_page_args, _keyset_filter, _order_by, _encode_cursor
+
+# fields a client can set on a contact, in payload order
+CONTACT_FIELDS = ('first_name', 'last_name', 'group', 'phone_number', 'street_address', 
+                  'street_address_2', 'city', 'state', 'zipcode')
+REQUIRED_CONTACT_FIELDS = ('first_name', 'last_name', 'street_address', 'city', 'state', 'zipcode')
+CONTACT_SCHEMA = column_fields(Contact.__table__, CONTACT_FIELDS, REQUIRED_CONTACT_FIELDS)
+MAX_BULK_CONTACTS = 10000
+
+SORTABLE_FIELDS = ('first_name', 'last_name', 'city', 'state', 'zipcode', 'created_at', 'updated_at')
+FILTERABLE_FIELDS = ('group', 'city', 'state', 'zipcode')
+# default list order, backed by ix_contacts_user_id_last_name_first_name_id
+DEFAULT_SORT = 'last_name,first_name'
+
+# prefix matched case insensitively, see the lower(...) text_pattern_ops indexes
+SEARCH_FIELDS = ('first_name', 'last_name', 'phone_number', 'city')
+DEFAULT_SEARCH_LIMIT = 10
+MAX_SEARCH_LIMIT = 50
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+STREAM_BATCH_SIZE = 500
+
+# list representations by ?format= name, see _list_representation
+COLUMNAR_MIMETYPE = 'application/vnd.address-book.columnar+json'
+LIST_MIMETYPES = {
+  'json': JSON_MIMETYPE,
+  'ndjson': NDJSON_MIMETYPE,
+  'columnar': COLUMNAR_MIMETYPE,
+  'msgpack': MSGPACK_MIMETYPE,
+}
+# _contact_payload's keys, and the columns sent as indexes into a list of 
+# their distinct values
+PAYLOAD_FIELDS = ('id',) + CONTACT_FIELDS
+DICTIONARY_FIELDS = ('group', 'city', 'state')
 
 def _validate_user(user_id):
-  try: 
-    user = db.session.query(User).filter_by(id=user_id).one() 
-  except NoResultFound: 
+  user = User.get_cached(user_id)
+  if user is None: 
     return abort(404)
     
   return user
 
+# (values, errors) for a contact's fields, see api/validation.py. the same 
+# rules apply to single, bulk and imported contacts
+_validate_contact = compile_validator(CONTACT_SCHEMA, '_validate_contact', 
+                                     not_object="contact must be a json object")
+# every field is optional on update, but a field that is given can not be blank
+_validate_contact_changes = compile_validator(optional(CONTACT_SCHEMA), '_validate_contact_changes', 
+                                             not_object="contact must be a json object")
+# (rows, [(index, errors)]) for a list of contacts in one call, rows are 
+# complete column values for Contact.insert_many and the import loader
+_validate_contacts = compile_batch_validator(CONTACT_SCHEMA, '_validate_contacts', 
+                                             defaults={'group': Contact.__table__.c.group.default.arg}, 
+                                             not_object="contact must be a json object")
+
+def _parse_sort(args):
+  '''
+  ?sort=city,-last_name orders by whitelisted fields, '-' for descending 
+  id is always appended as the tie breaker
+  '''
+  order = []
+  errors = []
+
+  for name in args.get('sort', DEFAULT_SORT).split(','):
+    name = name.strip()
+    field = name.lstrip('-')
+    if field not in SORTABLE_FIELDS: 
+      errors.append(f"'sort' parameter '{field}' is not a sortable field")
+    else: 
+      order.append((getattr(Contact, field), name.startswith('-')))
+
+  if order: 
+    order.append((Contact.id, order[-1][1]))
+
+  return order, errors
+
+def _parse_filters(args):
+  '''
+  ?state=Colorado&group=family&group=work equality filters, repeated keys match any value
+  '''
+  filters = []
+
+  for field in FILTERABLE_FIELDS:
+    values = [value.strip() for value in args.getlist(field)]
+    if len(values) == 1: 
+      filters.append(getattr(Contact, field) == values[0])
+    elif len(values) > 1: 
+      filters.append(getattr(Contact, field).in_(values))
+
+  return filters
+
+def _escape_like(value):
+  return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+def _search_filter(terms):
+  '''
+  every term must be a prefix of at least one SEARCH_FIELDS column 
+  so 'bru way' finds bruce wayne
+  '''
+  clauses = []
+  for term in terms:
+    pattern = _escape_like(term.lower()) + '%'
+    clauses.append(or_(*[
+      func.lower(getattr(Contact, field)).like(pattern, escape='\\') for field in SEARCH_FIELDS
+    ]))
+
+  return and_(*clauses)
+
+def _contact_etag(contact_id, updated_at):
+  return _etag('contact', contact_id, updated_at)
+
+def _contact_list_etag(user_id, representation):
+  '''
+  every write to the user's contacts moves their change_seq (see 
+  _next_change_seq), one primary key lookup however long the list 
+  the query string and representation tell the variants of the list apart
+  '''
+  change_seq = db.session.query(User.change_seq).filter_by(id=user_id).scalar()
+
+  return _etag('contacts', user_id, change_seq, request.query_string.decode('utf-8'), representation)
+
 def _contact_payload(contact):
   return {
     'id': contact.id,
@@ -30,38 +146,97 @@ def _contact_payload(contact):
     'zipcode': contact.zipcode,
   }
 
+def _contact_columns(contacts):
+  '''
+  the columnar form of a contact list: one array per field, with the 
+  DICTIONARY_FIELDS holding indexes into 'dictionaries'
+  '''
+  columns = {field: [getattr(contact, field) for contact in contacts] for field in PAYLOAD_FIELDS}
+  dictionaries = {}
+  for field in DICTIONARY_FIELDS:
+    indexes = {}
+    columns[field] = [indexes.setdefault(value, len(indexes)) for value in columns[field]]
+    dictionaries[field] = list(indexes)
+
+  return {'count': len(contacts), 'columns': columns, 'dictionaries': dictionaries}
+
+def _list_representation():
+  '''
+  the LIST_MIMETYPES name to answer with, ?stream=1 and ?format= win over Accept 
+  returns (representation, errors)
+  '''
+  if request.args.get('stream', '').lower() in ('1', 'true'):
+    return 'ndjson', []
+
+  if 'format' in request.args: 
+    representation = request.args['format'].lower()
+    if representation not in LIST_MIMETYPES: 
+      return None, [f"'format' parameter must be one of: {', '.join(LIST_MIMETYPES)}"]
+    return representation, []
+
+  names = {mimetype: name for name, mimetype in LIST_MIMETYPES.items()}
+  names['application/x-msgpack'] = 'msgpack'
+  return names[request.accept_mimetypes.best_match(list(names), JSON_MIMETYPE)], []
+
+def _stream_contacts(contacts):
+  '''
+  one contact per line, pulled through a server side cursor 
+  STREAM_BATCH_SIZE rows at a time
+  '''
+  def generate():
+    for contact in contacts.yield_per(STREAM_BATCH_SIZE):
+      yield dumps(_contact_payload(contact)) + b'\n'
+
+  return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
+
 class ContactsResource(Resource):
   '''
   requires a valid user_id argument 
   get and create contact [GET, POST] /users/<user_id>/contacts
+  POST also takes a json array of contacts and creates them in one transaction
+  GET streams newline delimited json with ?stream=1 or Accept: application/x-ndjson 
+  and sends the columnar form as json (application/vnd.address-book.columnar+json) 
+  or messagepack (application/msgpack), also chosen with ?format=
   '''
   def _create_contact(self, user, data):
-    proceed = True 
-    errors = []
-    
-    proceed, first_name, errors = _validate_field(data, 'first_name', proceed, errors)
-    proceed, last_name, errors = _validate_field(data, 'last_name', proceed, errors)
-    proceed, group, errors = _validate_field(data, 'group', proceed, errors, missing_okay=True)
-    proceed, phone_number, errors = _validate_field(data, 'phone_number', proceed, errors, missing_okay=True)
-    proceed, street_address, errors = _validate_field(data, 'street_address', proceed, errors)
-    proceed, street_address_2, errors = _validate_field(data, 'street_address_2', proceed, errors, missing_okay=True)
-    proceed, city, errors = _validate_field(data, 'city', proceed, errors)
-    proceed, state, errors = _validate_field(data, 'state', proceed, errors)
-    proceed, zipcode, errors = _validate_field(data, 'zipcode', proceed, errors)
-
-    if proceed: 
-      contact = Contact(user, data)
+    values, errors = _validate_contact(data)
+
+    if not errors: 
+      contact = Contact(user, values)
       contact.insert()
         
       return contact, errors
     else: 
       return None, errors
 
+  def _create_contacts(self, user, data):
+    '''
+    all or nothing: every row is validated before any is inserted
+    '''
+    if len(data) == 0: 
+      return _error_response(["at least one contact is required"], 400)
+    if len(data) > MAX_BULK_CONTACTS: 
+      return _error_response([f"at most {MAX_BULK_CONTACTS} contacts can be created at once"], 400)
+
+    rows, invalid = _validate_contacts(data)
+    if invalid: 
+      return _error_response([{'index': index, 'errors': errors} for index, errors in invalid], 400)
+
+    ids = Contact.insert_many(user.id, rows)
+    contact_list = [_contact_payload(SimpleNamespace(id=contact_id, **row)) 
+                    for contact_id, row in zip(ids, rows)]
+
+    return {'contacts': contact_list, 'success': True}, 201
+
   def post(self, **kwargs):
     user_id = int(kwargs['user_id'].strip())
     user = _validate_user(user_id)
 
-    contact, errors = self._create_contact(user, json.loads(request.data))
+    data = request_json()
+    if isinstance(data, list):
+      return self._create_contacts(user, data)
+
+    contact, errors = self._create_contact(user, data)
 
     if contact is not None:
       contact_payload = _contact_payload(contact)
@@ -74,17 +249,77 @@ class ContactsResource(Resource):
     user_id = int(kwargs['user_id'].strip())
     user = _validate_user(user_id)
 
+    order, errors = _parse_sort(request.args)
+    if errors: 
+      return _error_response(errors, 400)
+
+    limit, after, errors = _parse_page_args(request.args, order)
+    if errors: 
+      return _error_response(errors, 400)
+
+    representation, errors = _list_representation()
+    if errors: 
+      return _error_response(errors, 400)
+    mimetype = LIST_MIMETYPES[representation]
+
+    cache_key = None 
+    if representation != 'ndjson': 
+      # the version is read before querying and moves after every committed 
+      # write to the user's contacts, see Contact 
+      version = get_versions('contact_lists').get(user.id)
+      cache_key = (user.id, version, representation, request.query_string)
+      cached = get_cache('contact_lists').get(cache_key)
+      if cached is not MISSING: 
+        body, etag = cached 
+        headers = dict(_validator_headers(etag), Vary='Accept')
+        if _not_modified(etag):
+          return _not_modified_response(headers)
+        return Response(body, mimetype=mimetype, headers=headers)
+
+    # lists only get an ETag, a delete leaves no updated_at behind for 
+    # If-Modified-Since to see
+    etag = _contact_list_etag(user.id, representation)
+    headers = dict(_validator_headers(etag), Vary='Accept')
+    if _not_modified(etag):
+      return _not_modified_response(headers)
+
     contacts = db.session.query(Contact).filter_by(user_id=user.id)
-    contact_payload = {}
-    contact_list = []
+    contacts = contacts.filter(*_parse_filters(request.args)).order_by(*_order_by(order))
+    if after is not None: 
+      contacts = contacts.filter(_keyset_filter(order, after))
+    if representation == 'ndjson':
+      if limit is not None: 
+        contacts = contacts.limit(limit)
+      response = _stream_contacts(contacts)
+      response.headers.extend(headers)
+      return response
+
+    if limit is not None: 
+      # one extra row tells us whether there is a next page
+      contacts = contacts.limit(limit + 1)
 
-    for contact in contacts:
-      contact_list.append(_contact_payload(contact))
-      
-    contact_payload['contacts'] = contact_list
+    contacts = contacts.all()
+    has_next = limit is not None and len(contacts) > limit
+    if has_next: 
+      contacts = contacts[:limit]
+
+    contact_payload = {}
+    if representation == 'json': 
+      contact_payload['contacts'] = [_contact_payload(contact) for contact in contacts]
+    else: 
+      contact_payload['contacts'] = _contact_columns(contacts)
+    if limit is not None: 
+      contact_payload['next'] = None
+      if has_next: 
+        contact_payload['next'] = _encode_cursor(contacts[-1], order)
     contact_payload['success'] = True
     
-    return contact_payload, 200
+    # serialized here rather than by flask-restful so the bytes can be cached
+    body = packb(contact_payload) if representation == 'msgpack' else dumps(contact_payload)
+    if len(body) <= current_app.config.get('CONTACT_LIST_CACHE_MAX_BYTES', 0): 
+      get_cache('contact_lists').set(cache_key, (body, etag))
+
+    return Response(body, mimetype=mimetype, headers=headers)
 
 class ContactResource(Resource):
   '''
@@ -92,94 +327,97 @@ class ContactResource(Resource):
   endpoints for show, update, and delete contacts 
   [GET, PATCH, DELETE] /users/<user_id>/contacts/<contact_id>
   '''
-  def _update_contact(self, contact, data):
-    proceed = True 
-    errors = []
-
-    proceed, first_name, errors = _validate_field(data, 'first_name', proceed, errors, missing_okay=True)
-    proceed, last_name, errors = _validate_field(data, 'last_name', proceed, errors, missing_okay=True)
-    proceed, group, errors = _validate_field(data, 'group', proceed, errors, missing_okay=True)
-    proceed, phone_number, errors = _validate_field(data, 'phone_number', proceed, errors, missing_okay=True)
-    proceed, street_address, errors = _validate_field(data, 'street_address', proceed, errors, missing_okay=True)
-    proceed, street_address_2, errors = _validate_field(data, 'street_address_2', proceed, errors, missing_okay=True)
-    proceed, city, errors = _validate_field(data, 'city', proceed, errors, missing_okay=True)
-    proceed, state, errors = _validate_field(data, 'state', proceed, errors, missing_okay=True)
-    proceed, zipcode, errors = _validate_field(data, 'zipcode', proceed, errors, missing_okay=True)
-
-    if proceed: 
-      if first_name:
-        contact.first_name = first_name
-      if last_name:
-        contact.last_name = last_name
-      if group:
-        contact.group = group
-      if phone_number:
-        contact.phone_number = phone_number
-      if street_address:
-        contact.street_address = street_address
-      if street_address_2:
-        contact.street_address_2 = street_address_2
-      if city:
-        contact.city = city
-      if state:
-        contact.state = state
-      if zipcode:
-        contact.zipcode = zipcode
-
-      contact.update()
-      return contact, errors
-    else: 
-      return None, errors 
+  def _not_found(self, user_id, contact_id):
+    '''
+    404 when the user does not exist, 400 when the contact does not
+    '''
+    _validate_user(user_id)
+    return _error_response([f"contact with id: '{contact_id}' not found"], 400)
 
   def get(self, **kwargs):
     user_id = int(kwargs['user_id'].strip())
-    user = _validate_user(user_id)
-
     contact_id = int(kwargs['contact_id'].strip())
 
-    try: 
-      contact = db.session.query(Contact).filter_by(id=contact_id).one()
-    except: 
-      errors = [f"contact with id: '{contact_id}' not found"]
-      return _error_response(errors, 400)
+    contact = Contact.find_for_user(user_id, contact_id)
+    if contact is None: 
+      return abort(404)
+    if contact.id is None: 
+      return _error_response([f"contact with id: '{contact_id}' not found"], 400)
+
+    etag = _contact_etag(contact.id, contact.updated_at)
+    if _has_validators() and _not_modified(etag, contact.updated_at):
+      return _not_modified_response(_validator_headers(etag, contact.updated_at))
 
     contact_payload = _contact_payload(contact)
     contact_payload['success'] = True
 
-    return contact_payload, 200
+    return contact_payload, 200, _validator_headers(etag, contact.updated_at)
 
   def patch(self, **kwargs):
     user_id = int(kwargs['user_id'].strip())
-    user = _validate_user(user_id)
-
     contact_id = int(kwargs['contact_id'].strip())
 
-    try: 
-      contact = db.session.query(Contact).filter_by(id=contact_id).one()
-      contact, errors = self._update_contact(contact, json.loads(request.data))
-    except NoResultFound: 
-      errors = [f"contact with id: '{contact_id}' not found"]
+    values, errors = _validate_contact_changes(request_json())
+    if errors: 
+      _validate_user(user_id)
       return _error_response(errors, 400)
 
-    if contact is not None: 
-      contact_payload = _contact_payload(contact)
-      contact_payload['success'] = True 
-
-      return contact_payload, 200
+    if values: 
+      contact = Contact.update_for_user(user_id, contact_id, values)
     else: 
-      return _error_response(errors, 400)
+      # nothing to change, and nothing to bump updated_at for
+      contact = Contact.find_for_user(user_id, contact_id)
+      contact = contact if contact is not None and contact.id is not None else None
+    if contact is None: 
+      return self._not_found(user_id, contact_id)
+
+    contact_payload = _contact_payload(contact)
+    contact_payload['success'] = True 
+
+    return contact_payload, 200
 
   def delete(self, **kwargs):
+    user_id = int(kwargs['user_id'].strip())
+    contact_id = int(kwargs['contact_id'].strip())
+
+    if not Contact.delete_for_user(user_id, contact_id): 
+      return self._not_found(user_id, contact_id)
+
+    return {}, 204
+
+class ContactSearchResource(Resource):
+  '''
+  requires a valid user_id argument 
+  typeahead search over a user's contacts [GET] /users/<user_id>/contacts/search?q=
+  '''
+  def get(self, **kwargs):
     user_id = int(kwargs['user_id'].strip())
     user = _validate_user(user_id)
 
-    contact_id = int(kwargs['contact_id'].strip())
+    errors = []
+    terms = request.args.get('q', '').split()
+    if 'q' not in request.args: 
+      errors.append("required 'q' parameter is missing")
+    elif len(terms) == 0: 
+      errors.append("required 'q' parameter is blank")
 
-    try: 
-      contact = db.session.query(Contact).filter_by(id=contact_id).one()
-      contact.delete()
-    except NoResultFound: 
-      errors = [f"contact with id: '{contact_id}' not found"]
+    limit = DEFAULT_SEARCH_LIMIT
+    if 'limit' in request.args: 
+      try: 
+        limit = min(int(request.args['limit']), MAX_SEARCH_LIMIT)
+      except ValueError: 
+        errors.append("'limit' parameter must be an integer")
+      else: 
+        if limit < 1:
+          errors.append("'limit' parameter must be at least 1")
+
+    if errors: 
       return _error_response(errors, 400)
 
-    return {}, 204
+    contacts = db.session.query(Contact).filter_by(user_id=user.id).filter(_search_filter(terms))
+    contacts = contacts.order_by(Contact.last_name, Contact.first_name, Contact.id).limit(limit)
+
+    return {
+      'contacts': [_contact_payload(contact) for contact in contacts],
+      'success': True
+    }, 200
@@ -0,0 +1,79 @@
+import zlib 
+from flask import request, Response, stream_with_context 
+from flask_restful import Resource 
+from sqlalchemy import select 
+
+from api import db 
+from api.database.models import Contact 
+from api.formats import FORMATS, EXPORT_MIMETYPES, encode_contacts 
+from . import _error_response
+from .contacts import _validate_user, CONTACT_FIELDS
+
+EXPORT_BATCH_SIZE = 1000
+GZIP_LEVEL = 6
+
+def _export_batches(user_id):
+  '''
+  yields lists of plain rows (no ORM objects) from a server side cursor, read 
+  on a dedicated read only repeatable read transaction so the whole export is 
+  one consistent snapshot even while the user keeps editing
+  '''
+  table = Contact.__table__
+  query = select([table.c[field] for field in CONTACT_FIELDS])
+  query = query.where(table.c.user_id == user_id)
+  query = query.order_by(table.c.last_name, table.c.first_name, table.c.id)
+
+  connection = db.engine.connect()
+  try: 
+    transaction = connection.begin()
+    if connection.dialect.name == 'postgresql':
+      connection.execute('SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY')
+
+    result = connection.execution_options(stream_results=True).execute(query)
+    while True: 
+      rows = result.fetchmany(EXPORT_BATCH_SIZE)
+      if not rows: 
+        break
+      yield rows
+
+    transaction.commit()
+  finally: 
+    connection.close()
+
+def _gzipped(chunks, level=GZIP_LEVEL):
+  compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+  for chunk in chunks: 
+    data = compressor.compress(chunk)
+    if data: 
+      yield data
+  yield compressor.flush()
+
+class ContactExportResource(Resource):
+  '''
+  requires a valid user_id argument 
+  streams the address book as a file [GET] /users/<user_id>/contacts/export?format=csv|vcf 
+  ?gzip=1 compresses it on the fly
+  '''
+  def get(self, **kwargs):
+    user_id = int(kwargs['user_id'].strip())
+    user = _validate_user(user_id)
+
+    file_format = request.args.get('format', 'csv').lower()
+    if file_format not in FORMATS: 
+      return _error_response([f"'format' parameter must be one of: {', '.join(FORMATS)}"], 400)
+
+    chunks = (text.encode('utf-8') for text in encode_contacts(_export_batches(user.id), file_format, CONTACT_FIELDS))
+    mimetype = EXPORT_MIMETYPES[file_format]
+    filename = f'contacts.{file_format}'
+
+    if request.args.get('gzip', '').lower() in ('1', 'true'):
+      chunks = _gzipped(chunks)
+      mimetype = 'application/gzip'
+      filename += '.gz'
+
+    # the body is generated after the view returns, keep the app context 
+    # around for db.engine 
+    response = Response(stream_with_context(chunks), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+
+    return response
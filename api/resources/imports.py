@@ -0,0 +1,99 @@
+import io 
+import csv 
+import datetime 
+from itertools import islice 
+from flask import request 
+from flask_restful import Resource 
+
+from api import db 
+from api.database.models import Contact, _contacts_changed, _next_change_seq 
+from api.database.loader import load_chunks 
+from api.formats import FORMATS, detect_format, parse_contacts 
+from . import _error_response
+from .contacts import _validate_user, _validate_contacts, CONTACT_FIELDS, REQUIRED_CONTACT_FIELDS
+
+IMPORT_CHUNK_SIZE = 5000
+MAX_REPORTED_ERRORS = 100
+CONTACT_COLUMNS = ('user_id',) + CONTACT_FIELDS + ('created_at', 'updated_at', 'change_seq')
+
+def _import_contacts(user_id, records, chunk_size=IMPORT_CHUNK_SIZE):
+  '''
+  validates parsed contact records and loads the valid ones chunk_size at a time 
+  chunks are committed as they fill, so a failure part way through keeps the 
+  earlier chunks. each chunk takes its own change_seq, delta sync sees every 
+  chunk as a separate change. returns (imported, skipped, errors), errors capped at MAX_REPORTED_ERRORS
+  '''
+  now = datetime.datetime.utcnow()
+  report = {'skipped': 0, 'errors': []}
+
+  def valid_rows():
+    # validated a chunk at a time, the records are parsed lazily
+    records_left = iter(records)
+    number = 0
+    while True: 
+      batch = list(islice(records_left, chunk_size))
+      if not batch: 
+        break
+
+      rows, invalid = _validate_contacts(batch)
+      report['skipped'] += len(invalid)
+      for index, errors in invalid[:max(0, MAX_REPORTED_ERRORS - len(report['errors']))]:
+        report['errors'].append({'record': number + index + 1, 'errors': errors})
+      number += len(batch)
+
+      for row in rows: 
+        row.update(user_id=user_id, created_at=now, updated_at=now)
+        yield row
+
+  def stamp(chunk):
+    change_seq = _next_change_seq(user_id)
+    for row in chunk: 
+      row['change_seq'] = change_seq
+
+  try: 
+    imported = load_chunks(Contact.__table__, CONTACT_COLUMNS, valid_rows(), chunk_size, prepare=stamp)
+  finally: 
+    # earlier chunks are committed even when a later one fails
+    _contacts_changed(user_id)
+  return imported, report['skipped'], report['errors']
+
+def _read_contacts(stream, file_format):
+  '''
+  parses a binary file stream lazily, one record at a time
+  '''
+  lines = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+  return parse_contacts(lines, file_format, REQUIRED_CONTACT_FIELDS)
+
+class ContactImportResource(Resource):
+  '''
+  requires a valid user_id argument 
+  imports a csv or vcard file [POST] /users/<user_id>/contacts/import?format=csv|vcf 
+  the file is either the raw request body or a multipart 'file' field
+  '''
+  def post(self, **kwargs):
+    user_id = int(kwargs['user_id'].strip())
+    user = _validate_user(user_id)
+
+    stream, mimetype, filename = request.stream, request.mimetype, None
+    if request.mimetype == 'multipart/form-data':
+      upload = request.files.get('file')
+      if upload is None: 
+        return _error_response(["required 'file' parameter is missing"], 400)
+      stream, mimetype, filename = upload.stream, upload.mimetype, upload.filename
+
+    file_format = detect_format(request.args.get('format'), mimetype, filename)
+    if file_format is None: 
+      return _error_response([f"'format' parameter must be one of: {', '.join(FORMATS)}"], 400)
+
+    try: 
+      imported, skipped, errors = _import_contacts(user.id, _read_contacts(stream, file_format))
+    except (csv.Error, UnicodeDecodeError) as error: 
+      db.session.rollback()
+      return _error_response([f"file could not be parsed: {error}"], 400)
+
+    return {
+      'success': True,
+      'imported': imported,
+      'skipped': skipped,
+      'errors': errors
+    }, 201
@@ -1,12 +1,15 @@
-import json 
-from flask import request 
 from flask_restful import Resource, abort 
 
 from api import db 
 from api.database.models import User 
-from . import _validate_field, _error_response
+from api.serialization import request_json 
+from api.validation import column_fields, compile_validator 
+from . import _error_response
 from sqlalchemy.orm.exc import NoResultFound
 
+_validate_login = compile_validator(column_fields(User.__table__, ('email',), ('email',)), '_validate_login', 
+                                    not_object="login must be a json object")
+
 def _user_payload(user):
   return {
     'id': user.id,
@@ -17,16 +20,11 @@ def _user_payload(user):
 
 class LoginResource(Resource):
   def post(self):
-    proceed = True 
-    errors = []
-
-    data = json.loads(request.data)
-    proceed, user_email, errors = _validate_field(
-      data, 'email', proceed, errors)
+    values, errors = _validate_login(request_json())
 
-    if proceed: 
+    if not errors: 
       try: 
-        user = db.session.query(User).filter_by(email=user_email).one()
+        user = db.session.query(User).filter_by(email=values['email']).one()
       except NoResultFound:
         return abort(404)
     else: 
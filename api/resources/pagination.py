@@ -0,0 +1,133 @@
+import json
+import base64
+import binascii
+import datetime
+
+from sqlalchemy import tuple_, and_, or_, DateTime, Integer, String
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# an order is a list of (column, descending) pairs ending in a unique column, 
+# so every row has exactly one position and a cursor can resume after it
+
+def _pack(values):
+  '''
+  json values as an opaque, url safe token
+  '''
+  raw = json.dumps(values, separators=(',', ':')).encode('utf-8')
+  return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def _unpack(token):
+  padded = token + '=' * (-len(token) % 4)
+  try:
+    return json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+  except (ValueError, binascii.Error):
+    return None
+
+def _sort_signature(order):
+  return ','.join(('-' if descending else '') + column.key for column, descending in order)
+
+def _order_by(order):
+  return [column.desc() if descending else column for column, descending in order]
+
+def _encode_cursor(row, order):
+  '''
+  opaque, url safe cursor holding the sort key of the last row on a page
+  '''
+  values = [_sort_signature(order)]
+  for column, _ in order:
+    value = getattr(row, column.key)
+    if isinstance(value, datetime.datetime):
+      value = value.isoformat()
+    values.append(value)
+
+  return _pack(values)
+
+def _decode_value(column, value):
+  '''
+  a cursor value checked against its column's type, raises ValueError when 
+  it could not have come from _encode_cursor
+  '''
+  if value is None and column.nullable: 
+    return None
+  if isinstance(column.type, DateTime):
+    if not isinstance(value, str):
+      raise ValueError('not a timestamp')
+    return datetime.datetime.fromisoformat(value)
+  if isinstance(column.type, Integer):
+    if not isinstance(value, int) or isinstance(value, bool):
+      raise ValueError('not an integer')
+    return value
+  if isinstance(column.type, String):
+    if not isinstance(value, str):
+      raise ValueError('not a string')
+    return value
+  raise ValueError(f'{column.key} can not be used in a cursor')
+
+def _decode_cursor(cursor, order):
+  '''
+  returns the sort key values, or None when the cursor is malformed, holds 
+  values of the wrong type or was issued for a different order
+  '''
+  values = _unpack(cursor)
+  if not isinstance(values, list) or len(values) != len(order) + 1:
+    return None
+  if values[0] != _sort_signature(order):
+    return None
+
+  try: 
+    return [_decode_value(column, value) for (column, _), value in zip(order, values[1:])]
+  except ValueError: 
+    return None
+
+def _parse_page_args(args, order):
+  '''
+  reads ?limit= and ?after= from the query string 
+  limit stays None (unpaginated) unless either parameter is given
+  '''
+  errors = []
+  limit = None
+  after = None
+
+  if 'limit' in args:
+    try: 
+      limit = int(args['limit'])
+    except ValueError: 
+      errors.append("'limit' parameter must be an integer")
+    else: 
+      if limit < 1:
+        errors.append("'limit' parameter must be at least 1")
+      limit = min(limit, MAX_PAGE_SIZE)
+
+  if 'after' in args:
+    after = _decode_cursor(args['after'], order)
+    if after is None:
+      errors.append("'after' parameter is not a valid cursor")
+    if limit is None:
+      limit = DEFAULT_PAGE_SIZE
+
+  return limit, after, errors
+
+def _keyset_filter(order, values):
+  '''
+  rows strictly after the cursor in the given order 
+  a single direction compiles to a row value comparison, (a, b, c) > (x, y, z), 
+  which a composite index on the sort key can seek on directly
+  '''
+  columns = [column for column, _ in order]
+  directions = set(descending for _, descending in order)
+
+  if directions == {False}:
+    return tuple_(*columns) > tuple_(*values)
+  if directions == {True}:
+    return tuple_(*columns) < tuple_(*values)
+
+  # mixed directions: (a > x) or (a = x and b < y) or (a = x and b = y and c > z)
+  clauses = []
+  for i, (column, descending) in enumerate(order):
+    equal = [previous == value for previous, value in zip(columns[:i], values[:i])]
+    step = column < values[i] if descending else column > values[i]
+    clauses.append(and_(*equal, step))
+
+  return or_(*clauses)
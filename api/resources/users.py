@@ -1,12 +1,24 @@
-import json 
-from flask import request
 from flask_restful import Resource, abort
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm.exc import NoResultFound
 
 from api import db 
 from api.database.models import User
-from . import _validate_field, _error_response
+from api.serialization import request_json
+from api.validation import column_fields, optional, compile_validator 
+from . import _error_response
+from .conditional import _etag, _validator_headers, _has_validators, _not_modified, _not_modified_response
+
+USER_FIELDS = ('first_name', 'last_name', 'email')
+USER_SCHEMA = column_fields(User.__table__, USER_FIELDS, USER_FIELDS)
+
+_validate_user_fields = compile_validator(USER_SCHEMA, '_validate_user_fields', 
+                                          not_object="user must be a json object")
+_validate_user_changes = compile_validator(optional(USER_SCHEMA), '_validate_user_changes', 
+                                           not_object="user must be a json object")
+
+def _user_etag(user_id, updated_at):
+  return _etag('user', user_id, updated_at)
 
 def _user_payload(user):
   return {
@@ -21,22 +33,14 @@ class UsersResource(Resource):
   create user endpoint
   '''
   def _create_user(self, data):
-    proceed = True 
-    errors = []
+    values, errors = _validate_user_fields(data)
 
-    proceed, first_name, errors = _validate_field(
-      data, 'first_name', proceed, errors)
-    proceed, last_name, errors = _validate_field(
-      data, 'last_name', proceed, errors)
-    proceed, email, errors = _validate_field(
-      data, 'email', proceed, errors)
-
-    if proceed:
+    if not errors:
       try: 
         user = User(
-              email=email,
-              first_name=first_name,
-              last_name=last_name
+              email=values['email'],
+              first_name=values['first_name'],
+              last_name=values['last_name']
             )
         user.insert()
       except IntegrityError: 
@@ -48,7 +52,7 @@ class UsersResource(Resource):
       return None, errors 
 
   def post(self):
-    user, errors = self._create_user(json.loads(request.data))
+    user, errors = self._create_user(request_json())
     if user is not None: 
       user_payload = _user_payload(user)
       user_payload['success'] = True 
@@ -64,15 +68,17 @@ class UserResource(Resource):
   '''
   def get(self, **kwargs):
     user_id = int(kwargs['user_id'].strip())
-    user = None 
-    try: 
-      user = db.session.query(User).filter_by(id=user_id).one()
-    except NoResultFound:
+    user = User.get_cached(user_id)
+    if user is None: 
       return abort(404)
+
+    etag = _user_etag(user.id, user.updated_at)
+    if _has_validators() and _not_modified(etag, user.updated_at):
+      return _not_modified_response(_validator_headers(etag, user.updated_at))
     
     user_payload = _user_payload(user)
     user_payload['success'] = True
-    return user_payload, 200
+    return user_payload, 200, _validator_headers(etag, user.updated_at)
 
   def patch(self, **kwargs):
     user_id = int(kwargs['user_id'].strip())
@@ -82,27 +88,17 @@ class UserResource(Resource):
     except NoResultFound:
       return abort(404)
 
-    proceed = True 
-    errors = []
-    data = json.loads(request.data)
-
-    proceed, first_name, errors = _validate_field(data, 'first_name', proceed, errors, missing_okay=True)
-    proceed, last_name, errors = _validate_field(data, 'last_name', proceed, errors, missing_okay=True)
-    proceed, email, errors = _validate_field(data, 'email', proceed, errors, missing_okay=True)
+    values, errors = _validate_user_changes(request_json())
     
-    if not proceed: 
+    if errors: 
       return {
         'success': False, 
         'error': 400,
         'errors': errors
       }, 400
     
-    if first_name and len(first_name.strip()) > 0:
-      user.first_name = first_name
-    if last_name and len(last_name.strip()) > 0: 
-      user.last_name = last_name
-    if email and len(email.strip()) > 0: 
-      user.email = email 
+    for field, value in values.items():
+      setattr(user, field, value)
 
     user.update()
 
@@ -0,0 +1,131 @@
+'''
+json for request bodies and responses, with orjson when it is installed and
+the stdlib json module otherwise. output_json is registered as flask-restful's
+application/json representation in create_app
+
+both encoders write compact utf-8 bytes that go into the response as they
+are, rather than a str that flask encodes again
+
+packb writes messagepack, with the msgpack package when it is installed and
+a small pure python packer (the types json has, plus bytes) otherwise
+'''
+import json
+import struct
+from flask import current_app, request
+
+try:
+  import orjson
+except ImportError:
+  orjson = None
+
+try:
+  import msgpack
+except ImportError:
+  msgpack = None
+
+JSON_MIMETYPE = 'application/json'
+MSGPACK_MIMETYPE = 'application/msgpack'
+
+def _dumps_stdlib(data):
+  return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+def _loads_stdlib(data):
+  if isinstance(data, (bytes, bytearray, memoryview)):
+    data = bytes(data).decode('utf-8')
+  return json.loads(data)
+
+if orjson is not None:
+  dumps = orjson.dumps
+  loads = orjson.loads
+else:
+  dumps = _dumps_stdlib
+  loads = _loads_stdlib
+
+def _pack_into(buffer, value):
+  if value is None:
+    buffer.append(0xc0)
+  elif value is True:
+    buffer.append(0xc3)
+  elif value is False:
+    buffer.append(0xc2)
+  elif isinstance(value, int):
+    if 0 <= value < 0x80:
+      buffer.append(value)
+    elif -0x20 <= value < 0:
+      buffer.append(value & 0xff)
+    elif value >= 0:
+      for marker, fmt, limit in ((0xcc, '>B', 1 << 8), (0xcd, '>H', 1 << 16), (0xce, '>I', 1 << 32), (0xcf, '>Q', 1 << 64)):
+        if value < limit:
+          buffer.append(marker)
+          buffer += struct.pack(fmt, value)
+          return
+      raise OverflowError('int too big to pack')
+    else:
+      for marker, fmt, limit in ((0xd0, '>b', 1 << 7), (0xd1, '>h', 1 << 15), (0xd2, '>i', 1 << 31), (0xd3, '>q', 1 << 63)):
+        if value >= -limit:
+          buffer.append(marker)
+          buffer += struct.pack(fmt, value)
+          return
+      raise OverflowError('int too small to pack')
+  elif isinstance(value, float):
+    buffer.append(0xcb)
+    buffer += struct.pack('>d', value)
+  elif isinstance(value, str):
+    data = value.encode('utf-8')
+    _pack_header(buffer, len(data), 0xa0, 32, (0xd9, 0xda, 0xdb))
+    buffer += data
+  elif isinstance(value, (bytes, bytearray, memoryview)):
+    data = bytes(value)
+    _pack_header(buffer, len(data), None, 0, (0xc4, 0xc5, 0xc6))
+    buffer += data
+  elif isinstance(value, (list, tuple)):
+    _pack_header(buffer, len(value), 0x90, 16, (None, 0xdc, 0xdd))
+    for item in value:
+      _pack_into(buffer, item)
+  elif isinstance(value, dict):
+    _pack_header(buffer, len(value), 0x80, 16, (None, 0xde, 0xdf))
+    for key, item in value.items():
+      _pack_into(buffer, key)
+      _pack_into(buffer, item)
+  else:
+    raise TypeError(f'can not pack {type(value).__name__}')
+
+def _pack_header(buffer, length, fix_marker, fix_limit, markers):
+  '''
+  the smallest header for length: the fix form, then 8, 16 and 32 bit lengths
+  (markers holds None where a width does not exist for the type)
+  '''
+  if length < fix_limit:
+    buffer.append(fix_marker | length)
+    return
+  for marker, fmt, limit in zip(markers, ('>B', '>H', '>I'), (1 << 8, 1 << 16, 1 << 32)):
+    if marker is not None and length < limit:
+      buffer.append(marker)
+      buffer += struct.pack(fmt, length)
+      return
+  raise OverflowError('too long to pack')
+
+def _packb_python(value):
+  buffer = bytearray()
+  _pack_into(buffer, value)
+  return bytes(buffer)
+
+packb = msgpack.packb if msgpack is not None else _packb_python
+
+def output_json(data, code, headers=None):
+  '''
+  flask-restful representation, data may be anything dumps takes
+  '''
+  response = current_app.response_class(dumps(data), status=code, mimetype=JSON_MIMETYPE)
+  response.headers.extend(headers or {})
+  return response
+
+def request_json(default=None):
+  '''
+  the parsed request body, default when the body is empty. malformed json
+  raises ValueError like json.loads(request.data) did
+  '''
+  body = request.get_data()
+  if not body and default is not None:
+    return default
+  return loads(body)
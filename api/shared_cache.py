@@ -0,0 +1,281 @@
+'''
+the caches of api/cache.py backed by one sqlite file that every worker on
+the host opens, in a directory only the app's user can enter (see
+private_directory), the file itself readable by that user alone
+
+one copy of each entry exists per host rather than per worker, and a
+version bumped by the worker that handled a write is what every other worker
+reads on its next request, no broadcast needed on a single host. durability
+does not matter for a cache, so the file runs with synchronous=OFF and any
+sqlite error degrades to a miss rather than failing the request
+
+values are stored as a json header followed by the raw bytes of any bytes
+in them (see _dumps), never pickled, so reading an entry can not run code
+'''
+import os
+import json
+import stat
+import time
+import random
+import struct
+import sqlite3
+import hashlib
+import logging
+import datetime
+import threading
+
+from api import metrics
+from api.cache import MISSING
+
+logger = logging.getLogger(__name__)
+
+# every this many sets a process sweeps expired entries and trims the cache
+SWEEP_EVERY = 32
+
+SCHEMA = '''
+  CREATE TABLE IF NOT EXISTS entries (
+    cache TEXT NOT NULL, key TEXT NOT NULL, expires REAL NOT NULL, value BLOB NOT NULL,
+    PRIMARY KEY (cache, key)
+  );
+  CREATE INDEX IF NOT EXISTS ix_entries_cache_expires ON entries (cache, expires);
+  CREATE TABLE IF NOT EXISTS versions (
+    name TEXT NOT NULL, key TEXT NOT NULL, version INTEGER NOT NULL,
+    PRIMARY KEY (name, key)
+  );
+'''
+
+def private_directory(path):
+  '''
+  creates path as a 0700 directory, or checks an existing one is a directory
+  of the current user that nobody else can enter, returns path
+  '''
+  os.makedirs(path, mode=0o700, exist_ok=True)
+  info = os.lstat(path)
+  if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid():
+    raise RuntimeError(f'cache directory {path} must be a directory owned by the current user')
+  if stat.S_IMODE(info.st_mode) & 0o077:
+    os.chmod(path, 0o700)
+  return path
+
+def store_path(directory, database_uri):
+  '''
+  one file per database, so apps pointed at different databases on the
+  same host never share entries
+  '''
+  digest = hashlib.sha1(database_uri.encode('utf-8')).hexdigest()[:12]
+  return os.path.join(directory, f'address-book-cache-{digest}.sqlite3')
+
+class SharedStore:
+  '''
+  a connection per thread and process to the sqlite file at path
+  '''
+  def __init__(self, path):
+    self.path = path
+    self._local = threading.local()
+
+  def connection(self):
+    connection = getattr(self._local, 'connection', None)
+    if connection is None or self._local.pid != os.getpid():
+      # created 0600 before sqlite opens it, the -wal and -shm files follow its mode
+      os.close(os.open(self.path, os.O_RDWR | os.O_CREAT | os.O_NOFOLLOW, 0o600))
+      connection = sqlite3.connect(self.path, timeout=1, isolation_level=None, check_same_thread=False)
+      connection.execute('PRAGMA journal_mode=WAL')
+      connection.execute('PRAGMA synchronous=OFF')
+      connection.executescript(SCHEMA)
+      self._local.connection = connection
+      self._local.pid = os.getpid()
+
+    return connection
+
+def _tag(value, blobs):
+  if isinstance(value, bytes):
+    blobs.append(value)
+    return {'__bytes__': len(value)}
+  if isinstance(value, datetime.datetime):
+    return {'__datetime__': value.isoformat()}
+  if isinstance(value, (list, tuple)):
+    return [_tag(item, blobs) for item in value]
+  if isinstance(value, dict):
+    return {key: _tag(item, blobs) for key, item in value.items()}
+  return value
+
+def _untag(value, read):
+  if isinstance(value, list):
+    return [_untag(item, read) for item in value]
+  if isinstance(value, dict):
+    if '__bytes__' in value:
+      return read(value['__bytes__'])
+    if '__datetime__' in value:
+      return datetime.datetime.fromisoformat(value['__datetime__'])
+    return {key: _untag(item, read) for key, item in value.items()}
+  return value
+
+def _dumps(value):
+  '''
+  json's types plus bytes and datetimes, the ones the caches hold. tuples come
+  back as lists. bytes follow the json header as they are, in the order the
+  header mentions them, so a cached response body is not escaped or copied
+  more than once
+  '''
+  blobs = []
+  header = json.dumps(_tag(value, blobs), separators=(',', ':')).encode('utf-8')
+  return b''.join([struct.pack('>I', len(header)), header] + blobs)
+
+def _loads(data):
+  data = memoryview(data)
+  length, = struct.unpack_from('>I', data)
+  offset = 4 + length
+
+  def read(size):
+    nonlocal offset
+    offset += size
+    return bytes(data[offset - size:offset])
+
+  return _untag(json.loads(bytes(data[4:4 + length]).decode('utf-8')), read)
+
+class SharedCache:
+  '''
+  LRUCache's interface over the shared store. values go through _dumps, keys
+  are their repr. past max_entries the entries closest to expiry are dropped,
+  which keeps reads free of writes at the cost of exact LRU order
+  '''
+  def __init__(self, store, name, max_entries, ttl):
+    self.store = store
+    self.name = name
+    self.max_entries = max_entries
+    self.ttl = ttl
+    self.hits = 0
+    self.misses = 0
+    self._sets = 0
+
+  def __len__(self):
+    return self.store.connection().execute(
+      'SELECT count(*) FROM entries WHERE cache = ? AND expires > ?', (self.name, time.time())).fetchone()[0]
+
+  def get(self, key):
+    try:
+      row = self.store.connection().execute(
+        'SELECT value FROM entries WHERE cache = ? AND key = ? AND expires > ?',
+        (self.name, repr(key), time.time())).fetchone()
+      value = MISSING if row is None else _loads(row[0])
+    except (sqlite3.Error, ValueError, TypeError, struct.error):
+      # a truncated or corrupt entry is a miss like any other error
+      value = MISSING
+
+    if value is MISSING:
+      self.misses += 1
+    else:
+      self.hits += 1
+
+    metrics.inc('cache_requests_total', {'cache': self.name, 'result': 'miss' if value is MISSING else 'hit'})
+    return value
+
+  def set(self, key, value):
+    if self.max_entries <= 0:
+      return
+
+    try:
+      connection = self.store.connection()
+      connection.execute('INSERT OR REPLACE INTO entries (cache, key, expires, value) VALUES (?, ?, ?, ?)',
+                         (self.name, repr(key), time.time() + self.ttl, _dumps(value)))
+      self._sets += 1
+      if self._sets % SWEEP_EVERY == 0:
+        self._sweep(connection)
+    except sqlite3.Error:
+      pass
+
+  def _sweep(self, connection):
+    connection.execute('DELETE FROM entries WHERE cache = ? AND expires <= ?', (self.name, time.time()))
+    connection.execute('''
+      DELETE FROM entries WHERE cache = ? AND key IN (
+        SELECT key FROM entries WHERE cache = ? ORDER BY expires DESC LIMIT -1 OFFSET ?
+      )''', (self.name, self.name, self.max_entries))
+
+  def delete(self, key):
+    try:
+      self.store.connection().execute('DELETE FROM entries WHERE cache = ? AND key = ?', (self.name, repr(key)))
+    except sqlite3.Error:
+      pass
+
+  def clear(self):
+    try:
+      self.store.connection().execute('DELETE FROM entries WHERE cache = ?', (self.name,))
+    except sqlite3.Error:
+      pass
+
+class SharedVersionTable:
+  '''
+  VersionTable's interface over the shared store. versions are random 63 bit
+  numbers rather than a counter, so no process has to coordinate to hand
+  one out and a lost row simply comes back with a number nobody used
+
+  a read only writes when the key has no row yet. past max_entries the keys
+  assigned longest ago (lowest rowid, INSERT OR REPLACE moves a key to a new
+  one) are dropped, which at worst costs their entries a miss
+  '''
+  def __init__(self, store, name, max_entries):
+    self.store = store
+    self.name = name
+    self.max_entries = max_entries
+    self._writes = 0
+
+  def __len__(self):
+    return self.store.connection().execute('SELECT count(*) FROM versions WHERE name = ?', (self.name,)).fetchone()[0]
+
+  def get(self, key):
+    try:
+      connection = self.store.connection()
+      row = connection.execute('SELECT version FROM versions WHERE name = ? AND key = ?',
+                               (self.name, repr(key))).fetchone()
+      if row is not None:
+        return row[0]
+
+      connection.execute('INSERT OR IGNORE INTO versions (name, key, version) VALUES (?, ?, ?)',
+                         (self.name, repr(key), random.getrandbits(63)))
+      version = connection.execute('SELECT version FROM versions WHERE name = ? AND key = ?',
+                                   (self.name, repr(key))).fetchone()[0]
+    except sqlite3.Error:
+      # a version nothing is cached under, the request just misses
+      return random.getrandbits(63)
+
+    self._written(connection)
+    return version
+
+  def bump(self, key):
+    '''
+    runs after the write it is for has committed, so it never raises. when the
+    new version can not be stored the key's row is deleted instead, its next
+    read draws a number nothing is cached under. when that fails too the old
+    entries stay reachable until their ttl
+    '''
+    version = random.getrandbits(63)
+    try:
+      connection = self.store.connection()
+      connection.execute('INSERT OR REPLACE INTO versions (name, key, version) VALUES (?, ?, ?)',
+                         (self.name, repr(key), version))
+    except sqlite3.Error:
+      logger.warning('could not bump %s version of %r, deleting it', self.name, key, exc_info=True)
+      try:
+        self.store.connection().execute('DELETE FROM versions WHERE name = ? AND key = ?', (self.name, repr(key)))
+      except sqlite3.Error:
+        logger.exception('could not delete %s version of %r, its entries live out their ttl', self.name, key)
+      return version
+
+    self._written(connection)
+    return version
+
+  def _written(self, connection):
+    self._writes += 1
+    if self._writes % SWEEP_EVERY != 0:
+      return
+
+    try:
+      connection.execute('''
+        DELETE FROM versions WHERE name = ? AND rowid IN (
+          SELECT rowid FROM versions WHERE name = ? ORDER BY rowid DESC LIMIT -1 OFFSET ?
+        )''', (self.name, self.name, self.max_entries))
+    except sqlite3.Error:
+      pass
+
+  def clear(self):
+    self.store.connection().execute('DELETE FROM versions WHERE name = ?', (self.name,))
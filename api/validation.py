@@ -0,0 +1,125 @@
+'''
+request body validation compiled from a declarative schema
+
+a schema is a sequence of Field(name, required, max_length). compile_validator
+turns it into one function, written out field by field and compiled once at
+import, that takes a parsed json object and returns (values, errors): values
+holds the stripped strings of the fields that were given, errors the messages
+in field order. the input is never modified and keys outside the schema are
+ignored. a body is valid when errors is empty
+
+compile_batch_validator writes the same checks into one loop over a list of
+records, for bulk create and imports, with no call or result tuple per record
+
+the messages are the ones the resources always sent, plus one for values
+that are not strings and one for values longer than their column
+'''
+from collections import namedtuple
+
+Field = namedtuple('Field', ['name', 'required', 'max_length'])
+
+_MISSING = object()
+
+def column_fields(table, names, required=()):
+  '''
+  a Field per column in names, limited to the column's String(length)
+  '''
+  return tuple(Field(name, name in required, table.c[name].type.length) for name in names)
+
+def optional(fields):
+  '''
+  the same fields with none required, for partial updates
+  '''
+  return tuple(field._replace(required=False) for field in fields)
+
+def _field_source(field, indent='  ', missing=_MISSING):
+  '''
+  the checks for one field, appending messages to errors and the stripped
+  value to values. a missing optional field is left out, or set to missing
+  when one is given
+  '''
+  name = repr(field.name)
+  if field.required:
+    on_missing = f'errors.append({repr(f"required {field.name!r} parameter is missing")})'
+  elif missing is not _MISSING:
+    on_missing = f'values[{name}] = {missing!r}'
+  else:
+    on_missing = 'pass'
+
+  lines = [
+    f'value = data.get({name}, _MISSING)',
+    'if value is _MISSING:',
+    f'  {on_missing}',
+    'elif not isinstance(value, str):',
+    f'  errors.append({repr(f"{field.name!r} parameter must be a string")})',
+    'else:',
+    '  value = value.strip()',
+    '  if not value:',
+    f'    errors.append({repr(f"required {field.name!r} parameter is blank")})',
+  ]
+  if field.max_length is not None:
+    lines += [
+      f'  elif len(value) > {int(field.max_length)}:',
+      f'    errors.append({repr(f"{field.name!r} parameter must be at most {field.max_length} characters")})',
+    ]
+  lines += [
+    '  else:',
+    f'    values[{name}] = value',
+  ]
+  return [indent + line for line in lines]
+
+def _compile(lines, name, fields):
+  source = '\n'.join(lines)
+  namespace = {'_MISSING': _MISSING}
+  exec(compile(source, f'<validator {name}>', 'exec'), namespace)
+  function = namespace[name]
+  function.fields = tuple(fields)
+  function.source = source
+  return function
+
+def compile_validator(fields, name='validate', not_object='record must be a json object'):
+  '''
+  the validation function for fields, see the module docstring. data that 
+  is not a dict gets not_object
+  '''
+  lines = [
+    f'def {name}(data):',
+    '  if not isinstance(data, dict):',
+    f'    return {{}}, [{not_object!r}]',
+    '  values = {}',
+    '  errors = []',
+  ]
+  for field in fields:
+    lines += _field_source(field)
+  lines.append('  return values, errors')
+  return _compile(lines, name, fields)
+
+def compile_batch_validator(fields, name='validate_batch', defaults=None, not_object='record must be a json object'):
+  '''
+  the same checks over a list of records in one call, returns (rows, errors):
+  a dict per valid record holding every field, a missing optional one set to
+  its defaults entry or None, and (index, messages) per invalid record. a
+  record that is not a dict gets not_object
+  '''
+  defaults = defaults or {}
+  lines = [
+    f'def {name}(records):',
+    '  rows = []',
+    '  invalid = []',
+    '  for index, data in enumerate(records):',
+    '    if not isinstance(data, dict):',
+    f'      invalid.append((index, [{not_object!r}]))',
+    '      continue',
+    '    values = {}',
+    '    errors = []',
+  ]
+  for field in fields:
+    lines += _field_source(field, '    ', defaults.get(field.name))
+  lines += [
+    '    if errors:',
+    '      invalid.append((index, errors))',
+    '    else:',
+    '      rows.append(values)',
+    '  return rows, invalid',
+  ]
+  return _compile(lines, name, fields)
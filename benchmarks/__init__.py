@@ -0,0 +1,32 @@
+'''
+benchmark scripts, run from the project root against a disposable 
+database, e.g. python -m benchmarks.list_contacts --config testing
+'''
+import time 
+import statistics 
+
+def time_calls(func, repeat):
+  '''
+  calls func repeat times and returns the elapsed milliseconds of each call
+  '''
+  timings = []
+  for _ in range(repeat):
+    start = time.perf_counter()
+    func()
+    timings.append((time.perf_counter() - start) * 1000)
+
+  return timings
+
+def percentile(ordered, fraction):
+  '''
+  nearest rank percentile of an already sorted list
+  '''
+  return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+def summarize(timings):
+  ordered = sorted(timings)
+  return {
+    'median': statistics.median(ordered),
+    'p95': percentile(ordered, 0.95),
+    'min': ordered[0],
+  }
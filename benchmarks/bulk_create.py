@@ -0,0 +1,63 @@
+'''
+contact creation throughput, single row POSTs against one bulk POST 
+
+  python -m benchmarks.bulk_create --config testing --count 10000
+
+the configured database is dropped and recreated, never point it at real data 
+it has to be postgres: Contact.insert_many uses INSERT ... RETURNING, which 
+sqlalchemy 1.3 does not compile for sqlite
+'''
+import argparse 
+import time 
+
+from api import create_app, db 
+from api.database.models import User, Contact 
+
+def _payload(i):
+  return {
+    'first_name': f'first_{i}',
+    'last_name': f'last_{i}',
+    'phone_number': '303-555-0100',
+    'street_address': f'{i} benchmark way',
+    'city': 'Denver',
+    'state': 'Colorado',
+    'zipcode': '80000',
+  }
+
+def _single(client, user_id, count):
+  for i in range(count):
+    client.post(f'/users/{user_id}/contacts', json=_payload(i))
+
+def _bulk(client, user_id, count):
+  response = client.post(f'/users/{user_id}/contacts', json=[_payload(i) for i in range(count)])
+  assert response.status_code == 201, response.data
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument('--config', default='testing')
+  parser.add_argument('--count', type=int, default=10000)
+  args = parser.parse_args()
+
+  app = create_app(args.config)
+  with app.app_context():
+    db.drop_all()
+    db.create_all()
+    client = app.test_client()
+
+    print(f"{'path':>8} {'rows':>8} {'seconds':>10} {'rows/s':>10}")
+    for name, create in (('single', _single), ('bulk', _bulk)):
+      user = User(email=f'{name}@example.com', first_name='bench', last_name=name)
+      user.insert()
+
+      start = time.perf_counter()
+      create(client, user.id, args.count)
+      elapsed = time.perf_counter() - start
+
+      assert Contact.query.filter_by(user_id=user.id).count() == args.count
+      print(f'{name:>8} {args.count:>8} {elapsed:>10.2f} {args.count / elapsed:>10.0f}')
+
+    db.session.remove()
+    db.drop_all()
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,77 @@
+'''
+cpu against bandwidth for api/compression.py's codecs on the list and export
+bodies
+
+builds a --contacts address book from the factories, renders it the way
+GET /users/<user_id>/contacts (json, columnar, msgpack, ndjson) and
+/contacts/export (csv, vcf) do, then times each codec and level on each
+body. 'saved ms' is the transfer time the smaller body saves on a --mbps
+link, compression pays for itself while it is above 'compress ms'. the ndjson
+and export bodies are compressed the way they are streamed, in their own
+chunks, COMPRESSION_STREAM_FLUSH_SIZE bytes at a time. needs no
+database
+
+  python -m benchmarks.compression --contacts 10000 --repeat 10 --mbps 50
+'''
+import random
+import argparse
+from types import SimpleNamespace
+
+from api import serialization, compression
+from api.formats import encode_contacts
+from api.database.factories import contact_details
+from api.resources.contacts import _contact_payload, _contact_columns, CONTACT_FIELDS
+from config import Config
+from . import time_calls, summarize
+
+def _bodies(count):
+  '''
+  (name, chunks as the endpoint emits them)
+  '''
+  rng = random.Random(1)
+  contacts = [SimpleNamespace(id=contact_id, **contact_details(rng)) for contact_id in range(1, count + 1)]
+  rows = [_contact_payload(contact) for contact in contacts]
+  # the encoders read rows by attribute, like the export's result rows
+  batches = [contacts[start:start + 1000] for start in range(0, count, 1000)]
+
+  return [
+    ('list json', [serialization.dumps({'contacts': rows, 'next': None, 'success': True})]),
+    ('list columnar', [serialization.dumps({'contacts': _contact_columns(contacts), 'next': None, 'success': True})]),
+    ('list msgpack', [serialization.packb({'contacts': _contact_columns(contacts), 'next': None, 'success': True})]),
+    ('list ndjson', [serialization.dumps(row) + b'\n' for row in rows]),
+    ('export csv', [text.encode('utf-8') for text in encode_contacts(batches, 'csv', CONTACT_FIELDS)]),
+    ('export vcf', [text.encode('utf-8') for text in encode_contacts(batches, 'vcf', CONTACT_FIELDS)]),
+  ]
+
+def _codecs():
+  codecs = [(f'gzip {level}', lambda level=level: compression._Gzip(level)) for level in (1, 6, 9)]
+  if compression.brotli is not None:
+    codecs += [(f'br {quality}', lambda quality=quality: compression._Brotli(quality)) for quality in (1, 5, 9)]
+  else:
+    print('brotli is not installed, only gzip is timed')
+  return codecs
+
+def _compress(chunks, make_compressor, flush_size):
+  return b''.join(compression._compress_stream(iter(chunks), make_compressor(), flush_size))
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument('--contacts', type=int, default=10000)
+  parser.add_argument('--repeat', type=int, default=10)
+  parser.add_argument('--mbps', type=float, default=50, help='link speed the saved transfer time is computed for')
+  args = parser.parse_args()
+
+  flush_size = Config.COMPRESSION_STREAM_FLUSH_SIZE
+  print(f"{'body':<14} {'codec':<8} {'bytes':>10} {'ratio':>6} {'compress ms':>12} {'MB/s':>8} {'saved ms':>9}")
+  for name, chunks in _bodies(args.contacts):
+    size = sum(len(chunk) for chunk in chunks)
+    print(f"{name:<14} {'none':<8} {size:>10}")
+    for codec, make_compressor in _codecs():
+      compressed = len(_compress(chunks, make_compressor, flush_size))
+      stats = summarize(time_calls(lambda: _compress(chunks, make_compressor, flush_size), args.repeat))
+      saved = (size - compressed) * 8 / (args.mbps * 1000)
+      print(f"{'':<14} {codec:<8} {compressed:>10} {size / compressed:>6.1f} {stats['median']:>12.2f} "
+            f"{size / stats['median'] / 1000:>8.1f} {saved:>9.2f}")
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,63 @@
+'''
+user deletion time against the size of the user's address book 
+
+contacts are seeded server side with generate_series, so postgres only. with 
+ON DELETE CASCADE and passive_deletes the ORM never loads the contacts, so 
+the time column should barely move from an empty book to 100k contacts
+
+  python -m benchmarks.delete_user --config testing --sizes 0 1000 10000 100000
+
+the configured database is dropped and recreated, never point it at real data
+'''
+import argparse 
+import time 
+
+from sqlalchemy import text 
+
+from api import create_app, db 
+from api.database.models import User, Contact 
+
+INSERT_CONTACTS = text('''
+  INSERT INTO contacts (user_id, first_name, last_name, "group", street_address, 
+                        city, state, zipcode, created_at, updated_at)
+  SELECT :user_id, 'first_' || n, 'last_' || n, 'friend', n || ' benchmark way', 
+         'Denver', 'Colorado', '80000', now(), now()
+  FROM generate_series(1, :count) AS n
+''')
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument('--config', default='testing')
+  parser.add_argument('--sizes', type=int, nargs='+', default=[0, 1000, 10000, 100000])
+  args = parser.parse_args()
+
+  app = create_app(args.config)
+  with app.app_context():
+    db.drop_all()
+    db.create_all()
+    client = app.test_client()
+
+    print(f"{'contacts':>10} {'delete ms':>10}")
+    for size in args.sizes:
+      user = User(email=f'delete_{size}@example.com', first_name='bench', last_name='mark')
+      user.insert()
+      db.session.execute(INSERT_CONTACTS, {'user_id': user.id, 'count': size})
+      db.session.commit()
+      db.session.execute('ANALYZE contacts')
+      db.session.commit()
+      user_id = user.id
+      db.session.expire_all()
+
+      start = time.perf_counter()
+      response = client.delete(f'/users/{user_id}')
+      elapsed = (time.perf_counter() - start) * 1000
+
+      assert response.status_code == 204
+      assert Contact.query.filter_by(user_id=user_id).count() == 0
+      print(f'{size:>10} {elapsed:>10.1f}')
+
+    db.session.remove()
+    db.drop_all()
+
+if __name__ == '__main__':
+  main()
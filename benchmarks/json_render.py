@@ -0,0 +1,64 @@
+'''
+rendering and parsing a 10k contact list payload
+
+compares flask-restful's stock output_json (stdlib json.dumps, then encoded
+again by flask) with api.serialization's output_json on its stdlib fallback
+and on orjson when installed, plus parsing the rendered body back. needs no
+database
+
+  python -m benchmarks.json_render --contacts 10000 --repeat 50
+'''
+import argparse
+import json
+import random
+
+from flask_restful.representations.json import output_json as restful_output_json
+
+from api import create_app, serialization
+from api.database.factories import contact_details
+from . import time_calls, summarize
+
+def _payload(count):
+  rng = random.Random(1)
+  return {
+    'contacts': [dict(contact_details(rng), id=contact_id) for contact_id in range(1, count + 1)],
+    'next': None,
+    'success': True,
+  }
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument('--config', default='benchmark')
+  parser.add_argument('--contacts', type=int, default=10000)
+  parser.add_argument('--repeat', type=int, default=50)
+  args = parser.parse_args()
+
+  app = create_app(args.config)
+  payload = _payload(args.contacts)
+
+  def stdlib_output(data, code):
+    return app.response_class(serialization._dumps_stdlib(data), status=code, mimetype='application/json')
+
+  renderers = [('flask-restful output_json', restful_output_json), ('serialization, stdlib', stdlib_output)]
+  parsers = [('json.loads', lambda body: json.loads(body)), ('serialization, stdlib', serialization._loads_stdlib)]
+  if serialization.orjson is not None:
+    renderers.append(('serialization, orjson', serialization.output_json))
+    parsers.append(('serialization, orjson', serialization.loads))
+  else:
+    print('orjson is not installed, only the stdlib paths are timed')
+
+  print(f"{'render':<28} {'bytes':>10} {'median ms':>10} {'p95 ms':>10}")
+  with app.app_context():
+    for name, render in renderers:
+      body = render(payload, 200).get_data()
+      stats = summarize(time_calls(lambda: render(payload, 200).get_data(), args.repeat))
+      print(f"{name:<28} {len(body):>10} {stats['median']:>10.2f} {stats['p95']:>10.2f}")
+
+  body = serialization._dumps_stdlib(payload)
+  print(f"\n{'parse':<28} {'bytes':>10} {'median ms':>10} {'p95 ms':>10}")
+  for name, parse in parsers:
+    stats = summarize(time_calls(lambda: parse(body), args.repeat))
+    print(f"{name:<28} {len(body):>10} {stats['median']:>10.2f} {stats['p95']:>10.2f}")
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,112 @@
+'''
+list latency as the contacts table grows 
+
+grows the contacts table with filler rows spread over FILLER_USERS users 
+(seeded server side with generate_series, so postgres only) and times the 
+first page of GET /users/<user_id>/contacts for one user whose address book 
+stays at a fixed size. with the user_id indexes in place the latency 
+column stays flat from 10k to 10M rows; --without-indexes drops them to 
+show the sequential scan it replaces.
+
+  python -m benchmarks.list_contacts --config testing --sizes 10000 100000 1000000 10000000
+
+the configured database is dropped and recreated, never point it at real data
+'''
+import argparse 
+
+from sqlalchemy import text 
+
+from api import create_app, db 
+from api.database.models import User, Contact 
+from . import time_calls, summarize
+
+FILLER_USERS = 1000
+USER_INDEXES = (
+  'ix_contacts_user_id',
+  'ix_contacts_user_id_last_name_first_name_id',
+  'ix_contacts_user_id_group_last_name_first_name_id',
+  'ix_contacts_user_id_state_last_name_first_name_id',
+)
+
+INSERT_FILLER_USERS = text('''
+  INSERT INTO users (email, first_name, last_name, created_at, updated_at)
+  SELECT 'filler_' || n || '@example.com', 'filler', 'user_' || n, now(), now()
+  FROM generate_series(1, :count) AS n
+''')
+
+INSERT_FILLER_CONTACTS = text('''
+  INSERT INTO contacts (user_id, first_name, last_name, "group", street_address, 
+                        city, state, zipcode, created_at, updated_at)
+  SELECT :first_user_id + (n % :users), 'first_' || n, 'last_' || n, 'friend', n || ' filler st', 
+         'Denver', 'Colorado', '80000', now(), now()
+  FROM generate_series(1, :count) AS n
+''')
+
+def _seed_target_user(book_size):
+  user = User(email='benchmark@example.com', first_name='bench', last_name='mark')
+  user.insert()
+
+  for i in range(book_size):
+    Contact(user, {
+      'first_name': f'first_{i}',
+      'last_name': f'last_{i}',
+      'street_address': f'{i} benchmark way',
+      'city': 'Denver',
+      'state': 'Colorado',
+      'zipcode': '80000',
+    })
+  db.session.commit()
+
+  return user
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument('--config', default='testing')
+  parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000, 10000000])
+  parser.add_argument('--book-size', type=int, default=200)
+  parser.add_argument('--page-size', type=int, default=50)
+  parser.add_argument('--repeat', type=int, default=50)
+  parser.add_argument('--without-indexes', action='store_true')
+  args = parser.parse_args()
+
+  app = create_app(args.config)
+  with app.app_context():
+    db.drop_all()
+    db.create_all()
+    if args.without_indexes:
+      for index in USER_INDEXES:
+        db.session.execute(f'DROP INDEX {index}')
+      db.session.commit()
+
+    user = _seed_target_user(args.book_size)
+    db.session.execute(INSERT_FILLER_USERS, {'count': FILLER_USERS})
+    first_user_id = db.session.execute('SELECT min(id) FROM users WHERE first_name = :name', 
+                                       {'name': 'filler'}).scalar()
+    db.session.commit()
+
+    client = app.test_client()
+    url = f'/users/{user.id}/contacts?limit={args.page_size}'
+    rows = args.book_size
+
+    print(f"{'rows':>12} {'median ms':>10} {'p95 ms':>10} {'min ms':>10}")
+    for size in sorted(args.sizes):
+      if size > rows: 
+        db.session.execute(INSERT_FILLER_CONTACTS, {
+          'first_user_id': first_user_id,
+          'users': FILLER_USERS,
+          'count': size - rows,
+        })
+        db.session.commit()
+        db.session.execute('ANALYZE contacts')
+        db.session.commit()
+        rows = size
+
+      client.get(url)
+      stats = summarize(time_calls(lambda: client.get(url), args.repeat))
+      print(f"{rows:>12} {stats['median']:>10.2f} {stats['p95']:>10.2f} {stats['min']:>10.2f}")
+
+    db.session.remove()
+    db.drop_all()
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,64 @@
+'''
+transfer size and client parse time of each contact list representation
+
+builds a --contacts contact list from the factories and encodes it the way
+GET /users/<user_id>/contacts does for ?format=json, columnar and msgpack,
+then times decoding the body, and decoding it back into the rows of the json
+form. clients that work on the columns directly only pay the first. needs no
+database
+
+  python -m benchmarks.list_formats --contacts 10000 --repeat 30
+'''
+import gzip
+import random
+import argparse
+from types import SimpleNamespace
+
+from api import serialization
+from api.database.factories import contact_details
+from api.resources.contacts import _contact_payload, _contact_columns
+from . import time_calls, summarize
+
+def _rows_from_columns(contacts):
+  columns = dict(contacts['columns'])
+  for field, values in contacts['dictionaries'].items():
+    columns[field] = [values[index] for index in columns[field]]
+  return [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument('--contacts', type=int, default=10000)
+  parser.add_argument('--repeat', type=int, default=30)
+  args = parser.parse_args()
+
+  rng = random.Random(1)
+  contacts = [SimpleNamespace(id=contact_id, **contact_details(rng)) for contact_id in range(1, args.contacts + 1)]
+  rows = {'contacts': [_contact_payload(contact) for contact in contacts], 'success': True}
+  columnar = {'contacts': _contact_columns(contacts), 'success': True}
+
+  # (name, body, decode, to rows)
+  formats = [
+    ('json', serialization.dumps(rows), serialization.loads, lambda data: data['contacts']),
+    ('columnar', serialization.dumps(columnar), serialization.loads, lambda data: _rows_from_columns(data['contacts'])),
+  ]
+  if serialization.msgpack is not None:
+    formats.append(('msgpack', serialization.packb(columnar), serialization.msgpack.unpackb, 
+                    lambda data: _rows_from_columns(data['contacts'])))
+  else:
+    print('msgpack is not installed, its size is shown but decoding is not timed')
+    formats.append(('msgpack', serialization.packb(columnar), None, None))
+
+  print(f"{'format':<10} {'bytes':>10} {'gzip bytes':>11} {'decode ms':>10} {'to rows ms':>11}")
+  for name, body, decode, to_rows in formats:
+    compressed = len(gzip.compress(body, 6))
+    if decode is None:
+      print(f'{name:<10} {len(body):>10} {compressed:>11}')
+      continue
+
+    assert to_rows(decode(body)) == rows['contacts']
+    decoding = summarize(time_calls(lambda: decode(body), args.repeat))
+    rebuilding = summarize(time_calls(lambda: to_rows(decode(body)), args.repeat))
+    print(f"{name:<10} {len(body):>10} {compressed:>11} {decoding['median']:>10.2f} {rebuilding['median']:>11.2f}")
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,380 @@
+'''
+load test every route against a real gunicorn server
+
+seeds --users users with --contacts contacts each (server side with
+generate_series, so postgres only), starts gunicorn on a free port and hits
+each route registered in create_app with --concurrency threads until
+--requests timed requests have completed. routes are run one at a time so
+their latencies do not bleed into each other
+
+  python -m benchmarks.load --config benchmark --users 20 --contacts 2000
+  python -m benchmarks.load --config benchmark --save-baseline
+
+results are compared with benchmarks/baselines.json (or --baseline) when it
+was recorded against the same dataset and load, and the run exits non zero if
+any route's p50 or p95 is more than --threshold slower than its baseline or
+any request failed. baselines only mean something on the machine that
+recorded them, record one before a change and compare after it
+
+every route needs an entry in SCENARIOS, the run refuses to start when a
+route has none so new endpoints cannot go unmeasured. destructive routes
+create what they remove with untimed setup requests, throughput is the
+timed requests per second of timed work at the given concurrency
+
+the configured database is dropped and recreated, never point it at real data
+'''
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import text
+
+from api import create_app, db
+from . import percentile
+
+BASELINES = os.path.join(os.path.dirname(__file__), 'baselines.json')
+GROUPS = ('friend', 'family', 'coworker', 'old-coworkers')
+
+INSERT_USERS = text('''
+  INSERT INTO users (email, first_name, last_name, created_at, updated_at)
+  SELECT 'load_' || n || '@example.com', 'load', 'user_' || n, now(), now()
+  FROM generate_series(1, :count) AS n
+''')
+
+INSERT_CONTACTS = text('''
+  INSERT INTO contacts (user_id, first_name, last_name, "group", phone_number,
+                        street_address, city, state, zipcode, created_at, updated_at)
+  SELECT u.id, 'first_' || n, 'last_' || (n % 997),
+         (ARRAY['friend', 'family', 'coworker', 'old-coworkers'])[1 + n % 4],
+         '555-' || lpad((n % 10000)::text, 4, '0'), n || ' load way',
+         (ARRAY['Denver', 'Boulder', 'Austin'])[1 + n % 3],
+         (ARRAY['Colorado', 'Colorado', 'Texas'])[1 + n % 3],
+         lpad((80000 + n % 1000)::text, 5, '0'), now(), now()
+  FROM users AS u CROSS JOIN generate_series(1, :count) AS n
+''')
+
+SCENARIOS = {}
+
+def scenario(rule, method):
+  '''
+  registers func(ctx) -> (method, path, body) as the load for rule and method
+  '''
+  def register(func):
+    SCENARIOS[(rule, method)] = func
+    return func
+  return register
+
+def _contact(ctx):
+  n = ctx.rng.randrange(1000000)
+  return {
+    'first_name': f'load_{n}',
+    'last_name': 'contact',
+    'group': ctx.rng.choice(GROUPS),
+    'street_address': f'{n} load way',
+    'city': 'Denver',
+    'state': 'Colorado',
+    'zipcode': '80202',
+  }
+
+@scenario('/users', 'POST')
+def _create_user(ctx):
+  email = f'load_{uuid.uuid4().hex}@example.com'
+  return 'POST', '/users', {'email': email, 'first_name': 'load', 'last_name': 'user'}
+
+@scenario('/users/<user_id>', 'GET')
+def _show_user(ctx):
+  return 'GET', f'/users/{ctx.user_id()}', None
+
+@scenario('/users/<user_id>', 'PATCH')
+def _update_user(ctx):
+  return 'PATCH', f'/users/{ctx.user_id()}', {'first_name': f'load_{ctx.rng.randrange(1000)}'}
+
+@scenario('/users/<user_id>', 'DELETE')
+def _delete_user(ctx):
+  user = ctx.setup(*_create_user(ctx))
+  return 'DELETE', f"/users/{user['id']}", None
+
+@scenario('/login', 'POST')
+def _login(ctx):
+  return 'POST', '/login', {'email': ctx.email()}
+
+@scenario('/users/<user_id>/contacts', 'GET')
+def _list_contacts(ctx):
+  return 'GET', f'/users/{ctx.user_id()}/contacts?limit=50', None
+
+@scenario('/users/<user_id>/contacts', 'POST')
+def _create_contact(ctx):
+  return 'POST', f'/users/{ctx.user_id()}/contacts', _contact(ctx)
+
+@scenario('/users/<user_id>/contacts/search', 'GET')
+def _search_contacts(ctx):
+  return 'GET', f'/users/{ctx.user_id()}/contacts/search?q=first_{ctx.rng.randrange(1, 100)}', None
+
+@scenario('/users/<user_id>/contacts/bulk', 'PATCH')
+def _bulk_update_contacts(ctx):
+  user_id = ctx.user_id()
+  ids = ctx.rng.sample(ctx.contact_ids[user_id], min(20, len(ctx.contact_ids[user_id])))
+  return 'PATCH', f'/users/{user_id}/contacts/bulk', {'ids': ids, 'changes': {'city': 'Boulder'}}
+
+@scenario('/users/<user_id>/contacts/bulk', 'DELETE')
+def _bulk_delete_contacts(ctx):
+  user_id = ctx.user_id()
+  created = ctx.setup('POST', f'/users/{user_id}/contacts', [_contact(ctx) for _ in range(20)])
+  ids = [contact['id'] for contact in created['contacts']]
+  return 'DELETE', f'/users/{user_id}/contacts/bulk', {'ids': ids}
+
+@scenario('/users/<user_id>/contacts/changes', 'GET')
+def _contact_changes(ctx):
+  return 'GET', f'/users/{ctx.user_id()}/contacts/changes', None
+
+@scenario('/users/<user_id>/contacts/import', 'POST')
+def _import_contacts(ctx):
+  rows = ['first_name,last_name,street_address,city,state,zipcode']
+  for _ in range(20):
+    contact = _contact(ctx)
+    rows.append(','.join(contact[field] for field in ('first_name', 'last_name', 'street_address', 'city', 'state', 'zipcode')))
+  return 'POST', f'/users/{ctx.user_id()}/contacts/import?format=csv', '\n'.join(rows) + '\n'
+
+@scenario('/users/<user_id>/contacts/export', 'GET')
+def _export_contacts(ctx):
+  return 'GET', f'/users/{ctx.user_id()}/contacts/export?format=csv', None
+
+@scenario('/users/<user_id>/contacts/<contact_id>', 'GET')
+def _show_contact(ctx):
+  user_id = ctx.user_id()
+  return 'GET', f'/users/{user_id}/contacts/{ctx.contact_id(user_id)}', None
+
+@scenario('/users/<user_id>/contacts/<contact_id>', 'PATCH')
+def _update_contact(ctx):
+  user_id = ctx.user_id()
+  return 'PATCH', f'/users/{user_id}/contacts/{ctx.contact_id(user_id)}', {'group': ctx.rng.choice(GROUPS)}
+
+@scenario('/users/<user_id>/contacts/<contact_id>', 'DELETE')
+def _delete_contact(ctx):
+  user_id = ctx.user_id()
+  contact = ctx.setup('POST', f'/users/{user_id}/contacts', _contact(ctx))
+  return 'DELETE', f"/users/{user_id}/contacts/{contact['id']}", None
+
+@scenario('/metrics', 'GET')
+def _metrics(ctx):
+  return 'GET', '/metrics', None
+
+class Client:
+  '''
+  one keep alive connection per thread, http.client reconnects on its own
+  when gunicorn closes it
+  '''
+  def __init__(self, port):
+    self.connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+
+  def request(self, method, path, body=None):
+    headers = {}
+    if isinstance(body, str):
+      body = body.encode('utf-8')
+      headers['Content-Type'] = 'text/csv'
+    elif body is not None:
+      body = json.dumps(body).encode('utf-8')
+      headers['Content-Type'] = 'application/json'
+
+    try:
+      self.connection.request(method, path, body=body, headers=headers)
+      response = self.connection.getresponse()
+      return response.status, response.read()
+    except (OSError, http.client.HTTPException):
+      self.connection.close()
+      return None, b''
+
+class Context:
+  '''
+  what a scenario may draw from, the seeded dataset plus a per thread rng
+  and client for untimed setup requests
+  '''
+  def __init__(self, dataset, rng, client):
+    self.user_ids, self.contact_ids = dataset
+    self.rng = rng
+    self.client = client
+
+  def user_id(self):
+    return self.rng.choice(self.user_ids)
+
+  def email(self):
+    return f'load_{self.rng.randrange(1, len(self.user_ids) + 1)}@example.com'
+
+  def contact_id(self, user_id):
+    return self.rng.choice(self.contact_ids[user_id])
+
+  def setup(self, method, path, body=None):
+    status, payload = self.client.request(method, path, body)
+    if status is None or status >= 400:
+      raise RuntimeError(f'setup request {method} {path} failed with {status}')
+    return json.loads(payload)
+
+def _routes(app):
+  return sorted((rule.rule, method)
+                for rule in app.url_map.iter_rules() if rule.endpoint != 'static'
+                for method in rule.methods - {'HEAD', 'OPTIONS'})
+
+def _seed(app, users, contacts):
+  with app.app_context():
+    db.drop_all()
+    db.create_all()
+    db.session.execute(INSERT_USERS, {'count': users})
+    db.session.execute(INSERT_CONTACTS, {'count': contacts})
+    db.session.commit()
+    db.session.execute('ANALYZE')
+    db.session.commit()
+
+    user_ids = [row.id for row in db.session.execute('SELECT id FROM users ORDER BY id')]
+    contact_ids = {user_id: [] for user_id in user_ids}
+    for row in db.session.execute('SELECT id, user_id FROM contacts'):
+      contact_ids[row.user_id].append(row.id)
+    db.session.remove()
+
+  return user_ids, contact_ids
+
+def _free_port():
+  with socket.socket() as sock:
+    sock.bind(('127.0.0.1', 0))
+    return sock.getsockname()[1]
+
+def _start_server(config, port, workers):
+  env = dict(os.environ, FLASK_CONFIG=config, METRICS_DIR=tempfile.mkdtemp(prefix='address-book-load-'))
+  server = subprocess.Popen([sys.executable, '-m', 'gunicorn', '--workers', str(workers),
+                             '--bind', f'127.0.0.1:{port}', '--log-level', 'warning', 'run:app'], env=env)
+  deadline = time.monotonic() + 30
+  while time.monotonic() < deadline:
+    if server.poll() is not None:
+      raise SystemExit(f'gunicorn exited with {server.returncode}')
+    try:
+      socket.create_connection(('127.0.0.1', port), timeout=1).close()
+      return server
+    except OSError:
+      time.sleep(0.2)
+
+  server.terminate()
+  raise SystemExit('gunicorn did not start listening within 30 seconds')
+
+def _run_route(build, dataset, port, concurrency, requests, warmup, seed):
+  per_thread = [requests // concurrency + (index < requests % concurrency) for index in range(concurrency)]
+
+  def work(index):
+    client = Client(port)
+    ctx = Context(dataset, random.Random(seed * 1000 + index), client)
+    timings, errors = [], 0
+    for number in range(warmup + per_thread[index]):
+      method, path, body = build(ctx)
+      start = time.perf_counter()
+      status, _ = client.request(method, path, body)
+      elapsed = (time.perf_counter() - start) * 1000
+      if number < warmup:
+        continue
+      timings.append(elapsed)
+      if status is None or status >= 400:
+        errors += 1
+    return timings, errors
+
+  with ThreadPoolExecutor(max_workers=concurrency) as pool:
+    results = list(pool.map(work, range(concurrency)))
+
+  timings = sorted(timing for thread_timings, _ in results for timing in thread_timings)
+  busy = sum(timings) / 1000 / concurrency
+  return {
+    'requests': len(timings),
+    'errors': sum(errors for _, errors in results),
+    'rps': len(timings) / busy if busy else 0.0,
+    'p50': percentile(timings, 0.50),
+    'p95': percentile(timings, 0.95),
+    'p99': percentile(timings, 0.99),
+  }
+
+def _compare(results, baselines, threshold):
+  regressions = []
+  for key, stats in results.items():
+    if stats['errors']:
+      regressions.append(f"{key}: {stats['errors']} failed requests")
+    baseline = baselines.get(key)
+    if baseline is None:
+      continue
+    for metric in ('p50', 'p95'):
+      if stats[metric] > baseline[metric] * (1 + threshold):
+        change = stats[metric] / baseline[metric] - 1
+        regressions.append(f'{key}: {metric} {stats[metric]:.1f}ms is {change:.0%} over baseline {baseline[metric]:.1f}ms')
+  return regressions
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument('--config', default='benchmark')
+  parser.add_argument('--users', type=int, default=20)
+  parser.add_argument('--contacts', type=int, default=2000, help='contacts per user')
+  parser.add_argument('--workers', type=int, default=4, help='gunicorn workers')
+  parser.add_argument('--concurrency', type=int, default=16)
+  parser.add_argument('--requests', type=int, default=1000, help='timed requests per route')
+  parser.add_argument('--warmup', type=int, default=5, help='untimed requests per thread before timing')
+  parser.add_argument('--seed', type=int, default=1)
+  parser.add_argument('--only', help='only run routes whose rule contains this text')
+  parser.add_argument('--baseline', default=BASELINES)
+  parser.add_argument('--save-baseline', action='store_true')
+  parser.add_argument('--threshold', type=float, default=0.30)
+  args = parser.parse_args()
+
+  app = create_app(args.config)
+  routes = _routes(app)
+  missing = [f'{method} {rule}' for rule, method in routes if (rule, method) not in SCENARIOS]
+  if missing:
+    raise SystemExit('no load scenario for: ' + ', '.join(missing))
+  if args.only:
+    routes = [(rule, method) for rule, method in routes if args.only in rule]
+
+  dataset = _seed(app, args.users, args.contacts)
+  load = {key: getattr(args, key) for key in ('users', 'contacts', 'workers', 'concurrency', 'requests')}
+
+  port = _free_port()
+  server = _start_server(args.config, port, args.workers)
+  results = {}
+  try:
+    print(f"{'route':<50} {'requests':>8} {'errors':>6} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for rule, method in routes:
+      key = f'{method} {rule}'
+      stats = _run_route(SCENARIOS[(rule, method)], dataset, port,
+                         args.concurrency, args.requests, args.warmup, args.seed)
+      results[key] = stats
+      print(f"{key:<50} {stats['requests']:>8} {stats['errors']:>6} {stats['rps']:>8.0f} "
+            f"{stats['p50']:>8.1f} {stats['p95']:>8.1f} {stats['p99']:>8.1f}")
+  finally:
+    server.terminate()
+    server.wait()
+    with app.app_context():
+      db.drop_all()
+
+  if args.save_baseline:
+    with open(args.baseline, 'w') as baseline_file:
+      json.dump({'load': load, 'routes': results}, baseline_file, indent=2, sort_keys=True)
+    print(f'baseline written to {args.baseline}')
+    return
+
+  baselines = {}
+  if os.path.exists(args.baseline):
+    with open(args.baseline) as baseline_file:
+      recorded = json.load(baseline_file)
+    if recorded.get('load') == load:
+      baselines = recorded['routes']
+    else:
+      print(f"baseline in {args.baseline} was recorded with {recorded.get('load')}, not compared")
+
+  regressions = _compare(results, baselines, args.threshold)
+  for regression in regressions:
+    print(f'REGRESSION {regression}')
+  if regressions:
+    sys.exit(1)
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,125 @@
+'''
+per request cost of validating a contact body
+
+times the chained _validate_field calls the resources used to make (kept
+here as the reference) against the validators api/validation.py compiles, on
+a valid contact, an invalid one and a partial update, and over a --batch of
+contacts. for the batch it also times the compiled row validator called per
+record, plus building the insert row as bulk create and imports did, against
+the single call compile_batch_validator makes. needs no database
+
+  python -m benchmarks.validation --repeat 200 --batch 10000
+'''
+import random
+import argparse
+
+from api.database.factories import contact_details
+from api.resources.contacts import _validate_contact, _validate_contact_changes, _validate_contacts, CONTACT_FIELDS
+from . import time_calls, summarize
+
+def _validate_field(data, field, proceed, errors, missing_okay=False):
+  if field in data:
+    data[field] = data[field].strip()
+    if len(data[field]) == 0:
+      proceed = False
+      errors.append(f"required '{field}' parameter is blank")
+  if not missing_okay and field not in data:
+    proceed = False
+    errors.append(f"required '{field}' parameter is missing")
+    data[field] = ''
+  if missing_okay and field not in data:
+    return proceed, None, errors
+
+  return proceed, data[field], errors
+
+def _chained_contact(data):
+  proceed = True
+  errors = []
+  proceed, first_name, errors = _validate_field(data, 'first_name', proceed, errors)
+  proceed, last_name, errors = _validate_field(data, 'last_name', proceed, errors)
+  proceed, group, errors = _validate_field(data, 'group', proceed, errors, missing_okay=True)
+  proceed, phone_number, errors = _validate_field(data, 'phone_number', proceed, errors, missing_okay=True)
+  proceed, street_address, errors = _validate_field(data, 'street_address', proceed, errors)
+  proceed, street_address_2, errors = _validate_field(data, 'street_address_2', proceed, errors, missing_okay=True)
+  proceed, city, errors = _validate_field(data, 'city', proceed, errors)
+  proceed, state, errors = _validate_field(data, 'state', proceed, errors)
+  proceed, zipcode, errors = _validate_field(data, 'zipcode', proceed, errors)
+  return proceed, errors
+
+def _chained_changes(data):
+  proceed = True
+  errors = []
+  for field in ('first_name', 'last_name', 'group', 'phone_number', 'street_address',
+                'street_address_2', 'city', 'state', 'zipcode'):
+    proceed, value, errors = _validate_field(data, field, proceed, errors, missing_okay=True)
+  return proceed, errors
+
+def _per_record(records):
+  rows, invalid = [], []
+  for index, record in enumerate(records):
+    values, errors = _validate_contact(record)
+    if errors: 
+      invalid.append((index, errors))
+    else: 
+      row = {field: values.get(field) for field in CONTACT_FIELDS}
+      if row['group'] is None: 
+        row['group'] = 'friend'
+      rows.append(row)
+  return rows, invalid
+
+def _body(rng):
+  '''
+  a contact as a client posts it, optional fields left out rather than null
+  '''
+  return {field: value for field, value in contact_details(rng).items() if value is not None}
+
+def _per_call_us(validate, bodies, repeat):
+  '''
+  median microseconds per body. the chained version strips in place, so each
+  call gets a fresh copy, and so does the compiled one to keep them even
+  '''
+  copies = [[dict(body) for body in bodies] for _ in range(repeat)]
+  batches = iter(copies)
+
+  def run():
+    for body in next(batches):
+      validate(body)
+
+  return summarize(time_calls(run, repeat))['median'] * 1000 / len(bodies)
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument('--repeat', type=int, default=200)
+  parser.add_argument('--batch', type=int, default=10000)
+  args = parser.parse_args()
+
+  rng = random.Random(1)
+  valid = dict(_body(rng), first_name='  darrel ')
+  invalid = dict(valid, first_name='', city=' ')
+  del invalid['last_name']
+  changes = {'city': ' Boulder ', 'zipcode': '80302'}
+  batch = [_body(rng) for _ in range(args.batch)]
+
+  cases = [
+    ('valid contact', _chained_contact, _validate_contact, [valid] * 100),
+    ('invalid contact', _chained_contact, _validate_contact, [invalid] * 100),
+    ('partial update', _chained_changes, _validate_contact_changes, [changes] * 100),
+    (f'batch of {args.batch}', _chained_contact, _validate_contact, batch),
+  ]
+
+  print(f"{'case':<18} {'chained us':>11} {'compiled us':>12} {'speedup':>8}")
+  for name, chained, compiled, bodies in cases:
+    repeat = args.repeat if len(bodies) <= 100 else max(3, args.repeat // 50)
+    before = _per_call_us(chained, bodies, repeat)
+    after = _per_call_us(compiled, bodies, repeat)
+    print(f'{name:<18} {before:>11.2f} {after:>12.2f} {before / after:>7.1f}x')
+
+  assert _per_record(batch) == _validate_contacts(batch)
+  repeat = max(3, args.repeat // 10)
+  per_record = summarize(time_calls(lambda: _per_record(batch), repeat))['median']
+  batched = summarize(time_calls(lambda: _validate_contacts(batch), repeat))['median']
+  print(f"\n{'batch of ' + str(args.batch):<18} {'per record ms':>14} {'batched ms':>11} {'speedup':>8}")
+  print(f"{'':<18} {per_record:>14.2f} {batched:>11.2f} {per_record / batched:>7.1f}x")
+
+if __name__ == '__main__':
+  main()
@@ -4,6 +4,36 @@ class Config:
   SECRET_KEY = os.environ.get('SECRET_KEY') or 'super secret key'
   SQLALCHEMY_TRACK_MODIFICATIONS = False 
   SQLALCHEMY_RECORD_QUERIES = True 
+  # per request query profile, see api/profiling.py
+  SQL_PROFILER_ENABLED = True 
+  SQL_PROFILER_SLOWEST = 3
+  SQL_PROFILER_REPEAT_THRESHOLD = 3
+  # /metrics, see api/metrics.py. METRICS_DIR must be shared by every worker on the host, 
+  # it defaults to a directory per database under the temp dir
+  METRICS_ENABLED = True 
+  METRICS_DIR = os.environ.get('METRICS_DIR')
+  METRICS_TEMPORARY_DIR = False 
+  METRICS_FLUSH_INTERVAL = 1.0
+  # see api/cache.py. 'shared' keeps one copy per host in CACHE_DIR, a directory 
+  # only the app's user may enter (default instance/cache, a private directory 
+  # under /dev/shm keeps it in memory), CACHE_NOTIFY broadcasts invalidations 
+  # to other hosts over postgres
+  CACHE_BACKEND = os.environ.get('CACHE_BACKEND') or 'shared'
+  CACHE_DIR = os.environ.get('CACHE_DIR')
+  CACHE_NOTIFY = os.environ.get('CACHE_NOTIFY', '').lower() in ('1', 'true')
+  # user lookups, 0 disables
+  USER_CACHE_SIZE = 10000
+  USER_CACHE_TTL = 30
+  # serialized GET /users/<id>/contacts responses, bodies over the max are not kept
+  CONTACT_LIST_CACHE_SIZE = 1000
+  CONTACT_LIST_CACHE_TTL = 10
+  CONTACT_LIST_CACHE_MAX_BYTES = 1024 * 1024
+  # gzip/brotli responses, see api/compression.py and benchmarks/compression.py
+  COMPRESSION_ENABLED = True 
+  COMPRESSION_MIN_SIZE = 1024
+  COMPRESSION_LEVEL = 6
+  COMPRESSION_BROTLI_QUALITY = 5
+  COMPRESSION_STREAM_FLUSH_SIZE = 16 * 1024
 
 class DevelopmentConfig(Config): 
   DEBUG = True 
@@ -12,8 +42,18 @@ class DevelopmentConfig(Config):
 class TestingConfig(Config):
   DEBUG = True 
   TESTING = True 
+  CACHE_BACKEND = 'local'
+  # a fresh snapshot directory per app, removed when the test run exits
+  METRICS_TEMPORARY_DIR = True 
   SQLALCHEMY_DATABASE_URI = 'postgresql://localhost:5432/address_book_test'
 
+class BenchmarkConfig(Config):
+  DEBUG = False 
+  TESTING = False 
+  SQL_PROFILER_ENABLED = False 
+  SQLALCHEMY_RECORD_QUERIES = False 
+  SQLALCHEMY_DATABASE_URI = os.environ.get('BENCHMARK_DATABASE_URL') or 'postgresql://localhost:5432/address_book_benchmark'
+
 class ProductionConfig(Config):
   DEBUG = False 
   TESTING = False
@@ -22,6 +62,7 @@ class ProductionConfig(Config):
 config = {
   'development': DevelopmentConfig,
   'testing': TestingConfig,
+  'benchmark': BenchmarkConfig,
   'production': ProductionConfig,
 
   'default': DevelopmentConfig
@@ -1,7 +1,13 @@
+import sys 
+import time 
 from flask_script import Manager 
 from flask_migrate import Migrate, MigrateCommand 
 
 from api import create_app, db 
+from api.database.models import User 
+from api.database.factories import seed_database, SEED_CHUNK_SIZE 
+from api.formats import detect_format 
+from api.resources.imports import _import_contacts, _read_contacts, IMPORT_CHUNK_SIZE
 
 app = create_app()
 migrate = Migrate(app, db)
@@ -9,5 +15,40 @@ manager = Manager(app)
 
 manager.add_command('db', MigrateCommand)
 
+@manager.option('-u', '--user-id', dest='user_id', type=int, required=True)
+@manager.option('-f', '--file', dest='path', required=True)
+@manager.option('--format', dest='file_format', default=None, help='csv or vcf, defaults to the file extension')
+@manager.option('--chunk-size', dest='chunk_size', type=int, default=None)
+def import_contacts(user_id, path, file_format, chunk_size):
+  '''
+  imports a csv or vcard file into a user's address book
+  '''
+  if db.session.query(User).filter_by(id=user_id).one_or_none() is None:
+    sys.exit(f'user with id: {user_id} not found')
+
+  file_format = detect_format(file_format, filename=path)
+  if file_format is None: 
+    sys.exit('format must be csv or vcf')
+
+  with open(path, 'rb') as stream: 
+    imported, skipped, errors = _import_contacts(
+      user_id, _read_contacts(stream, file_format), chunk_size or IMPORT_CHUNK_SIZE)
+
+  for error in errors: 
+    print(f"record {error['record']}: {'; '.join(error['errors'])}")
+  print(f'imported {imported} contacts, skipped {skipped}')
+
+@manager.option('--users', dest='users', type=int, default=1000)
+@manager.option('--contacts-per-user', dest='mean_contacts', type=int, default=100, help='mean, the sizes are skewed')
+@manager.option('--seed', dest='seed', type=int, default=1)
+@manager.option('--chunk-size', dest='chunk_size', type=int, default=SEED_CHUNK_SIZE)
+def seed(users, mean_contacts, seed, chunk_size):
+  '''
+  bulk loads deterministic fake users and contacts, e.g. --users 100000 for ~10M contacts
+  '''
+  start = time.perf_counter()
+  written_users, written_contacts = seed_database(users, mean_contacts, seed, chunk_size)
+  print(f'seeded {written_users} users and {written_contacts} contacts in {time.perf_counter() - start:.1f}s')
+
 if __name__ == '__main__':
   manager.run()
@@ -0,0 +1,30 @@
+"""Add contacts search indexes
+
+Revision ID: c47e1a93b5f2
+Revises: 8f1c5e0a9d27
+Create Date: 2026-10-18 11:21:55.730118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c47e1a93b5f2'
+down_revision = '8f1c5e0a9d27'
+branch_labels = None
+depends_on = None
+
+# lower(field) LIKE 'prefix%' can only use a btree index with the pattern operator class
+SEARCH_FIELDS = ('first_name', 'last_name', 'phone_number', 'city')
+
+
+def upgrade():
+    for field in SEARCH_FIELDS:
+        op.create_index(f'ix_contacts_user_id_lower_{field}', 'contacts', 
+                        ['user_id', sa.text(f'lower({field}) text_pattern_ops')], unique=False)
+
+
+def downgrade():
+    for field in reversed(SEARCH_FIELDS):
+        op.drop_index(f'ix_contacts_user_id_lower_{field}', table_name='contacts')
@@ -1,3 +1,5 @@
+from api.database.models import User, Contact
+
 def assert_payload_field_type_value(obj, payload, field, data_type, value): 
     obj.assertIn(field, payload)
     obj.assertIsInstance(payload[field], data_type)
@@ -7,3 +9,14 @@ def assert_payload_field_type_value(obj, payload, field, data_type, value):
 def assert_payload_field_type(obj, payload, field, data_type): 
     obj.assertIn(field, payload)
     obj.assertIsInstance(payload[field], data_type)
+
+
+def create_other_users_contact(details): 
+    '''
+    a contact with details that belongs to a second user, returns its id
+    '''
+    other = User(email='bw@example.com', first_name='bruce', last_name='wayne')
+    other.insert()
+    contact = Contact(other, details)
+    contact.insert()
+    return contact.id
@@ -0,0 +1,111 @@
+import json 
+import unittest 
+from copy import deepcopy
+
+from api import create_app, db 
+from api.database.models import User, Contact 
+from tests import assert_payload_field_type_value, assert_payload_field_type
+
+class BulkCreateContactsTest(unittest.TestCase):
+  def setUp(self):
+    self.app = create_app('testing')
+    self.app_context = self.app.app_context()
+    self.app_context.push()
+    db.create_all()
+    self.client = self.app.test_client()
+
+    self.user = User(email='jc@example.com', first_name='joshua', last_name='carey')
+    self.user.insert()
+
+    self.contact_payload = {
+      'first_name': 'darrel',
+      'last_name': 'wadsworth', 
+      'phone_number': '999-999-9999',
+      'street_address': '45321 example way',
+      'city': 'Denver',
+      'state': 'Colorado',
+      'zipcode': '80000'  
+    }
+
+    self.payload = []
+    for i in range(3):
+      payload = deepcopy(self.contact_payload)
+      payload['first_name'] = f'darrel_{i}'
+      self.payload.append(payload)
+
+  def tearDown(self):
+    db.session.remove()
+    db.drop_all()
+    self.app_context.pop()
+
+  def test_happypath_bulk_create_contacts(self):
+    self.payload[1]['group'] = ' family '
+
+    response = self.client.post(f'/users/{self.user.id}/contacts', 
+    json=self.payload, content_type='application/json')
+
+    self.assertEqual(201, response.status_code)
+
+    data = json.loads(response.data.decode('utf-8'))
+    assert_payload_field_type_value(self, data, 'success', bool, True)
+    assert_payload_field_type(self, data, 'contacts', list)
+    self.assertEqual(3, len(data['contacts']))
+
+    for i, contact in enumerate(data['contacts']):
+      assert_payload_field_type(self, contact, 'id', int)
+      assert_payload_field_type_value(self, contact, 'first_name', str, f'darrel_{i}')
+      assert_payload_field_type_value(self, contact, 'zipcode', str, '80000')
+
+    self.assertEqual('friend', data['contacts'][0]['group'])
+    self.assertEqual('family', data['contacts'][1]['group'])
+    self.assertIsNone(data['contacts'][0]['street_address_2'])
+
+    contacts = Contact.query.filter_by(user_id=self.user.id).order_by(Contact.id).all()
+    self.assertEqual([contact['id'] for contact in data['contacts']], [contact.id for contact in contacts])
+    self.assertEqual('family', contacts[1].group)
+    self.assertIsNotNone(contacts[0].created_at)
+
+  def test_sadpath_bulk_create_is_all_or_nothing(self):
+    del self.payload[0]['city']
+    self.payload[2]['last_name'] = ''
+
+    response = self.client.post(f'/users/{self.user.id}/contacts', 
+    json=self.payload, content_type='application/json')
+
+    self.assertEqual(400, response.status_code)
+
+    data = json.loads(response.data.decode('utf-8'))
+    assert_payload_field_type_value(self, data, 'success', bool, False)
+    assert_payload_field_type_value(self, data, 'error', int, 400)
+    assert_payload_field_type_value(self, data, 'errors', list, [
+      {'index': 0, 'errors': ["required 'city' parameter is missing"]},
+      {'index': 2, 'errors': ["required 'last_name' parameter is blank"]},
+    ])
+
+    self.assertEqual(0, Contact.query.filter_by(user_id=self.user.id).count())
+
+  def test_sadpath_bulk_create_row_is_not_an_object(self):
+    self.payload.append('darrel')
+
+    response = self.client.post(f'/users/{self.user.id}/contacts', 
+    json=self.payload, content_type='application/json')
+
+    self.assertEqual(400, response.status_code)
+
+    data = json.loads(response.data.decode('utf-8'))
+    assert_payload_field_type_value(self, data, 'errors', list, [{'index': 3, 'errors': ["contact must be a json object"]}])
+
+  def test_sadpath_bulk_create_empty_list(self):
+    response = self.client.post(f'/users/{self.user.id}/contacts', 
+    json=[], content_type='application/json')
+
+    self.assertEqual(400, response.status_code)
+
+    data = json.loads(response.data.decode('utf-8'))
+    assert_payload_field_type_value(self, data, 'errors', list, ["at least one contact is required"])
+
+  def test_sadpath_bulk_create_invalid_user_id(self):
+    response = self.client.post('/users/99999/contacts', 
+    json=self.payload, content_type='application/json')
+
+    self.assertEqual(404, response.status_code)
@@ -0,0 +1,98 @@
+import json 
+import unittest 
+
+from api import create_app, db 
+from api.database.models import User, Contact 
+from tests import assert_payload_field_type_value
+
+class BulkDeleteContactsTest(unittest.TestCase):
+  def setUp(self):
+    self.app = create_app('testing')
+    self.app_context = self.app.app_context()
+    self.app_context.push()
+    db.create_all()
+    self.client = self.app.test_client()
+
+    self.user = User(email='jc@example.com', first_name='joshua', last_name='carey')
+    self.user.insert()
+    self.other_user = User(email='other@example.com', first_name='other', last_name='user')
+    self.other_user.insert()
+
+    self.contacts = []
+    for user, group in ((self.user, 'old-coworkers'), (self.user, 'old-coworkers'), 
+                        (self.user, 'friend'), (self.other_user, 'old-coworkers')):
+      contact = Contact(user, {
+        'first_name': 'darrel',
+        'last_name': 'wadsworth', 
+        'group': group, 
+        'street_address': '45321 example way',
+        'city': 'Denver',
+        'state': 'Colorado',
+        'zipcode': '80000'  
+      })
+      contact.insert()
+      self.contacts.append(contact.id)
+
+  def tearDown(self):
+    db.session.remove()
+    db.drop_all()
+    self.app_context.pop()
+
+  def _remaining(self):
+    return [contact_id for contact_id in self.contacts if Contact.query.get(contact_id) is not None]
+
+  def test_happypath_bulk_delete_by_filter(self):
+    response = self.client.delete(f'/users/{self.user.id}/contacts/bulk', 
+    json={'filter': {'group': 'old-coworkers'}}, content_type='application/json')
+
+    self.assertEqual(200, response.status_code)
+
+    data = json.loads(response.data.decode('utf-8'))
+    assert_payload_field_type_value(self, data, 'success', bool, True)
+    assert_payload_field_type_value(self, data, 'deleted', int, 2)
+    self.assertEqual(self.contacts[2:], self._remaining())
+
+  def test_happypath_bulk_delete_by_ids_and_filter(self):
+    payload = {'ids': [self.contacts[1], self.contacts[2]], 'filter': {'group': ['old-coworkers', 'family']}}
+
+    response = self.client.delete(f'/users/{self.user.id}/contacts/bulk', 
+    json=payload, content_type='application/json')
+
+    data = json.loads(response.data.decode('utf-8'))
+    assert_payload_field_type_value(self, data, 'deleted', int, 1)
+    self.assertEqual([self.contacts[0], self.contacts[2], self.contacts[3]], self._remaining())
+
+  def test_sadpath_bulk_delete_ids_must_be_integers(self):
+    response = self.client.delete(f'/users/{self.user.id}/contacts/bulk', 
+    json={'ids': ['1']}, content_type='application/json')
+
+    self.assertEqual(400, response.status_code)
+
+    data = json.loads(response.data.decode('utf-8'))
+    assert_payload_field_type_value(self, data, 'errors', list, ["'ids' parameter must be a non empty list of integers"])
+    self.assertEqual(self.contacts, self._remaining())
+
+  def test_sadpath_bulk_delete_without_selection(self):
+    response = self.client.delete(f'/users/{self.user.id}/contacts/bulk')
+
+    self.assertEqual(400, response.status_code)
+
+    data = json.loads(response.data.decode('utf-8'))
+    assert_payload_field_type_value(self, data, 'errors', list, ["required 'ids' or 'filter' parameter is missing"])
+    self.assertEqual(self.contacts, self._remaining())
+
+  def test_sadpath_bulk_delete_body_not_an_object(self):
+    response = self.client.delete(f'/users/{self.user.id}/contacts/bulk', 
+    json=[self.contacts[0]], content_type='application/json')
+
+    self.assertEqual(400, response.status_code)
+
+    data = json.loads(response.data.decode('utf-8'))
+    assert_payload_field_type_value(self, data, 'errors', list, ["bulk request must be a json object"])
+    self.assertEqual(self.contacts, self._remaining())
+
+  def test_sadpath_bulk_delete_invalid_user_id(self):
+    response = self.client.delete('/users/99999/contacts/bulk', 
+    json={'ids': [self.contacts[0]]}, content_type='application/json')
+
+    self.assertEqual(404, response.status_code)
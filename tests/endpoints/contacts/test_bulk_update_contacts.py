@@ -0,0 +1,129 @@
+import json 
+import unittest 
+
+from api import create_app, db 
+from api.database.models import User, Contact 
+from tests import assert_payload_field_type_value
+
+class BulkUpdateContactsTest(unittest.TestCase):
+  def setUp(self):
+    self.app = create_app('testing')
+    self.app_context = self.app.app_context()
+    self.app_context.push()
+    db.create_all()
+    self.client = self.app.test_client()
+
+    self.user = User(email='jc@example.com', first_name='joshua', last_name='carey')
+    self.user.insert()
+    self.other_user = User(email='other@example.com', first_name='other', last_name='user')
+    self.other_user.insert()
+
+    self.contacts = []
+    for user, group in ((self.user, 'old-coworkers'), (self.user, 'old-coworkers'), 
+                        (self.user, 'friend'), (self.other_user, 'old-coworkers')):
+      contact = Contact(user, {
+        'first_name': 'darrel',
+        'last_name': 'wadsworth', 
+        'group': group, 
+        'street_address': '45321 example way',
+        'city': 'Denver',
+        'state': 'Colorado',
+        'zipcode': '80000'  
+      })
+      contact.insert()
+      self.contacts.append(contact.id)
+
+  def tearDown(self):
+    db.session.remove()
+    db.drop_all()
+    self.app_context.pop()
+
+  def _groups(self):
+    return [Contact.query.get(contact_id).group for contact_id in self.contacts]
+
+  def test_happypath_bulk_update_by_filter(self):
+    payload = {'filter': {'group': 'old-coworkers'}, 'changes': {'group': ' acquaintance '}}
+
+    response = self.client.patch(f'/users/{self.user.id}/contacts/bulk', 
+    json=payload, content_type='application/json')
+
+    self.assertEqual(200, response.status_code)
+
+    data = json.loads(response.data.decode('utf-8'))
+    assert_payload_field_type_value(self, data, 'success', bool, True)
+    assert_payload_field_type_value(self, data, 'updated', int, 2)
+
+    # the other user's contact in the same group is untouched
+    self.assertEqual(['acquaintance', 'acquaintance', 'friend', 'old-coworkers'], self._groups())
+
+  def test_happypath_bulk_update_by_ids(self):
+    payload = {'ids': [self.contacts[0], self.contacts[2], self.contacts[3]], 'changes': {'city': 'Boulder'}}
+
+    response = self.client.patch(f'/users/{self.user.id}/contacts/bulk', 
+    json=payload, content_type='application/json')
+
+    data = json.loads(response.data.decode('utf-8'))
+    assert_payload_field_type_value(self, data, 'updated', int, 2)
+
+    cities = [Contact.query.get(contact_id).city for contact_id in self.contacts]
+    self.assertEqual(['Boulder', 'Denver', 'Boulder', 'Denver'], cities)
+
+  def test_sadpath_bulk_update_blank_field(self):
+    payload = {'ids': [self.contacts[0]], 'changes': {'first_name': ' '}}
+
+    response = self.client.patch(f'/users/{self.user.id}/contacts/bulk', 
+    json=payload, content_type='application/json')
+
+    self.assertEqual(400, response.status_code)
+
+    data = json.loads(response.data.decode('utf-8'))
+    assert_payload_field_type_value(self, data, 'success', bool, False)
+    assert_payload_field_type_value(self, data, 'errors', list, ["required 'first_name' parameter is blank"])
+
+  def test_sadpath_bulk_update_missing_selection(self):
+    response = self.client.patch(f'/users/{self.user.id}/contacts/bulk', 
+    json={'changes': {'group': 'friend'}}, content_type='application/json')
+
+    self.assertEqual(400, response.status_code)
+
+    data = json.loads(response.data.decode('utf-8'))
+    assert_payload_field_type_value(self, data, 'errors', list, ["required 'ids' or 'filter' parameter is missing"])
+    self.assertEqual(['old-coworkers', 'old-coworkers', 'friend', 'old-coworkers'], self._groups())
+
+  def test_sadpath_bulk_update_body_not_an_object(self):
+    response = self.client.patch(f'/users/{self.user.id}/contacts/bulk', 
+    json='friend', content_type='application/json')
+
+    self.assertEqual(400, response.status_code)
+
+    data = json.loads(response.data.decode('utf-8'))
+    assert_payload_field_type_value(self, data, 'errors', list, ["bulk request must be a json object"])
+    self.assertEqual(['old-coworkers', 'old-coworkers', 'friend', 'old-coworkers'], self._groups())
+
+  def test_sadpath_bulk_update_unfilterable_field(self):
+    payload = {'filter': {'first_name': 'darrel'}, 'changes': {'group': 'friend'}}
+
+    response = self.client.patch(f'/users/{self.user.id}/contacts/bulk', 
+    json=payload, content_type='application/json')
+
+    self.assertEqual(400, response.status_code)
+
+    data = json.loads(response.data.decode('utf-8'))
+    assert_payload_field_type_value(self, data, 'errors', list, ["'filter' parameter 'first_name' is not a filterable field"])
+
+  def test_sadpath_bulk_update_missing_changes(self):
+    response = self.client.patch(f'/users/{self.user.id}/contacts/bulk', 
+    json={'ids': [self.contacts[0]]}, content_type='application/json')
+
+    self.assertEqual(400, response.status_code)
+
+    data = json.loads(response.data.decode('utf-8'))
+    assert_payload_field_type_value(self, data, 'errors', list, ["required 'changes' parameter is missing"])
+
+  def test_sadpath_bulk_update_invalid_user_id(self):
+    payload = {'ids': [self.contacts[0]], 'changes': {'group': 'friend'}}
+
+    response = self.client.patch('/users/99999/contacts/bulk', 
+    json=payload, content_type='application/json')
+
+    self.assertEqual(404, response.status_code)
@@ -0,0 +1,90 @@
+import json 
+import unittest 
+
+from api import create_app, db 
+from api.database.models import User, Contact 
+from api.serialization import _packb_python
+from tests import assert_payload_field_type_value
+
+class CompactContactsTest(unittest.TestCase):
+  def setUp(self):
+    self.app = create_app('testing')
+    self.app_context = self.app.app_context()
+    self.app_context.push()
+    db.create_all()
+    self.client = self.app.test_client()
+
+    self.user = User(email='jc@example.com', first_name='joshua', last_name='carey')
+    self.user.insert()
+
+    for i, (group, city) in enumerate([('friend', 'Denver'), ('family', 'Boulder'), ('friend', 'Denver')]):
+      Contact(self.user, {
+        'first_name': f'darrel_{i}', 'last_name': f'wadsworth_{i}', 'group': group, 
+        'street_address': f'{i} example way', 'city': city, 'state': 'Colorado', 'zipcode': '80000'
+      }).insert()
+    self.url = f'/users/{self.user.id}/contacts'
+
+  def tearDown(self):
+    db.session.remove()
+    db.drop_all()
+    self.app_context.pop()
+
+  def _rows(self, contacts):
+    '''
+    decodes the columnar form back into the rows of the json form
+    '''
+    columns, dictionaries = contacts['columns'], contacts['dictionaries']
+    rows = []
+    for index in range(contacts['count']):
+      row = {field: values[index] for field, values in columns.items()}
+      for field, values in dictionaries.items():
+        row[field] = values[row[field]]
+      rows.append(row)
+    return rows
+
+  def test_happypath_columnar_matches_json(self):
+    expected = json.loads(self.client.get(self.url).data)['contacts']
+
+    response = self.client.get(self.url, headers={'Accept': 'application/vnd.address-book.columnar+json'})
+
+    self.assertEqual(200, response.status_code)
+    self.assertEqual('application/vnd.address-book.columnar+json', response.mimetype)
+    data = json.loads(response.data)
+    assert_payload_field_type_value(self, data, 'success', bool, True)
+    self.assertEqual(['friend', 'family'], data['contacts']['dictionaries']['group'])
+    self.assertEqual([0, 1, 0], data['contacts']['columns']['group'])
+    self.assertEqual(['Colorado'], data['contacts']['dictionaries']['state'])
+    self.assertEqual(expected, self._rows(data['contacts']))
+
+  def test_happypath_msgpack(self):
+    columnar = json.loads(self.client.get(self.url + '?format=columnar&limit=2').data)
+
+    response = self.client.get(self.url + '?limit=2', headers={'Accept': 'application/msgpack'})
+
+    self.assertEqual(200, response.status_code)
+    self.assertEqual('application/msgpack', response.mimetype)
+    self.assertEqual(_packb_python(columnar), response.data)
+
+  def test_format_parameter_wins_over_accept(self):
+    response = self.client.get(self.url + '?format=columnar', headers={'Accept': 'application/msgpack'})
+
+    self.assertEqual('application/vnd.address-book.columnar+json', response.mimetype)
+
+  def test_representations_have_their_own_etags(self):
+    plain = self.client.get(self.url)
+    columnar = self.client.get(self.url, headers={'Accept': 'application/vnd.address-book.columnar+json'})
+
+    self.assertIn('Accept', columnar.vary)
+    self.assertNotEqual(plain.headers['ETag'], columnar.headers['ETag'])
+
+    response = self.client.get(self.url, headers={'Accept': 'application/vnd.address-book.columnar+json', 
+                                                  'If-None-Match': plain.headers['ETag']})
+    self.assertEqual(200, response.status_code)
+
+  def test_sad_path_unknown_format(self):
+    response = self.client.get(self.url + '?format=xml')
+
+    self.assertEqual(400, response.status_code)
+    data = json.loads(response.data)
+    assert_payload_field_type_value(self, data, 'errors', list, 
+                                    ["'format' parameter must be one of: json, ndjson, columnar, msgpack"])
@@ -0,0 +1,136 @@
+import json 
+import unittest 
+
+from api import create_app, db 
+from api.database.models import User, Contact 
+from api.resources.imports import _import_contacts
+from api.resources.pagination import _pack
+from tests import assert_payload_field_type_value, assert_payload_field_type
+
+class ContactChangesTest(unittest.TestCase):
+  def setUp(self):
+    self.app = create_app('testing')
+    self.app_context = self.app.app_context()
+    self.app_context.push()
+    db.create_all()
+    self.client = self.app.test_client()
+
+    self.user = User(email='jc@example.com', first_name='joshua', last_name='carey')
+    self.user.insert()
+
+    self.contacts = [self._create_contact(f'darrel_{i}') for i in range(3)]
+
+  def tearDown(self):
+    db.session.remove()
+    db.drop_all()
+    self.app_context.pop()
+
+  def _create_contact(self, first_name):
+    contact = Contact(self.user, {
+      'first_name': first_name,
+      'last_name': 'wadsworth', 
+      'street_address': '45321 example way',
+      'city': 'Denver',
+      'state': 'Colorado',
+      'zipcode': '80000'  
+    })
+    contact.insert()
+    return contact
+
+  def _changes(self, cursor=None):
+    url = f'/users/{self.user.id}/contacts/changes'
+    if cursor is not None: 
+      url += f'?since={cursor}'
+    response = self.client.get(url)
+
+    self.assertEqual(200, response.status_code)
+    data = json.loads(response.data.decode('utf-8'))
+    assert_payload_field_type_value(self, data, 'success', bool, True)
+    assert_payload_field_type(self, data, 'contacts', list)
+    assert_payload_field_type(self, data, 'deleted', list)
+    assert_payload_field_type(self, data, 'cursor', str)
+
+    return data
+
+  def test_happypath_full_sync_without_cursor(self):
+    data = self._changes()
+
+    self.assertEqual(['darrel_0', 'darrel_1', 'darrel_2'], [contact['first_name'] for contact in data['contacts']])
+    self.assertEqual([], data['deleted'])
+
+  def test_happypath_no_changes_since_cursor(self):
+    cursor = self._changes()['cursor']
+
+    data = self._changes(cursor)
+
+    self.assertEqual([], data['contacts'])
+    self.assertEqual([], data['deleted'])
+    self.assertEqual(cursor, data['cursor'])
+
+  def test_happypath_changes_since_cursor(self):
+    cursor = self._changes()['cursor']
+
+    self.contacts[1].city = 'Boulder'
+    self.contacts[1].update()
+    self._create_contact('darrel_3')
+    deleted_id = self.contacts[0].id
+    self.contacts[0].delete()
+
+    data = self._changes(cursor)
+
+    self.assertEqual(['darrel_1', 'darrel_3'], [contact['first_name'] for contact in data['contacts']])
+    self.assertEqual('Boulder', data['contacts'][0]['city'])
+    self.assertEqual([deleted_id], data['deleted'])
+
+    data = self._changes(data['cursor'])
+
+    self.assertEqual([], data['contacts'])
+    self.assertEqual([], data['deleted'])
+
+  def test_happypath_bulk_delete_leaves_tombstones(self):
+    cursor = self._changes()['cursor']
+    ids = [contact.id for contact in self.contacts[:2]]
+
+    self.client.delete(f'/users/{self.user.id}/contacts/bulk', json={'ids': ids})
+
+    data = self._changes(cursor)
+
+    self.assertEqual(sorted(ids), sorted(data['deleted']))
+
+  def test_happypath_import_chunk_committed_after_a_sync(self):
+    cursor = self._changes()['cursor']
+    synced = {}
+
+    def records():
+      # the first chunk has committed by the time a third record is asked for
+      for number in range(4):
+        if number == 2: 
+          synced['data'] = self._changes(cursor)
+        yield {'first_name': f'bruce_{number}', 'last_name': 'wayne', 'street_address': '1007 mountain drive', 
+               'city': 'Gotham', 'state': 'New Jersey', 'zipcode': '07001'}
+
+    _import_contacts(self.user.id, records(), chunk_size=2)
+    data = self._changes(synced['data']['cursor'])
+
+    self.assertEqual(['bruce_0', 'bruce_1'], [contact['first_name'] for contact in synced['data']['contacts']])
+    self.assertEqual(['bruce_2', 'bruce_3'], [contact['first_name'] for contact in data['contacts']])
+
+  def test_sadpath_invalid_cursor(self):
+    response = self.client.get(f'/users/{self.user.id}/contacts/changes?since=yesterday')
+
+    self.assertEqual(400, response.status_code)
+
+    data = json.loads(response.data.decode('utf-8'))
+    assert_payload_field_type_value(self, data, 'success', bool, False)
+    assert_payload_field_type_value(self, data, 'errors', list, ["'since' parameter is not a valid cursor"])
+
+  def test_sadpath_tampered_cursor(self):
+    for values in (['2026-10-18T00:00:00'], [True], [-1], [1, 2]):
+      response = self.client.get(f'/users/{self.user.id}/contacts/changes?since={_pack(values)}')
+
+      self.assertEqual(400, response.status_code)
+
+  def test_sadpath_invalid_user_id(self):
+    response = self.client.get('/users/99999/contacts/changes')
+
+    self.assertEqual(404, response.status_code)
@@ -107,6 +107,22 @@ class CreateContactTest(unittest.TestCase):
     assert_payload_field_type_value(self, data, 'error', int, 400)
     assert_payload_field_type_value(self, data, 'errors', list, ["required 'last_name' parameter is blank"])
 
+  def test_sadpath_field_longer_than_column(self):
+    payload = deepcopy(self.payload)
+    payload['street_address'] = 'x' * 121
+    payload['zipcode'] = 80000
+
+    response = self.client.post(f'/users/{self.user.id}/contacts', 
+    json=payload, content_type='application/json')
+
+    self.assertEqual(400, response.status_code)
+    data = json.loads(response.data.decode('utf-8'))
+
+    assert_payload_field_type_value(self, data, 'errors', list, [
+      "'street_address' parameter must be at most 120 characters",
+      "'zipcode' parameter must be a string",
+    ])
+
   def test_sadpath_invalid_user_id(self):
     payload = deepcopy(self.payload)
     response = self.client.post(f'/users/99999/contacts', 
@@ -4,7 +4,7 @@ from copy import deepcopy
 
 from api import create_app, db 
 from api.database.models import User, Contact 
-from tests import assert_payload_field_type_value, assert_payload_field_type
+from tests import assert_payload_field_type_value, assert_payload_field_type, create_other_users_contact
 
 class DeleteContactTest(unittest.TestCase):
   def setUp(self):
@@ -37,11 +37,13 @@ class DeleteContactTest(unittest.TestCase):
     self.app_context.pop()
 
   def test_happypath_delete_contact(self):
-    response = self.client.delete(f'/users/{self.user.id}/contacts/{self.contact.id}')
+    # read before the delete, the row is gone from under self.contact after it
+    url = f'/users/{self.user.id}/contacts/{self.contact.id}'
+    response = self.client.delete(url)
 
     self.assertEqual(204, response.status_code)
 
-    response = self.client.delete(f'/users/{self.user.id}/contacts/{self.contact.id}')
+    response = self.client.delete(url)
 
     self.assertEqual(400, response.status_code)
 
@@ -57,6 +59,14 @@ class DeleteContactTest(unittest.TestCase):
     assert_payload_field_type_value(self, data, 'error', int, 400)
     assert_payload_field_type_value(self, data, 'errors', list, [f"contact with id: '{contact_id}' not found"])
 
+  def test_sadpath_delete_another_users_contact(self):
+    contact_id = create_other_users_contact(self.contact_payload)
+
+    response = self.client.delete(f'/users/{self.user.id}/contacts/{contact_id}')
+
+    self.assertEqual(400, response.status_code)
+    self.assertEqual(1, db.session.query(Contact).filter_by(id=contact_id).count())
+
   def test_sadpath_delete_test_invalid_user_id(self):
     response = self.client.delete(f'/users/99999/contacts/{self.contact.id}')
 
@@ -0,0 +1,98 @@
+import csv 
+import gzip 
+import json 
+import unittest 
+
+from api import create_app, db 
+from api.database.models import User, Contact 
+from api.formats import vcard 
+from tests import assert_payload_field_type_value
+
+class ExportContactsTest(unittest.TestCase):
+  def setUp(self):
+    self.app = create_app('testing')
+    self.app_context = self.app.app_context()
+    self.app_context.push()
+    db.create_all()
+    self.client = self.app.test_client()
+
+    self.user = User(email='jc@example.com', first_name='joshua', last_name='carey')
+    self.user.insert()
+
+    Contact(self.user, {
+      'first_name': 'bruce',
+      'last_name': 'wayne', 
+      'group': 'associate', 
+      'phone_number': '303-555-0100',
+      'street_address': '1007 mountain drive',
+      'street_address_2': 'the cave; lower level',
+      'city': 'Gotham',
+      'state': 'New Jersey',
+      'zipcode': '07001'  
+    }).insert()
+    Contact(self.user, {
+      'first_name': 'clark',
+      'last_name': 'kent', 
+      'street_address': '344 clinton st',
+      'city': 'Metropolis',
+      'state': 'New York',
+      'zipcode': '10001'  
+    }).insert()
+
+  def tearDown(self):
+    db.session.remove()
+    db.drop_all()
+    self.app_context.pop()
+
+  def test_happypath_export_csv(self):
+    response = self.client.get(f'/users/{self.user.id}/contacts/export?format=csv')
+
+    self.assertEqual(200, response.status_code)
+    self.assertEqual('text/csv', response.mimetype)
+    self.assertEqual('attachment; filename="contacts.csv"', response.headers['Content-Disposition'])
+
+    rows = list(csv.DictReader(response.data.decode('utf-8').splitlines()))
+    self.assertEqual(['kent', 'wayne'], [row['last_name'] for row in rows])
+    self.assertEqual('the cave; lower level', rows[1]['street_address_2'])
+    self.assertEqual('friend', rows[0]['group'])
+    self.assertEqual('', rows[0]['phone_number'])
+
+  def test_happypath_export_vcard_round_trips(self):
+    response = self.client.get(f'/users/{self.user.id}/contacts/export?format=vcf')
+
+    self.assertEqual(200, response.status_code)
+    self.assertEqual('text/vcard', response.mimetype)
+
+    kent, wayne = list(vcard.parse_contacts(response.data.decode('utf-8').splitlines(), ()))
+    self.assertEqual('clark', kent['first_name'])
+    self.assertNotIn('phone_number', kent)
+    self.assertEqual('wayne', wayne['last_name'])
+    self.assertEqual('303-555-0100', wayne['phone_number'])
+    self.assertEqual('1007 mountain drive', wayne['street_address'])
+    self.assertEqual('the cave; lower level', wayne['street_address_2'])
+    self.assertEqual('07001', wayne['zipcode'])
+    self.assertEqual('associate', wayne['group'])
+
+  def test_happypath_export_gzip(self):
+    response = self.client.get(f'/users/{self.user.id}/contacts/export?format=csv&gzip=1')
+
+    self.assertEqual(200, response.status_code)
+    self.assertEqual('application/gzip', response.mimetype)
+    self.assertEqual('attachment; filename="contacts.csv.gz"', response.headers['Content-Disposition'])
+
+    rows = list(csv.DictReader(gzip.decompress(response.data).decode('utf-8').splitlines()))
+    self.assertEqual(2, len(rows))
+
+  def test_sadpath_export_unknown_format(self):
+    response = self.client.get(f'/users/{self.user.id}/contacts/export?format=xlsx')
+
+    self.assertEqual(400, response.status_code)
+
+    data = json.loads(response.data.decode('utf-8'))
+    assert_payload_field_type_value(self, data, 'success', bool, False)
+    assert_payload_field_type_value(self, data, 'errors', list, ["'format' parameter must be one of: csv, vcf"])
+
+  def test_sadpath_export_invalid_user_id(self):
+    response = self.client.get('/users/99999/contacts/export')
+
+    self.assertEqual(404, response.status_code)
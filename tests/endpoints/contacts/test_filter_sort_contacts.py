@@ -0,0 +1,96 @@
+import json 
+import unittest 
+
+from api import create_app, db 
+from api.database.models import User, Contact 
+from tests import assert_payload_field_type_value, assert_payload_field_type
+
+class FilterSortContactsTest(unittest.TestCase):
+  def setUp(self):
+    self.app = create_app('testing')
+    self.app_context = self.app.app_context()
+    self.app_context.push()
+    db.create_all()
+    self.client = self.app.test_client()
+
+    self.user = User(email='jc@example.com', first_name='joshua', last_name='carey')
+    self.user.insert()
+
+    contacts = [
+      ('bruce', 'wayne', 'associate', 'Gotham', 'New Jersey', '07001'),
+      ('clark', 'kent', 'friend', 'Metropolis', 'New York', '10001'),
+      ('diana', 'prince', 'friend', 'Denver', 'Colorado', '80000'),
+      ('barry', 'allen', 'family', 'Central City', 'Colorado', '80001'),
+    ]
+
+    for first_name, last_name, group, city, state, zipcode in contacts: 
+      Contact(self.user, {
+        'first_name': first_name,
+        'last_name': last_name,
+        'group': group,
+        'street_address': '45321 example way',
+        'city': city,
+        'state': state,
+        'zipcode': zipcode
+      }).insert()
+
+  def tearDown(self):
+    db.session.remove()
+    db.drop_all()
+    self.app_context.pop()
+
+  def _last_names(self, response):
+    self.assertEqual(200, response.status_code)
+    data = json.loads(response.data.decode('utf-8'))
+    assert_payload_field_type_value(self, data, 'success', bool, True)
+    assert_payload_field_type(self, data, 'contacts', list)
+
+    return [contact['last_name'] for contact in data['contacts']]
+
+  def test_happypath_filter_contacts_by_state(self):
+    response = self.client.get(f'/users/{self.user.id}/contacts?state=Colorado')
+
+    self.assertEqual(['allen', 'prince'], self._last_names(response))
+
+  def test_happypath_filter_contacts_by_several_groups(self):
+    response = self.client.get(f'/users/{self.user.id}/contacts?group=family&group=associate')
+
+    self.assertEqual(['allen', 'wayne'], self._last_names(response))
+
+  def test_happypath_combined_filters(self):
+    response = self.client.get(f'/users/{self.user.id}/contacts?group=friend&state=Colorado')
+
+    self.assertEqual(['prince'], self._last_names(response))
+
+  def test_happypath_sort_contacts_descending(self):
+    response = self.client.get(f'/users/{self.user.id}/contacts?sort=-last_name')
+
+    self.assertEqual(['wayne', 'prince', 'kent', 'allen'], self._last_names(response))
+
+  def test_happypath_paginate_mixed_sort(self):
+    url = f'/users/{self.user.id}/contacts?sort=state,-city&limit=3'
+    response = self.client.get(url)
+    data = json.loads(response.data.decode('utf-8'))
+
+    self.assertEqual(['prince', 'allen', 'wayne'], self._last_names(response))
+
+    response = self.client.get(f"{url}&after={data['next']}")
+
+    self.assertEqual(['kent'], self._last_names(response))
+
+  def test_sadpath_unsortable_field(self):
+    response = self.client.get(f'/users/{self.user.id}/contacts?sort=phone_number')
+
+    self.assertEqual(400, response.status_code)
+
+    data = json.loads(response.data.decode('utf-8'))
+    assert_payload_field_type_value(self, data, 'success', bool, False)
+    assert_payload_field_type_value(self, data, 'errors', list, ["'sort' parameter 'phone_number' is not a sortable field"])
+
+  def test_sadpath_cursor_from_another_sort(self):
+    response = self.client.get(f'/users/{self.user.id}/contacts?limit=1')
+    data = json.loads(response.data.decode('utf-8'))
+
+    response = self.client.get(f"/users/{self.user.id}/contacts?sort=city&limit=1&after={data['next']}")
+
+    self.assertEqual(400, response.status_code)
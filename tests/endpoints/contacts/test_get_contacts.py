@@ -1,9 +1,13 @@
 import json 
+import random 
 import unittest 
-from copy import deepcopy
+from sqlalchemy import event
 
 from api import create_app, db 
+from api.cache import get_cache
 from api.database.models import User, Contact 
+from api.database.factories import contact_details 
+from api.resources.pagination import _pack
 from tests import assert_payload_field_type_value, assert_payload_field_type
 
 class GetContactsTest(unittest.TestCase):
@@ -17,25 +21,11 @@ class GetContactsTest(unittest.TestCase):
     self.user = User(email='jc@example.com', first_name='joshua', last_name='carey')
     self.user.insert()
 
-    self.contact_payload = {
-      'first_name': 'darrel',
-      'last_name': 'wadsworth', 
-      'group': 'friend', 
-      'phone_number': '999-999-9999',
-      'street_address': '45321 example way',
-      'city': 'Denver',
-      'state': 'Colorado',
-      'zipcode': '80000'  
-    }
-
-    # creates three contacts (all attributes differentiated by '_i') for user 
-    # TODO: good use case for factory bot 
-
-    for i in range(3):
-      payload = deepcopy(self.contact_payload)
-      for key, value in payload.items():
-        payload[key] = value + f'_{i}' 
-      Contact(self.user, payload)
+    # three factory contacts, last names numbered so the list order is known 
+    rng = random.Random(1)
+    Contact.insert_many(self.user.id, [
+      dict(contact_details(rng), last_name=f'wadsworth_{i}', phone_number=f'999-999-999{i}') for i in range(3)
+    ])
 
   def tearDown(self):
     db.session.remove()
@@ -43,8 +33,6 @@ class GetContactsTest(unittest.TestCase):
     self.app_context.pop()
 
   def test_happypath_show_contacts(self):
-    payload = deepcopy(self.contact_payload)
-
     response = self.client.get(f'/users/{self.user.id}/contacts')
 
     self.assertEqual(200, response.status_code)
@@ -84,3 +72,147 @@ class GetContactsTest(unittest.TestCase):
     response = self.client.get(f'/users/99999/contacts')
 
     self.assertEqual(404, response.status_code)
+
+  def test_happypath_paginate_contacts(self):
+    response = self.client.get(f'/users/{self.user.id}/contacts?limit=2')
+
+    self.assertEqual(200, response.status_code)
+    data = json.loads(response.data.decode('utf-8'))
+
+    assert_payload_field_type_value(self, data, 'success', bool, True)
+    assert_payload_field_type(self, data, 'next', str)
+    self.assertEqual(2, len(data['contacts']))
+    self.assertEqual(['wadsworth_0', 'wadsworth_1'], [contact['last_name'] for contact in data['contacts']])
+
+    response = self.client.get(f"/users/{self.user.id}/contacts?limit=2&after={data['next']}")
+
+    self.assertEqual(200, response.status_code)
+    next_data = json.loads(response.data.decode('utf-8'))
+
+    self.assertEqual(1, len(next_data['contacts']))
+    self.assertEqual('wadsworth_2', next_data['contacts'][0]['last_name'])
+    self.assertIsNone(next_data['next'])
+
+  def test_happypath_paginate_large_address_book(self):
+    rng = random.Random(1)
+    Contact.insert_many(self.user.id, [contact_details(rng) for _ in range(120)])
+
+    seen = []
+    url = f'/users/{self.user.id}/contacts?limit=50'
+    while url is not None: 
+      response = self.client.get(url)
+      self.assertEqual(200, response.status_code)
+      data = json.loads(response.data.decode('utf-8'))
+      seen.extend(data['contacts'])
+      url = data['next'] and f"/users/{self.user.id}/contacts?limit=50&after={data['next']}"
+
+    self.assertEqual(123, len(seen))
+    self.assertEqual(123, len({contact['id'] for contact in seen}))
+    keys = [(contact['last_name'], contact['first_name'], contact['id']) for contact in seen]
+    self.assertEqual(sorted(keys), keys)
+
+  def test_sad_path_invalid_limit(self):
+    response = self.client.get(f'/users/{self.user.id}/contacts?limit=zero')
+
+    self.assertEqual(400, response.status_code)
+
+    data = json.loads(response.data.decode('utf-8'))
+    assert_payload_field_type_value(self, data, 'success', bool, False)
+    assert_payload_field_type_value(self, data, 'errors', list, ["'limit' parameter must be an integer"])
+
+  def test_sad_path_invalid_cursor(self):
+    response = self.client.get(f'/users/{self.user.id}/contacts?limit=2&after=not-a-cursor')
+
+    self.assertEqual(400, response.status_code)
+
+    data = json.loads(response.data.decode('utf-8'))
+    assert_payload_field_type_value(self, data, 'success', bool, False)
+    assert_payload_field_type_value(self, data, 'errors', list, ["'after' parameter is not a valid cursor"])
+
+  def test_sad_path_tampered_cursor_values(self):
+    for values in (['last_name,first_name,id', 'y', {'a': 1}, 1], 
+                   ['last_name,first_name,id', 'y', 'x', True], 
+                   ['last_name,first_name,id', 'y', 'x', '1'], 
+                   ['-updated_at,id', 5, 1]):
+      sort = '-updated_at' if values[0].startswith('-updated_at') else 'last_name,first_name'
+      response = self.client.get(f'/users/{self.user.id}/contacts?sort={sort}&limit=2&after={_pack(values)}')
+
+      self.assertEqual(400, response.status_code, values)
+      data = json.loads(response.data.decode('utf-8'))
+      assert_payload_field_type_value(self, data, 'errors', list, ["'after' parameter is not a valid cursor"])
+
+  def test_happypath_stream_contacts(self):
+    response = self.client.get(f'/users/{self.user.id}/contacts?stream=1')
+
+    self.assertEqual(200, response.status_code)
+    self.assertEqual('application/x-ndjson', response.mimetype)
+
+    lines = response.data.decode('utf-8').splitlines()
+    self.assertEqual(3, len(lines))
+
+    contacts = [json.loads(line) for line in lines]
+    self.assertEqual(['wadsworth_0', 'wadsworth_1', 'wadsworth_2'], [contact['last_name'] for contact in contacts])
+    for contact in contacts: 
+      assert_payload_field_type(self, contact, 'id', int)
+      assert_payload_field_type(self, contact, 'first_name', str)
+
+  def test_happypath_stream_contacts_with_accept_header(self):
+    response = self.client.get(f'/users/{self.user.id}/contacts', headers={'Accept': 'application/x-ndjson'})
+
+    self.assertEqual(200, response.status_code)
+    self.assertEqual('application/x-ndjson', response.mimetype)
+    self.assertEqual(3, len(response.data.decode('utf-8').splitlines()))
+
+  def test_happypath_contacts_not_modified(self):
+    response = self.client.get(f'/users/{self.user.id}/contacts')
+    etag = response.headers['ETag']
+
+    response = self.client.get(f'/users/{self.user.id}/contacts', headers={'If-None-Match': etag})
+
+    self.assertEqual(304, response.status_code)
+    self.assertEqual(b'', response.data)
+
+    # another page of the same list is a different representation
+    response = self.client.get(f'/users/{self.user.id}/contacts?limit=1', headers={'If-None-Match': etag})
+    self.assertEqual(200, response.status_code)
+
+  def test_happypath_contacts_not_modified_without_scanning_them(self):
+    response = self.client.get(f'/users/{self.user.id}/contacts')
+    etag = response.headers['ETag']
+    get_cache('contact_lists').clear()
+    statements = []
+    record = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', record)
+
+    try: 
+      response = self.client.get(f'/users/{self.user.id}/contacts', headers={'If-None-Match': etag})
+    finally: 
+      event.remove(db.engine, 'before_cursor_execute', record)
+
+    self.assertEqual(304, response.status_code)
+    # the user's change_seq, no aggregate over their contacts
+    self.assertEqual(1, len(statements))
+    self.assertNotIn('contacts', statements[0])
+
+  def test_happypath_contacts_changed_after_update(self):
+    response = self.client.get(f'/users/{self.user.id}/contacts')
+    etag = response.headers['ETag']
+    contact = Contact.query.filter_by(user_id=self.user.id).first()
+
+    self.client.patch(f'/users/{self.user.id}/contacts/{contact.id}', json={'city': 'Gotham'})
+    response = self.client.get(f'/users/{self.user.id}/contacts', headers={'If-None-Match': etag})
+
+    self.assertEqual(200, response.status_code)
+    self.assertNotEqual(etag, response.headers['ETag'])
+
+  def test_happypath_contacts_changed_after_delete(self):
+    response = self.client.get(f'/users/{self.user.id}/contacts')
+    etag = response.headers['ETag']
+
+    Contact.query.filter_by(user_id=self.user.id).first().delete()
+
+    response = self.client.get(f'/users/{self.user.id}/contacts', headers={'If-None-Match': etag})
+
+    self.assertEqual(200, response.status_code)
+    data = json.loads(response.data.decode('utf-8'))
+    self.assertEqual(2, len(data['contacts']))
@@ -0,0 +1,129 @@
+import io 
+import json 
+import unittest 
+
+from api import create_app, db 
+from api.database.models import User, Contact 
+from tests import assert_payload_field_type_value, assert_payload_field_type
+
+CSV_FILE = '''First Name,Last Name,Phone,Street Address,Address 2,City,State,Zip,Category
+bruce,wayne,303-555-0100,1007 mountain drive,,Gotham,New Jersey,07001,associate
+clark,kent,,344 clinton st,apt 3d,Metropolis,New York,10001,
+,nobody,,1 missing first name way,,Denver,Colorado,80000,
+'''
+
+VCF_FILE = '''BEGIN:VCARD
+VERSION:3.0
+N:Prince;Diana;;;
+FN:Diana Prince
+TEL;TYPE=cell:303-555-0199
+ADR;TYPE=home:;;1 Paradise Island Rd;Themyscira;Colorado;8000
+ 1;
+CATEGORIES:friend,work
+END:VCARD
+BEGIN:VCARD
+VERSION:3.0
+FN:Barry Allen
+item1.ADR:;;1 Star Labs Plaza\\nSuite 9;Central City;Missouri;64101;USA
+END:VCARD
+'''
+
+class ImportContactsTest(unittest.TestCase):
+  def setUp(self):
+    self.app = create_app('testing')
+    self.app_context = self.app.app_context()
+    self.app_context.push()
+    db.create_all()
+    self.client = self.app.test_client()
+
+    self.user = User(email='jc@example.com', first_name='joshua', last_name='carey')
+    self.user.insert()
+
+  def tearDown(self):
+    db.session.remove()
+    db.drop_all()
+    self.app_context.pop()
+
+  def _contacts(self):
+    return Contact.query.filter_by(user_id=self.user.id).order_by(Contact.last_name).all()
+
+  def test_happypath_import_csv_body(self):
+    response = self.client.post(f'/users/{self.user.id}/contacts/import', 
+    data=CSV_FILE, content_type='text/csv')
+
+    self.assertEqual(201, response.status_code)
+
+    data = json.loads(response.data.decode('utf-8'))
+    assert_payload_field_type_value(self, data, 'success', bool, True)
+    assert_payload_field_type_value(self, data, 'imported', int, 2)
+    assert_payload_field_type_value(self, data, 'skipped', int, 1)
+    assert_payload_field_type_value(self, data, 'errors', list, [
+      {'record': 3, 'errors': ["required 'first_name' parameter is blank"]}
+    ])
+
+    kent, wayne = self._contacts()
+    self.assertEqual('bruce', wayne.first_name)
+    self.assertEqual('303-555-0100', wayne.phone_number)
+    self.assertEqual('associate', wayne.group)
+    self.assertEqual('07001', wayne.zipcode)
+    self.assertIsNone(wayne.street_address_2)
+    self.assertEqual('apt 3d', kent.street_address_2)
+    self.assertEqual('friend', kent.group)
+    self.assertIsNone(kent.phone_number)
+    self.assertIsNotNone(kent.created_at)
+
+  def test_record_numbers_continue_across_chunks(self):
+    from api.resources.imports import _import_contacts, _read_contacts
+
+    imported, skipped, errors = _import_contacts(self.user.id, _read_contacts(io.BytesIO(CSV_FILE.encode('utf-8')), 'csv'), 
+                                                 chunk_size=2)
+
+    self.assertEqual((2, 1), (imported, skipped))
+    self.assertEqual([{'record': 3, 'errors': ["required 'first_name' parameter is blank"]}], errors)
+
+  def test_happypath_import_vcard_file_upload(self):
+    response = self.client.post(f'/users/{self.user.id}/contacts/import', 
+    data={'file': (io.BytesIO(VCF_FILE.encode('utf-8')), 'contacts.vcf')}, 
+    content_type='multipart/form-data')
+
+    self.assertEqual(201, response.status_code)
+
+    data = json.loads(response.data.decode('utf-8'))
+    assert_payload_field_type_value(self, data, 'imported', int, 2)
+    assert_payload_field_type_value(self, data, 'skipped', int, 0)
+
+    allen, prince = self._contacts()
+    self.assertEqual('Diana', prince.first_name)
+    self.assertEqual('303-555-0199', prince.phone_number)
+    self.assertEqual('1 Paradise Island Rd', prince.street_address)
+    self.assertEqual('80001', prince.zipcode)
+    self.assertEqual('friend', prince.group)
+    self.assertEqual('Barry', allen.first_name)
+    self.assertEqual('1 Star Labs Plaza', allen.street_address)
+    self.assertEqual('Suite 9', allen.street_address_2)
+    self.assertEqual('Central City', allen.city)
+
+  def test_sadpath_import_unknown_format(self):
+    response = self.client.post(f'/users/{self.user.id}/contacts/import?format=xlsx', 
+    data=CSV_FILE, content_type='text/csv')
+
+    self.assertEqual(400, response.status_code)
+
+    data = json.loads(response.data.decode('utf-8'))
+    assert_payload_field_type_value(self, data, 'success', bool, False)
+    assert_payload_field_type_value(self, data, 'errors', list, ["'format' parameter must be one of: csv, vcf"])
+
+  def test_sadpath_import_missing_file(self):
+    response = self.client.post(f'/users/{self.user.id}/contacts/import', 
+    data={'other': 'value'}, content_type='multipart/form-data')
+
+    self.assertEqual(400, response.status_code)
+
+    data = json.loads(response.data.decode('utf-8'))
+    assert_payload_field_type_value(self, data, 'errors', list, ["required 'file' parameter is missing"])
+
+  def test_sadpath_import_invalid_user_id(self):
+    response = self.client.post('/users/99999/contacts/import', 
+    data=CSV_FILE, content_type='text/csv')
+
+    self.assertEqual(404, response.status_code)
@@ -0,0 +1,94 @@
+import json 
+import unittest 
+
+from api import create_app, db 
+from api.database.models import User, Contact 
+from tests import assert_payload_field_type_value, assert_payload_field_type
+
+class SearchContactsTest(unittest.TestCase):
+  def setUp(self):
+    self.app = create_app('testing')
+    self.app_context = self.app.app_context()
+    self.app_context.push()
+    db.create_all()
+    self.client = self.app.test_client()
+
+    self.user = User(email='jc@example.com', first_name='joshua', last_name='carey')
+    self.user.insert()
+
+    contacts = [
+      ('Bruce', 'Wayne', '303-555-0100', 'Gotham'),
+      ('Barbara', 'Gordon', '303-555-0199', 'Gotham'),
+      ('Clark', 'Kent', '212-555-0142', 'Metropolis'),
+      ('Percy', '100%_real', None, 'Denver'),
+    ]
+
+    for first_name, last_name, phone_number, city in contacts: 
+      Contact(self.user, {
+        'first_name': first_name,
+        'last_name': last_name,
+        'phone_number': phone_number,
+        'street_address': '45321 example way',
+        'city': city,
+        'state': 'Colorado',
+        'zipcode': '80000'
+      }).insert()
+
+  def tearDown(self):
+    db.session.remove()
+    db.drop_all()
+    self.app_context.pop()
+
+  def _search(self, query):
+    response = self.client.get(f'/users/{self.user.id}/contacts/search?q={query}')
+
+    self.assertEqual(200, response.status_code)
+    data = json.loads(response.data.decode('utf-8'))
+    assert_payload_field_type_value(self, data, 'success', bool, True)
+    assert_payload_field_type(self, data, 'contacts', list)
+
+    return [contact['first_name'] for contact in data['contacts']]
+
+  def test_happypath_search_first_name_prefix(self):
+    self.assertEqual(['Bruce'], self._search('bru'))
+
+  def test_happypath_search_is_case_insensitive_across_fields(self):
+    self.assertEqual(['Barbara', 'Bruce'], self._search('GOTH'))
+
+  def test_happypath_search_phone_number_prefix(self):
+    self.assertEqual(['Barbara', 'Bruce'], self._search('303-555'))
+
+  def test_happypath_search_every_term_must_match(self):
+    self.assertEqual(['Bruce'], self._search('gotham wa'))
+
+  def test_happypath_search_escapes_wildcards(self):
+    self.assertEqual(['Percy'], self._search('100%25_'))
+    self.assertEqual([], self._search('%25'))
+
+  def test_happypath_search_respects_limit(self):
+    response = self.client.get(f'/users/{self.user.id}/contacts/search?q=gotham&limit=1')
+
+    data = json.loads(response.data.decode('utf-8'))
+    self.assertEqual(1, len(data['contacts']))
+
+  def test_sadpath_search_missing_query(self):
+    response = self.client.get(f'/users/{self.user.id}/contacts/search')
+
+    self.assertEqual(400, response.status_code)
+
+    data = json.loads(response.data.decode('utf-8'))
+    assert_payload_field_type_value(self, data, 'success', bool, False)
+    assert_payload_field_type_value(self, data, 'errors', list, ["required 'q' parameter is missing"])
+
+  def test_sadpath_search_blank_query(self):
+    response = self.client.get(f'/users/{self.user.id}/contacts/search?q=%20')
+
+    self.assertEqual(400, response.status_code)
+
+    data = json.loads(response.data.decode('utf-8'))
+    assert_payload_field_type_value(self, data, 'errors', list, ["required 'q' parameter is blank"])
+
+  def test_sadpath_search_invalid_user_id(self):
+    response = self.client.get('/users/99999/contacts/search?q=bru')
+
+    self.assertEqual(404, response.status_code)
@@ -4,7 +4,7 @@ from copy import deepcopy
 
 from api import create_app, db 
 from api.database.models import User, Contact 
-from tests import assert_payload_field_type_value, assert_payload_field_type
+from tests import assert_payload_field_type_value, assert_payload_field_type, create_other_users_contact
 
 class ShowContactTest(unittest.TestCase):
   def setUp(self):
@@ -63,7 +63,43 @@ class ShowContactTest(unittest.TestCase):
     assert_payload_field_type_value(self, data, 'error', int, 400)
     assert_payload_field_type_value(self, data, 'errors', list, [f"contact with id: '{contact_id}' not found"])
 
+  def test_sadpath_another_users_contact(self):
+    contact_id = create_other_users_contact(self.contact_payload)
+
+    response = self.client.get(f'/users/{self.user.id}/contacts/{contact_id}')
+
+    self.assertEqual(400, response.status_code)
+
+  def test_happypath_get_contact_in_one_query(self):
+    response = self.client.get(f'/users/{self.user.id}/contacts/{self.contact.id}')
+
+    self.assertIn('desc="1 queries"', response.headers['Server-Timing'])
+
   def test_sadpath_invalid_user_id(self):
     response = self.client.get(f'/users/99999/contacts/{self.contact.id}')
 
     self.assertEqual(404, response.status_code)
+
+  def test_happypath_get_contact_not_modified(self):
+    response = self.client.get(f'/users/{self.user.id}/contacts/{self.contact.id}')
+    etag = response.headers['ETag']
+
+    response = self.client.get(f'/users/{self.user.id}/contacts/{self.contact.id}', 
+    headers={'If-None-Match': etag})
+
+    self.assertEqual(304, response.status_code)
+    self.assertEqual(b'', response.data)
+
+  def test_happypath_get_contact_changed_after_update(self):
+    response = self.client.get(f'/users/{self.user.id}/contacts/{self.contact.id}')
+    etag = response.headers['ETag']
+
+    self.contact.city = 'Boulder'
+    self.contact.update()
+
+    response = self.client.get(f'/users/{self.user.id}/contacts/{self.contact.id}', 
+    headers={'If-None-Match': etag})
+
+    self.assertEqual(200, response.status_code)
+    data = json.loads(response.data.decode('utf-8'))
+    assert_payload_field_type_value(self, data, 'city', str, 'Boulder')
@@ -4,7 +4,7 @@ from copy import deepcopy
 
 from api import create_app, db 
 from api.database.models import User, Contact 
-from tests import assert_payload_field_type_value, assert_payload_field_type
+from tests import assert_payload_field_type_value, assert_payload_field_type, create_other_users_contact
 
 class UpdateContactTest(unittest.TestCase):
   def setUp(self):
@@ -125,6 +125,36 @@ class UpdateContactTest(unittest.TestCase):
     assert_payload_field_type_value(self, data, 'state', str, self.contact_payload['state'])
     assert_payload_field_type_value(self, data, 'zipcode', str, self.contact_payload['zipcode'])
 
+  def test_sadpath_another_users_contact(self):
+    contact_id = create_other_users_contact(self.contact_payload)
+
+    response = self.client.patch(f'/users/{self.user.id}/contacts/{contact_id}',
+    json={'city': 'Gotham'}, content_type='application/json')
+
+    self.assertEqual(400, response.status_code)
+    self.assertEqual('Denver', db.session.query(Contact.city).filter_by(id=contact_id).scalar())
+
+  def test_happypath_update_contact_without_reading_it(self):
+    response = self.client.patch(f'/users/{self.user.id}/contacts/{self.contact.id}',
+    json={'city': 'Gotham'}, content_type='application/json')
+
+    self.assertEqual(200, response.status_code)
+    # the user's change_seq, then the UPDATE ... RETURNING
+    self.assertIn('desc="2 queries"', response.headers['Server-Timing'])
+
+  def test_sadpath_invalid_body_for_invalid_user_id(self):
+    response = self.client.patch(f'/users/99999/contacts/{self.contact.id}',
+    json={'city': ''}, content_type='application/json')
+
+    self.assertEqual(404, response.status_code)
+
+  def test_sadpath_body_not_an_object(self):
+    response = self.client.patch(f'/users/{self.user.id}/contacts/{self.contact.id}', json=[1, 2])
+
+    self.assertEqual(400, response.status_code)
+    data = json.loads(response.data.decode('utf-8'))
+    assert_payload_field_type_value(self, data, 'errors', list, ["contact must be a json object"])
+
   def test_sadpath_invalid_user_id(self):
     payload = deepcopy(self.update_payload)
 
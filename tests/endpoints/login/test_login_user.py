@@ -83,3 +83,10 @@ class LoginUserTest(unittest.TestCase):
     assert_payload_field_type_value(self, data, 'success', bool, False)
     assert_payload_field_type_value(self, data, 'error', int, 400)
     assert_payload_field_type_value(self, data, 'errors', list, ["required 'email' parameter is missing"])
+
+  def test_sadpath_body_not_an_object(self):
+    response = self.client.post('/login', json=['jc@example.com'])
+
+    self.assertEqual(400, response.status_code)
+    data = json.loads(response.data.decode('utf-8'))
+    assert_payload_field_type_value(self, data, 'errors', list, ["login must be a json object"])
@@ -150,6 +150,29 @@ class CreateUserTest(unittest.TestCase):
       ["required 'email' parameter is blank"]
     )
 
+  def test_sadpath_email_longer_than_column(self):
+    payload = deepcopy(self.payload)
+    payload['email'] = 'x' * 110 + '@example.com'
+
+    response = self.client.post(
+      '/users', json=payload,
+      content_type='application/json'
+    )
+    self.assertEqual(400, response.status_code)
+
+    data = json.loads(response.data.decode('utf-8'))
+
+    assert_payload_field_type_value(self, data, 'errors', list,
+      ["'email' parameter must be at most 120 characters"]
+    )
+
+  def test_sadpath_body_not_an_object(self):
+    response = self.client.post('/users', json=['x'])
+    self.assertEqual(400, response.status_code)
+
+    data = json.loads(response.data.decode('utf-8'))
+    assert_payload_field_type_value(self, data, 'errors', list, ["user must be a json object"])
+
   def test_sadpath_email_not_unique(self):
     payload = deepcopy(self.payload)
     user = User(
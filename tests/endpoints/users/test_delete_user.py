@@ -2,7 +2,7 @@ import json
 import unittest 
 
 from api import create_app, db
-from api.database.models import User 
+from api.database.models import User, Contact 
 
 class DeleteUserTest(unittest.TestCase):
   def setUp(self):
@@ -30,6 +30,24 @@ class DeleteUserTest(unittest.TestCase):
     )
     self.assertEqual(404, response.status_code)
 
+  def test_happypath_user_delete_removes_contacts(self):
+    for i in range(3):
+      Contact(self.user, {
+        'first_name': f'darrel_{i}',
+        'last_name': 'wadsworth', 
+        'street_address': '45321 example way',
+        'city': 'Denver',
+        'state': 'Colorado',
+        'zipcode': '80000'  
+      }).insert()
+    user_id = self.user.id
+    db.session.expire_all()
+
+    response = self.client.delete(f'/users/{user_id}')
+    self.assertEqual(204, response.status_code)
+
+    self.assertEqual(0, Contact.query.filter_by(user_id=user_id).count())
+
   def test_sadpath_user_delete_invalid_id(self):
     response = self.client.delete(f'/users/9999')
     self.assertEqual(404, response.status_code)
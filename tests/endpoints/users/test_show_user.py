@@ -3,6 +3,7 @@ import unittest
 
 from api.database.models import User 
 from api import create_app, db 
+from api.cache import get_cache
 from tests import assert_payload_field_type_value, assert_payload_field_type
 
 class ShowUserTest(unittest.TestCase):
@@ -48,3 +49,57 @@ class ShowUserTest(unittest.TestCase):
 
     self.assertEqual(404, response.status_code)
     assert_payload_field_type_value(self, data, 'message', str, error_message)
+
+  def test_happypath_show_user_not_modified(self):
+    response = self.client.get(f'/users/{self.user_1.id}')
+    etag = response.headers['ETag']
+    self.assertIn('Last-Modified', response.headers)
+
+    response = self.client.get(f'/users/{self.user_1.id}', headers={'If-None-Match': etag})
+
+    self.assertEqual(304, response.status_code)
+    self.assertEqual(b'', response.data)
+    self.assertEqual(etag, response.headers['ETag'])
+
+  def test_happypath_show_user_modified_since(self):
+    response = self.client.get(f'/users/{self.user_1.id}')
+    last_modified = response.headers['Last-Modified']
+
+    response = self.client.get(f'/users/{self.user_1.id}', headers={'If-Modified-Since': last_modified})
+    self.assertEqual(304, response.status_code)
+
+    response = self.client.get(f'/users/{self.user_1.id}', headers={'If-Modified-Since': 'Mon, 01 Jan 2001 00:00:00 GMT'})
+    self.assertEqual(200, response.status_code)
+
+  def test_happypath_show_user_unchanged_by_contact_writes(self):
+    response = self.client.get(f'/users/{self.user_1.id}')
+    etag, last_modified = response.headers['ETag'], response.headers['Last-Modified']
+
+    response = self.client.post(f'/users/{self.user_1.id}/contacts', json={
+      'first_name': 'darrel', 'last_name': 'wadsworth', 'street_address': '45321 example way',
+      'city': 'Denver', 'state': 'Colorado', 'zipcode': '80000'})
+    self.assertEqual(201, response.status_code)
+    # read the user back from the database rather than the users cache
+    get_cache('users').clear()
+
+    response = self.client.get(f'/users/{self.user_1.id}', headers={'If-None-Match': etag})
+
+    self.assertEqual(304, response.status_code)
+    self.assertEqual(etag, response.headers['ETag'])
+
+    response = self.client.get(f'/users/{self.user_1.id}')
+    self.assertEqual(last_modified, response.headers['Last-Modified'])
+
+  def test_happypath_show_user_changed_after_update(self):
+    response = self.client.get(f'/users/{self.user_1.id}')
+    etag = response.headers['ETag']
+
+    self.user_1.first_name = 'harry'
+    self.user_1.update()
+
+    response = self.client.get(f'/users/{self.user_1.id}', headers={'If-None-Match': etag})
+
+    self.assertEqual(200, response.status_code)
+    self.assertNotEqual(etag, response.headers['ETag'])
+    data = json.loads(response.data.decode('utf-8'))
+    assert_payload_field_type_value(self, data, 'first_name', str, 'harry')
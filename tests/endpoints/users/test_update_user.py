@@ -110,6 +110,13 @@ class UpdateUserTest(unittest.TestCase):
     assert_payload_field_type_value(self, data, 'error', int, 400)
     assert_payload_field_type_value(self, data, 'errors', list, ["required 'email' parameter is blank"])
 
+  def test_sadpath_body_not_an_object(self):
+    response = self.client.patch(f'/users/{self.user.id}', json=[1, 2])
+
+    self.assertEqual(400, response.status_code)
+    data = json.loads(response.data.decode('utf-8'))
+    assert_payload_field_type_value(self, data, 'errors', list, ["user must be a json object"])
+
   def test_sadpath_invalid_user_id(self):
     payload = deepcopy(self.payload)
 
@@ -2,7 +2,7 @@ import unittest
 from sqlalchemy.exc import IntegrityError
 
 from api import create_app, db 
-from api.database.models import User, Contact 
+from api.database.models import User, Contact, ContactTombstone 
 
 class ContactTest(unittest.TestCase):
   def setUp(self):
@@ -219,3 +219,22 @@ class ContactTest(unittest.TestCase):
     deleted_contact = Contact.query.filter_by(id = contact.id).first()
 
     self.assertIsNone(deleted_contact)
+
+  def test_contact_model_delete_leaves_tombstone(self):
+    contact = Contact(self.user, 
+                      {'first_name': 'emilio',
+                      'last_name': 'estevez',
+                      'street_address': '1234 fake st',
+                      'city': 'denver',
+                      'state': 'colorado',
+                      'zipcode': '80019'
+                      })
+    contact.insert()
+    contact_id = contact.id
+    contact.delete()
+
+    tombstone = ContactTombstone.query.filter_by(contact_id=contact_id).first()
+
+    self.assertIsNotNone(tombstone)
+    self.assertEqual(self.user.id, tombstone.user_id)
+    self.assertIsNotNone(tombstone.deleted_at)
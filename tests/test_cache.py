@@ -0,0 +1,366 @@
+import os 
+import json 
+import uuid 
+import stat 
+import time 
+import shutil 
+import sqlite3 
+import datetime 
+import tempfile 
+import unittest 
+from unittest import mock 
+
+from api import create_app, db, cache 
+from api.cache import LRUCache, VersionTable, get_cache, MISSING 
+from api.database.models import User, Contact 
+from api.shared_cache import SharedStore, SharedCache, SharedVersionTable, store_path, private_directory, _dumps, _loads, SWEEP_EVERY 
+
+class LRUCacheTest(unittest.TestCase):
+  def test_evicts_least_recently_used(self):
+    cache = LRUCache('test', 2, 60)
+    cache.set(1, 'one')
+    cache.set(2, 'two')
+    cache.get(1)
+    cache.set(3, 'three')
+
+    self.assertEqual('one', cache.get(1))
+    self.assertIs(MISSING, cache.get(2))
+    self.assertEqual('three', cache.get(3))
+    self.assertEqual((3, 1), (cache.hits, cache.misses))
+
+  def test_entries_expire_after_ttl(self):
+    cache = LRUCache('test', 10, 0.01)
+    cache.set(1, 'one')
+    time.sleep(0.02)
+
+    self.assertIs(MISSING, cache.get(1))
+    self.assertEqual(0, len(cache))
+
+  def test_zero_size_disables(self):
+    cache = LRUCache('test', 0, 60)
+    cache.set(1, 'one')
+
+    self.assertIs(MISSING, cache.get(1))
+
+class VersionTableTest(unittest.TestCase):
+  def test_bump_and_eviction_never_reuse_a_version(self):
+    versions = VersionTable(1)
+    first = versions.get('a')
+    self.assertEqual(first, versions.get('a'))
+
+    bumped = versions.bump('a')
+    self.assertNotEqual(first, bumped)
+
+    versions.get('b')
+    self.assertNotIn(versions.get('a'), (first, bumped))
+
+class NotificationTest(unittest.TestCase):
+  def setUp(self):
+    self.app = create_app('testing')
+
+  def _notify(self, sender):
+    message = {'sender': sender, 'op': 'bump', 'name': 'contact_lists', 'key': 1, 'pid': os.getpid()}
+    cache._receive(self.app, json.dumps(message))
+
+  def test_own_notifications_are_skipped(self):
+    versions = self.app.extensions['cache_versions']['contact_lists']
+    version = versions.get(1)
+
+    self._notify(cache._sender)
+
+    self.assertEqual(version, versions.get(1))
+
+  def test_another_host_with_the_same_pid_is_applied(self):
+    versions = self.app.extensions['cache_versions']['contact_lists']
+    version = versions.get(1)
+
+    self._notify(uuid.uuid4().hex)
+
+    self.assertNotEqual(version, versions.get(1))
+
+class UserCacheTest(unittest.TestCase):
+  def setUp(self):
+    self.app = create_app('testing')
+    self.app_context = self.app.app_context()
+    self.app_context.push()
+    db.create_all()
+    self.client = self.app.test_client()
+
+    self.user = User(email='jc@example.com', first_name='joshua', last_name='carey')
+    self.user.insert()
+    self.cache = get_cache('users')
+
+  def tearDown(self):
+    db.session.remove()
+    db.drop_all()
+    self.app_context.pop()
+
+  def test_contact_routes_validate_a_cached_user_without_a_query(self):
+    self.client.get(f'/users/{self.user.id}/contacts')
+    misses = self.cache.misses
+
+    response = self.client.get(f'/users/{self.user.id}/contacts/changes')
+
+    self.assertEqual(200, response.status_code)
+    self.assertEqual(misses, self.cache.misses)
+    self.assertGreaterEqual(self.cache.hits, 1)
+
+  def test_create_contact_for_a_cached_user(self):
+    self.client.get(f'/users/{self.user.id}')
+    payload = {'first_name': 'darrel', 'last_name': 'wadsworth', 'street_address': '45321 example way', 
+               'city': 'Denver', 'state': 'Colorado', 'zipcode': '80000'}
+
+    response = self.client.post(f'/users/{self.user.id}/contacts', json=payload)
+
+    self.assertEqual(201, response.status_code)
+    self.assertEqual(1, len(self.client.get(f'/users/{self.user.id}/contacts').get_json()['contacts']))
+
+  def test_show_user_from_cache(self):
+    self.client.get(f'/users/{self.user.id}')
+    response = self.client.get(f'/users/{self.user.id}')
+
+    self.assertEqual(200, response.status_code)
+    self.assertEqual('joshua', response.get_json()['first_name'])
+    self.assertIn('desc="0 queries"', response.headers['Server-Timing'])
+
+  def test_update_invalidates(self):
+    self.client.get(f'/users/{self.user.id}')
+    self.client.patch(f'/users/{self.user.id}', json={'first_name': 'josh'})
+
+    response = self.client.get(f'/users/{self.user.id}')
+
+    self.assertEqual('josh', response.get_json()['first_name'])
+
+  def test_delete_invalidates(self):
+    self.client.get(f'/users/{self.user.id}/contacts')
+    self.client.delete(f'/users/{self.user.id}')
+
+    response = self.client.get(f'/users/{self.user.id}/contacts')
+
+    self.assertEqual(404, response.status_code)
+
+  def test_unknown_users_are_not_cached(self):
+    self.assertEqual(404, self.client.get('/users/99999/contacts').status_code)
+
+    self.assertIs(MISSING, self.cache.get(99999))
+
+class ContactListCacheTest(unittest.TestCase):
+  def setUp(self):
+    self.app = create_app('testing')
+    self.app_context = self.app.app_context()
+    self.app_context.push()
+    db.create_all()
+    self.client = self.app.test_client()
+
+    self.user = User(email='jc@example.com', first_name='joshua', last_name='carey')
+    self.user.insert()
+    self.contact_payload = {'first_name': 'darrel', 'last_name': 'wadsworth', 'street_address': '45321 example way', 
+                            'city': 'Denver', 'state': 'Colorado', 'zipcode': '80000'}
+    self.contact = Contact(self.user, self.contact_payload)
+    self.contact.insert()
+    self.url = f'/users/{self.user.id}/contacts'
+
+  def tearDown(self):
+    db.session.remove()
+    db.drop_all()
+    self.app_context.pop()
+
+  def _last_names(self, url=None):
+    response = self.client.get(url or self.url)
+    self.assertEqual(200, response.status_code)
+    return [contact['last_name'] for contact in response.get_json()['contacts']]
+
+  def test_hit_serves_the_same_bytes_without_queries(self):
+    first = self.client.get(self.url)
+    second = self.client.get(self.url)
+
+    self.assertEqual(first.data, second.data)
+    self.assertEqual(first.headers['ETag'], second.headers['ETag'])
+    self.assertEqual('application/json', second.mimetype)
+    self.assertIn('desc="0 queries"', second.headers['Server-Timing'])
+
+  def test_query_strings_are_cached_apart(self):
+    Contact(self.user, dict(self.contact_payload, last_name='adams')).insert()
+
+    self.assertEqual(['adams', 'wadsworth'], self._last_names())
+    self.assertEqual(['wadsworth', 'adams'], self._last_names(self.url + '?sort=-last_name'))
+
+  def test_hit_answers_conditional_requests(self):
+    etag = self.client.get(self.url).headers['ETag']
+
+    response = self.client.get(self.url, headers={'If-None-Match': etag})
+
+    self.assertEqual(304, response.status_code)
+    self.assertIn('desc="0 queries"', response.headers['Server-Timing'])
+
+  def test_writes_invalidate(self):
+    self._last_names()
+    self.client.post(self.url, json=dict(self.contact_payload, last_name='adams'))
+    self.assertEqual(['adams', 'wadsworth'], self._last_names())
+
+    self.client.patch(f'{self.url}/{self.contact.id}', json={'last_name': 'baker'})
+    self.assertEqual(['adams', 'baker'], self._last_names())
+
+    self.client.delete(f'{self.url}/{self.contact.id}')
+    self.assertEqual(['adams'], self._last_names())
+
+  def test_bulk_writes_invalidate(self):
+    self._last_names()
+    self.client.post(self.url, json=[dict(self.contact_payload, last_name='adams')])
+    self.assertEqual(['adams', 'wadsworth'], self._last_names())
+
+    self.client.patch(f'{self.url}/bulk', json={'ids': [self.contact.id], 'changes': {'last_name': 'baker'}})
+    self.assertEqual(['adams', 'baker'], self._last_names())
+
+    self.client.delete(f'{self.url}/bulk', json={'ids': [self.contact.id]})
+    self.assertEqual(['adams'], self._last_names())
+
+  def test_import_invalidates(self):
+    self._last_names()
+    data = 'first_name,last_name,street_address,city,state,zipcode\nann,adams,1 main st,Denver,Colorado,80000\n'
+
+    response = self.client.post(f'{self.url}/import?format=csv', data=data, content_type='text/csv')
+
+    self.assertEqual(201, response.status_code)
+    self.assertEqual(['adams', 'wadsworth'], self._last_names())
+
+  def test_streams_are_not_cached(self):
+    self.client.get(self.url + '?stream=1')
+    self.client.get(self.url + '?stream=1')
+
+    self.assertEqual(0, len(get_cache('contact_lists')))
+
+class SharedCacheTest(unittest.TestCase):
+  def setUp(self):
+    self.directory = tempfile.mkdtemp()
+    self.app = create_app('testing')
+    self.app.config.update(CACHE_BACKEND='shared', CACHE_DIR=self.directory)
+    cache.init_app(self.app)
+    self.app_context = self.app.app_context()
+    self.app_context.push()
+    db.create_all()
+    self.client = self.app.test_client()
+
+    self.user = User(email='jc@example.com', first_name='joshua', last_name='carey')
+    self.user.insert()
+    self.contact = Contact(self.user, {'first_name': 'darrel', 'last_name': 'wadsworth', 'street_address': '45321 example way', 
+                                       'city': 'Denver', 'state': 'Colorado', 'zipcode': '80000'})
+    self.contact.insert()
+    self.url = f'/users/{self.user.id}/contacts'
+
+    # a second worker on the same host opens the same file 
+    path = store_path(self.directory, self.app.config['SQLALCHEMY_DATABASE_URI'])
+    self.other_store = SharedStore(path)
+
+  def tearDown(self):
+    db.session.remove()
+    db.drop_all()
+    self.app_context.pop()
+    shutil.rmtree(self.directory)
+
+  def test_entries_and_versions_are_shared_between_stores(self):
+    self.client.get(self.url)
+    other_cache = SharedCache(self.other_store, 'contact_lists', 10, 60)
+    other_versions = SharedVersionTable(self.other_store, 'contact_lists', 10)
+
+    version = other_versions.get(self.user.id)
+    self.assertIsNot(MISSING, other_cache.get((self.user.id, version, 'json', b'')))
+
+    other_versions.bump(self.user.id)
+    response = self.client.get(self.url)
+
+    self.assertNotIn('desc="0 queries"', response.headers['Server-Timing'])
+
+  def test_cached_list_and_user_survive_the_round_trip(self):
+    first = self.client.get(self.url)
+    second = self.client.get(self.url)
+
+    self.assertEqual(first.data, second.data)
+    self.assertIn('desc="0 queries"', second.headers['Server-Timing'])
+
+  def test_writes_invalidate(self):
+    self.client.get(self.url)
+    self.client.patch(f'{self.url}/{self.contact.id}', json={'last_name': 'baker'})
+
+    response = self.client.get(self.url)
+
+    self.assertEqual(['baker'], [contact['last_name'] for contact in response.get_json()['contacts']])
+
+  def test_trims_past_max_entries(self):
+    shared = SharedCache(self.other_store, 'test', 5, 60)
+    for key in range(SWEEP_EVERY):
+      shared.set(key, key)
+
+    self.assertEqual(5, len(shared))
+    self.assertEqual(SWEEP_EVERY - 1, shared.get(SWEEP_EVERY - 1))
+
+  def test_version_reads_do_not_write(self):
+    versions = SharedVersionTable(self.other_store, 'test', 10)
+    version = versions.get('key')
+    connection = self.other_store.connection()
+    changes = connection.total_changes
+
+    self.assertEqual(version, versions.get('key'))
+    self.assertEqual(changes, connection.total_changes)
+
+  def test_versions_trim_past_max_entries(self):
+    versions = SharedVersionTable(self.other_store, 'test', 5)
+    for key in range(SWEEP_EVERY):
+      versions.bump(key)
+    version = versions.get(SWEEP_EVERY - 1)
+
+    self.assertEqual(5, len(versions))
+    self.assertEqual(version, versions.get(SWEEP_EVERY - 1))
+
+  def test_failed_bump_still_retires_the_version(self):
+    versions = SharedVersionTable(self.other_store, 'test', 10)
+    version = versions.get('key')
+    connection = self.other_store.connection()
+
+    class Locked:
+      def execute(self, statement, *args):
+        if statement.startswith('INSERT OR REPLACE'):
+          raise sqlite3.OperationalError('database is locked')
+        return connection.execute(statement, *args)
+
+    with mock.patch.object(self.other_store, 'connection', lambda: Locked()):
+      versions.bump('key')
+
+    self.assertNotEqual(version, versions.get('key'))
+
+  def test_corrupt_entry_is_a_miss(self):
+    shared = SharedCache(self.other_store, 'test', 10, 60)
+    shared.set('key', b'body')
+    self.other_store.connection().execute("UPDATE entries SET value = x'0000ff' WHERE cache = 'test'")
+
+    self.assertIs(MISSING, shared.get('key'))
+
+  def test_store_is_private(self):
+    self.client.get(self.url)
+    path = store_path(self.directory, self.app.config['SQLALCHEMY_DATABASE_URI'])
+
+    self.assertEqual(0o700, stat.S_IMODE(os.stat(self.directory).st_mode))
+    self.assertEqual(0o600, stat.S_IMODE(os.stat(path).st_mode))
+
+  def test_open_directory_is_made_private(self):
+    directory = os.path.join(self.directory, 'open')
+    os.mkdir(directory, 0o755)
+    os.chmod(directory, 0o755)
+
+    private_directory(directory)
+
+    self.assertEqual(0o700, stat.S_IMODE(os.stat(directory).st_mode))
+
+  def test_symlinked_directory_is_refused(self):
+    link = os.path.join(self.directory, 'link')
+    os.symlink(tempfile.gettempdir(), link)
+
+    with self.assertRaises(RuntimeError):
+      private_directory(link)
+
+  def test_values_round_trip_without_pickle(self):
+    created_at = datetime.datetime(2026, 10, 18, 12, 30, 5, 120)
+    value = (b'{"contacts":[]}', 'W/"abc"', {'id': 1, 'created_at': created_at, 'email': None, 'raw': b'\x00\xff'})
+
+    self.assertEqual([b'{"contacts":[]}', 'W/"abc"', {'id': 1, 'created_at': created_at, 'email': None, 'raw': b'\x00\xff'}],
+                     _loads(_dumps(value)))
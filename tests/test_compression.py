@@ -0,0 +1,147 @@
+import gzip
+import json
+import random
+import unittest
+
+from api import create_app, db, compression
+from api.database.models import User, Contact
+from api.database.factories import contact_details
+
+class CompressionTest(unittest.TestCase):
+  def setUp(self):
+    self.app = create_app('testing')
+    self.app_context = self.app.app_context()
+    self.app_context.push()
+    db.create_all()
+    self.client = self.app.test_client()
+
+    self.user = User(email='jc@example.com', first_name='joshua', last_name='carey')
+    self.user.insert()
+    rng = random.Random(1)
+    Contact.insert_many(self.user.id, [contact_details(rng) for _ in range(50)])
+    self.url = f'/users/{self.user.id}/contacts'
+
+  def tearDown(self):
+    db.session.remove()
+    db.drop_all()
+    self.app_context.pop()
+
+  def test_happypath_gzip_list(self):
+    expected = self.client.get(self.url).data
+
+    response = self.client.get(self.url, headers={'Accept-Encoding': 'gzip'})
+
+    self.assertEqual(200, response.status_code)
+    self.assertEqual('gzip', response.headers['Content-Encoding'])
+    self.assertIn('Accept-Encoding', response.headers['Vary'])
+    self.assertEqual(len(response.data), int(response.headers['Content-Length']))
+    self.assertLess(len(response.data), len(expected))
+    self.assertEqual(expected, gzip.decompress(response.data))
+
+  def test_no_accept_encoding_is_identity(self):
+    response = self.client.get(self.url)
+
+    self.assertEqual(200, response.status_code)
+    self.assertNotIn('Content-Encoding', response.headers)
+    self.assertIn('Accept-Encoding', response.headers['Vary'])
+    self.assertEqual(50, len(json.loads(response.data)['contacts']))
+
+  def test_refused_encoding_is_identity(self):
+    response = self.client.get(self.url, headers={'Accept-Encoding': 'gzip;q=0, br;q=0'})
+
+    self.assertNotIn('Content-Encoding', response.headers)
+    self.assertEqual(50, len(json.loads(response.data)['contacts']))
+
+  def test_small_body_is_not_compressed(self):
+    response = self.client.get(f'/users/{self.user.id}', headers={'Accept-Encoding': 'gzip'})
+
+    self.assertEqual(200, response.status_code)
+    self.assertNotIn('Content-Encoding', response.headers)
+
+  def test_not_modified_etag_matches_uncompressed_response(self):
+    url = f'/users/{self.user.id}'
+    response = self.client.get(url, headers={'Accept-Encoding': 'gzip'})
+    etag = response.headers['ETag']
+    self.assertNotIn('Content-Encoding', response.headers)
+
+    response = self.client.get(url, headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+
+    self.assertEqual(304, response.status_code)
+    self.assertEqual(etag, response.headers['ETag'])
+
+  def test_identity_etag_stays_strong(self):
+    response = self.client.get(f'/users/{self.user.id}')
+
+    self.assertFalse(response.headers['ETag'].startswith('W/'))
+
+  def test_level_and_threshold_are_configurable(self):
+    sizes = {}
+    for level in (1, 9):
+      self.app.config['COMPRESSION_LEVEL'] = level
+      sizes[level] = len(self.client.get(self.url, headers={'Accept-Encoding': 'gzip'}).data)
+    self.assertLess(sizes[9], sizes[1])
+
+    self.app.config['COMPRESSION_MIN_SIZE'] = 10 ** 9
+    response = self.client.get(self.url, headers={'Accept-Encoding': 'gzip'})
+    self.assertNotIn('Content-Encoding', response.headers)
+
+  def test_compressed_etag_is_weak_and_revalidates(self):
+    response = self.client.get(self.url, headers={'Accept-Encoding': 'gzip'})
+    etag = response.headers['ETag']
+    self.assertTrue(etag.startswith('W/'))
+
+    response = self.client.get(self.url, headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+
+    self.assertEqual(304, response.status_code)
+    self.assertEqual(etag, response.headers['ETag'])
+
+  def test_happypath_gzip_ndjson_stream(self):
+    expected = self.client.get(f'{self.url}?stream=1').data
+
+    response = self.client.get(f'{self.url}?stream=1', headers={'Accept-Encoding': 'gzip'})
+
+    self.assertEqual('gzip', response.headers['Content-Encoding'])
+    self.assertNotIn('Content-Length', response.headers)
+    self.assertEqual(expected, gzip.decompress(response.data))
+
+  def test_happypath_gzip_export(self):
+    expected = self.client.get(f'{self.url}/export').data
+
+    response = self.client.get(f'{self.url}/export', headers={'Accept-Encoding': 'gzip'})
+
+    self.assertEqual('gzip', response.headers['Content-Encoding'])
+    self.assertEqual(expected, gzip.decompress(response.data))
+
+  def test_gzip_export_download_is_not_compressed_again(self):
+    response = self.client.get(f'{self.url}/export?gzip=1', headers={'Accept-Encoding': 'gzip'})
+
+    self.assertEqual('application/gzip', response.mimetype)
+    self.assertNotIn('Content-Encoding', response.headers)
+    self.assertIn(b'first_name', gzip.decompress(response.data))
+
+  @unittest.skipIf(compression.brotli is None, 'brotli is not installed')
+  def test_happypath_brotli_preferred(self):
+    expected = self.client.get(self.url).data
+
+    response = self.client.get(self.url, headers={'Accept-Encoding': 'gzip, br'})
+
+    self.assertEqual('br', response.headers['Content-Encoding'])
+    self.assertEqual(expected, compression.brotli.decompress(response.data))
+
+  @unittest.skipIf(compression.brotli is None, 'brotli is not installed')
+  def test_happypath_brotli_stream(self):
+    expected = self.client.get(f'{self.url}?stream=1').data
+
+    response = self.client.get(f'{self.url}?stream=1', headers={'Accept-Encoding': 'br'})
+
+    self.assertEqual(expected, compression.brotli.decompress(response.data))
+
+  def test_stream_flushes_as_it_goes(self):
+    compressor = compression._Gzip(6)
+    chunks = [b'x' * 100 for _ in range(10)]
+
+    pieces = list(compression._compress_stream(iter(chunks), compressor, 300))
+
+    # a sync flush after every 300 bytes of input, then the trailer
+    self.assertGreaterEqual(len(pieces), 4)
+    self.assertEqual(b''.join(chunks), gzip.decompress(b''.join(pieces)))
@@ -0,0 +1,53 @@
+import random 
+import unittest 
+
+from api import create_app, db 
+from api.database.models import User, Contact 
+from api.database.factories import (contact_details, contacts_per_user, user_rows, 
+                                    contact_rows, seed_database, CITIES)
+
+class FactoriesTest(unittest.TestCase):
+  def setUp(self):
+    self.app = create_app('testing')
+    self.app_context = self.app.app_context()
+    self.app_context.push()
+    db.create_all()
+
+  def tearDown(self):
+    db.session.remove()
+    db.drop_all()
+    self.app_context.pop()
+
+  def test_rows_are_deterministic_for_a_seed(self):
+    self.assertEqual(list(user_rows(5, seed=7)), list(user_rows(5, seed=7)))
+    self.assertEqual(list(contact_rows([1, 2, 3], 10, seed=7)), list(contact_rows([1, 2, 3], 10, seed=7)))
+    self.assertNotEqual(list(contact_rows([1, 2, 3], 10, seed=7)), list(contact_rows([1, 2, 3], 10, seed=8)))
+
+  def test_contacts_per_user_is_skewed(self):
+    rng = random.Random(1)
+    sizes = sorted(contacts_per_user(rng, 100) for _ in range(5000))
+
+    mean = sum(sizes) / len(sizes)
+    median = sizes[len(sizes) // 2]
+    self.assertTrue(70 < mean < 130)
+    self.assertLess(median, mean / 2)
+    self.assertLessEqual(sizes[-1], 100 * 50)
+
+  def test_cities_repeat_with_skewed_weights(self):
+    rng = random.Random(1)
+    cities = [contact_details(rng)['city'] for _ in range(5000)]
+
+    self.assertGreater(cities.count(CITIES[0][0]), cities.count(CITIES[-1][0]) * 5)
+
+  def test_seed_database_appends_after_existing_users(self):
+    user = User(email='jc@example.com', first_name='joshua', last_name='carey')
+    user.insert()
+
+    written_users, written_contacts = seed_database(20, 10, seed=3, chunk_size=50)
+
+    self.assertEqual(20, written_users)
+    self.assertEqual(21, User.query.count())
+    self.assertEqual(written_contacts, Contact.query.count())
+    self.assertEqual(0, Contact.query.filter_by(user_id=user.id).count())
+    self.assertEqual(list(range(user.id + 1, user.id + 21)), 
+                     [user_id for user_id, in db.session.query(User.id).filter(User.id != user.id).order_by(User.id)])
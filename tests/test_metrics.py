@@ -0,0 +1,70 @@
+import os 
+import json 
+import tempfile 
+import unittest 
+
+from api import create_app, db 
+from api.database.models import User 
+from api.metrics import collect, render, default_dir
+
+class MetricsTest(unittest.TestCase):
+  def setUp(self):
+    self.app = create_app('testing')
+    self.app_context = self.app.app_context()
+    self.app_context.push()
+    db.create_all()
+    self.client = self.app.test_client()
+
+    self.user = User(email='jc@example.com', first_name='joshua', last_name='carey')
+    self.user.insert()
+
+  def tearDown(self):
+    db.session.remove()
+    db.drop_all()
+    self.app_context.pop()
+
+  def test_metrics_endpoint_counts_requests_by_resource(self):
+    self.client.get(f'/users/{self.user.id}/contacts')
+    self.client.get('/users/99999')
+
+    response = self.client.get('/metrics')
+
+    self.assertEqual(200, response.status_code)
+    self.assertEqual('text/plain', response.mimetype)
+
+    text = response.data.decode('utf-8')
+    self.assertIn('# TYPE http_requests_total counter', text)
+    self.assertIn('http_requests_total{method="GET",resource="ContactsResource",status="200"}', text)
+    self.assertIn('http_requests_total{method="GET",resource="UserResource",status="404"}', text)
+    self.assertIn('http_request_duration_seconds_bucket{method="GET",resource="ContactsResource",le="+Inf"}', text)
+    self.assertNotIn('resource="metrics"', text)
+
+  def test_snapshots_stay_out_of_the_shared_directory(self):
+    self.client.get('/metrics')
+
+    shared = default_dir(self.app.config['SQLALCHEMY_DATABASE_URI'])
+    self.assertFalse(os.path.isdir(shared) and os.listdir(shared))
+    self.assertNotEqual(default_dir('postgresql://localhost:5432/address_book_development'), shared)
+
+  def test_collect_sums_every_worker_snapshot(self):
+    labels = [['method', 'GET'], ['resource', 'UserResource']]
+    snapshots = [
+      {'counters': [['http_requests_total', labels + [['status', '200']], 2]],
+       'histograms': [['http_request_duration_seconds', labels, [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0.004, 1]]]},
+      {'counters': [['http_requests_total', labels + [['status', '200']], 3]],
+       'histograms': [['http_request_duration_seconds', labels, [0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 20.009, 2]]]},
+    ]
+
+    with tempfile.TemporaryDirectory() as directory: 
+      for i, snapshot in enumerate(snapshots):
+        with open(os.path.join(directory, f'{i}.json'), 'w') as snapshot_file: 
+          json.dump(snapshot, snapshot_file)
+
+      text = render(*collect(directory))
+
+    self.assertIn('http_requests_total{method="GET",resource="UserResource",status="200"} 5', text)
+    self.assertIn('http_request_duration_seconds_bucket{method="GET",resource="UserResource",le="0.005"} 1', text)
+    self.assertIn('http_request_duration_seconds_bucket{method="GET",resource="UserResource",le="0.01"} 2', text)
+    self.assertIn('http_request_duration_seconds_bucket{method="GET",resource="UserResource",le="10.0"} 2', text)
+    self.assertIn('http_request_duration_seconds_bucket{method="GET",resource="UserResource",le="+Inf"} 3', text)
+    self.assertIn('http_request_duration_seconds_count{method="GET",resource="UserResource"} 3', text)
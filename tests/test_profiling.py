@@ -0,0 +1,54 @@
+import json 
+import unittest 
+from collections import namedtuple
+
+from api import create_app, db 
+from api.database.models import User 
+from api.profiling import _profile
+
+Query = namedtuple('Query', ['statement', 'duration'])
+
+class ProfilingTest(unittest.TestCase):
+  def setUp(self):
+    self.app = create_app('testing')
+    self.app_context = self.app.app_context()
+    self.app_context.push()
+    db.create_all()
+    self.client = self.app.test_client()
+
+    self.user = User(email='jc@example.com', first_name='joshua', last_name='carey')
+    self.user.insert()
+
+  def tearDown(self):
+    db.session.remove()
+    db.drop_all()
+    self.app_context.pop()
+
+  def test_server_timing_header(self):
+    response = self.client.get(f'/users/{self.user.id}')
+
+    self.assertEqual(200, response.status_code)
+    self.assertRegex(response.headers['Server-Timing'], r'^db;dur=[0-9.]+;desc="1 queries"$')
+
+  def test_server_timing_counts_only_the_current_request(self):
+    self.client.get(f'/users/{self.user.id}/contacts')
+    response = self.client.get(f'/users/{self.user.id}')
+
+    # the contact list ran several queries and cached the user on the way
+    self.assertIn('desc="0 queries"', response.headers['Server-Timing'])
+
+  def test_profile_summarizes_and_flags_repeated_statements(self):
+    queries = [
+      Query('SELECT users', 0.004),
+      Query('SELECT contacts WHERE id = ?', 0.001),
+      Query('SELECT contacts WHERE id = ?', 0.002),
+      Query('SELECT contacts WHERE id = ?', 0.001),
+    ]
+
+    profile = _profile(queries, slowest=2, repeat_threshold=3)
+
+    self.assertEqual(4, profile['queries'])
+    self.assertEqual(8.0, profile['db_ms'])
+    self.assertEqual([{'ms': 4.0, 'statement': 'SELECT users'}, 
+                      {'ms': 2.0, 'statement': 'SELECT contacts WHERE id = ?'}], profile['slowest'])
+    self.assertEqual([{'count': 3, 'statement': 'SELECT contacts WHERE id = ?'}], profile['repeated'])
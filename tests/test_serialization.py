@@ -0,0 +1,54 @@
+import json 
+import unittest 
+from unittest import mock 
+
+from api import create_app, db, serialization 
+from api.database.models import User 
+
+class SerializationTest(unittest.TestCase):
+  def setUp(self):
+    self.app = create_app('testing')
+    self.app_context = self.app.app_context()
+    self.app_context.push()
+    db.create_all()
+    self.client = self.app.test_client()
+
+  def tearDown(self):
+    db.session.remove()
+    db.drop_all()
+    self.app_context.pop()
+
+  def test_stdlib_fallback_matches_the_fast_encoder(self):
+    data = {'contacts': [{'id': 1, 'first_name': 'zoë', 'street_address_2': None}], 'success': True}
+
+    self.assertEqual(data, json.loads(serialization._dumps_stdlib(data)))
+    self.assertEqual(data, serialization._loads_stdlib(serialization.dumps(data)))
+    self.assertEqual(json.loads(serialization.dumps(data)), json.loads(serialization._dumps_stdlib(data)))
+
+  def test_responses_are_compact_utf8_json(self):
+    user = User(email='jc@example.com', first_name='zoë', last_name='carey')
+    user.insert()
+
+    response = self.client.get(f'/users/{user.id}')
+
+    self.assertEqual('application/json', response.mimetype)
+    self.assertIn('"first_name":"zoë"', response.data.decode('utf-8'))
+
+  def test_errors_use_the_representation(self):
+    response = self.client.get('/users/99999')
+
+    self.assertEqual(404, response.status_code)
+    self.assertEqual('application/json', response.mimetype)
+    self.assertIn('message', json.loads(response.data))
+
+  def test_request_bodies_parse_with_either_decoder(self):
+    payload = {'email': 'jc@example.com', 'first_name': 'joshua', 'last_name': 'carey'}
+
+    with mock.patch.object(serialization, 'loads', serialization._loads_stdlib):
+      response = self.client.post('/users', data=json.dumps(payload), content_type='application/json')
+
+    self.assertEqual(201, response.status_code)
+
+  def test_empty_body_falls_back_to_the_default(self):
+    with self.app.test_request_context('/', method='DELETE', data=b''):
+      self.assertEqual({}, serialization.request_json(default={}))
@@ -0,0 +1,90 @@
+import unittest 
+
+from api.validation import Field, column_fields, optional, compile_validator, compile_batch_validator 
+from api.database.models import Contact 
+
+SCHEMA = (Field('first_name', True, 80), Field('group', False, None), Field('city', True, 5))
+
+class CompileValidatorTest(unittest.TestCase):
+  def setUp(self):
+    self.validate = compile_validator(SCHEMA)
+
+  def test_happypath_strips_given_fields(self):
+    data = {'first_name': '  joshua ', 'city': 'Lyons', 'other': 'ignored'}
+
+    values, errors = self.validate(data)
+
+    self.assertEqual([], errors)
+    self.assertEqual({'first_name': 'joshua', 'city': 'Lyons'}, values)
+    # the input is left as it was
+    self.assertEqual('  joshua ', data['first_name'])
+
+  def test_sadpath_messages_in_field_order(self):
+    values, errors = self.validate({'group': ' ', 'city': 'Boulder'})
+
+    self.assertEqual([
+      "required 'first_name' parameter is missing", 
+      "required 'group' parameter is blank", 
+      "'city' parameter must be at most 5 characters",
+    ], errors)
+    self.assertEqual({}, values)
+
+  def test_sadpath_not_a_string(self):
+    values, errors = self.validate({'first_name': None, 'group': 3, 'city': ['Lyons']})
+
+    self.assertEqual([
+      "'first_name' parameter must be a string", 
+      "'group' parameter must be a string", 
+      "'city' parameter must be a string",
+    ], errors)
+
+  def test_sadpath_not_an_object(self):
+    validate = compile_validator(SCHEMA, not_object='not an object')
+
+    for data in ([1, 2], ['x'], 'x', None):
+      self.assertEqual(({}, ['not an object']), validate(data))
+
+  def test_optional_fields_may_be_missing(self):
+    validate = compile_validator(optional(SCHEMA))
+
+    self.assertEqual(({}, []), validate({}))
+    self.assertEqual(({'city': 'Lyons'}, []), validate({'city': 'Lyons '}))
+
+  def test_column_fields_take_string_lengths(self):
+    fields = column_fields(Contact.__table__, ('first_name', 'street_address'), ('first_name',))
+
+    self.assertEqual((Field('first_name', True, 80), Field('street_address', False, 120)), fields)
+
+class CompileBatchValidatorTest(unittest.TestCase):
+  def setUp(self):
+    self.validate = compile_validator(SCHEMA)
+    self.validate_batch = compile_batch_validator(SCHEMA, defaults={'group': 'friend'}, not_object='not an object')
+
+  def test_agrees_with_the_single_validator(self):
+    records = [
+      {'first_name': ' joshua ', 'city': 'Lyons'}, 
+      {'group': ' ', 'city': 'Boulder'}, 
+      {'first_name': 'bruce', 'group': 'work', 'city': 'Erie', 'other': 1},
+      {'first_name': 3},
+    ]
+
+    rows, invalid = self.validate_batch(records)
+
+    expected_rows, expected_invalid = [], []
+    for index, record in enumerate(records):
+      values, errors = self.validate(record)
+      if errors: 
+        expected_invalid.append((index, errors))
+      else: 
+        expected_rows.append(dict({'group': 'friend'}, **values))
+
+    self.assertEqual(expected_invalid, invalid)
+    self.assertEqual(expected_rows, rows)
+    # every field is set, in schema order
+    self.assertEqual(['first_name', 'group', 'city'], list(rows[0]))
+
+  def test_sadpath_not_an_object(self):
+    rows, invalid = self.validate_batch([['joshua'], {'first_name': 'a', 'city': 'b'}])
+
+    self.assertEqual([(0, ['not an object'])], invalid)
+    self.assertEqual([{'first_name': 'a', 'group': 'friend', 'city': 'b'}], rows)